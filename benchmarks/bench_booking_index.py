@@ -0,0 +1,86 @@
+"""
+Benchmark: memory per booking and lookup time of `BookingIndex`.
+
+Compares a list of validated `Booking` objects (plus a dict by token, the
+usual way to look them up) with a `BookingIndex` filled from the same raw
+bookings, as `BookingIndex.load` does. Memory is what each structure
+retains once built from pages of JSON, decoded one at a time as they
+arrive from the API.
+
+Usage:
+    python benchmarks/bench_booking_index.py [--bookings N] [--lookups N]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.booking_index import BookingIndex  # noqa: E402
+from pass_culture.models.bookings import Booking, BookingStatus  # noqa: E402
+from tests.mock_server import MockPassCultureServer  # noqa: E402
+
+
+def models(pages: list):
+    bookings = [Booking.model_validate(booking) for page in pages for booking in json.loads(page)]
+    return bookings, {booking.token: booking for booking in bookings}
+
+
+def index(pages: list) -> BookingIndex:
+    booking_index = BookingIndex()
+    for page in pages:
+        booking_index.add_page({"data": json.loads(page)})
+    return booking_index
+
+
+def allocated(build, pages: list):
+    tracemalloc.start()
+    result = build(pages)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(func, items: list) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    offers = 20
+    server = MockPassCultureServer(offers=offers, bookings_per_offer=-(-args.bookings // offers))
+    raw = [server._make_booking(i) for i in range(1, args.bookings + 1)]
+    pages = [json.dumps(raw[start : start + 1000]) for start in range(0, len(raw), 1000)]
+
+    (bookings, by_token), model_size = allocated(models, pages)
+    booking_index, index_size = allocated(index, pages)
+    print(f"{args.bookings} bookings")
+    print(f"  Booking objects   {model_size / args.bookings:8.0f} B/booking")
+    print(
+        f"  BookingIndex      {index_size / args.bookings:8.0f} B/booking "
+        f"({index_size / model_size:.1%} of the objects)"
+    )
+
+    tokens = random.choices([booking["token"] for booking in raw], k=args.lookups)
+    stocks = random.choices([booking["stockId"] for booking in raw], k=1000)
+    print(f"  status by token   dict of objects {timed(lambda t: by_token[t].status, tokens) * 1e9:6.0f} ns  "
+          f"index {timed(booking_index.status_of, tokens) * 1e9:6.0f} ns")
+    print(f"  booking by token  index {timed(booking_index.get, tokens) * 1e9:6.0f} ns")
+    print(f"  count used by stock  list scan "
+          f"{timed(lambda s: sum(b.stock_id == s and b.status == BookingStatus.USED for b in bookings), stocks[:20]) * 1e6:9.0f} us  "
+          f"index {timed(lambda s: booking_index.count(stock_id=s, status=BookingStatus.USED), stocks) * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Microbenchmark: CPU spent decoding a ~1 MB bookings page.
+
+Compares the previous response handling (two `response.json()` calls and a
+`print()` of the decoded body) with `decoding.decode_response`.
+
+Usage:
+    python benchmarks/bench_decode.py [--iterations N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.decoding import JSON_BACKEND, decode_response  # noqa: E402
+
+
+def make_payload(target_bytes: int = 1_000_000) -> bytes:
+    booking = {
+        "confirmationDate": "2024-05-01T10:00:00Z",
+        "creationDate": "2024-04-28T09:12:44Z",
+        "id": 0,
+        "offerEan": None,
+        "offerId": 1234,
+        "offerName": "Concert de printemps",
+        "price": 12.5,
+        "priceCategoryId": 42,
+        "priceCategoryLabel": "Tarif plein",
+        "quantity": 1,
+        "status": "CONFIRMED",
+        "stockId": 987,
+        "userBirthDate": "2006-02-14",
+        "userEmail": "jeune@example.com",
+        "userFirstName": "Camille",
+        "userLastName": "Martin",
+        "userPhoneNumber": "+33600000000",
+        "userPostalCode": "75011",
+        "venueAddress": "1 rue de la Paix, Paris",
+        "venueDepartementCode": "75",
+        "venueId": 55,
+        "venueName": "La Salle",
+    }
+    size = len(json.dumps(booking))
+    bookings = [dict(booking, id=i) for i in range(target_bytes // size + 1)]
+    return json.dumps({"data": bookings}).encode()
+
+
+def legacy(response: httpx.Response, out) -> dict:
+    print(response.json(), file=out)
+    return response.json()
+
+
+def current(response: httpx.Response, out) -> dict:
+    return decode_response(response)
+
+
+def measure(func, response, out, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func(response, out)
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    body = make_payload()
+    response = httpx.Response(
+        200, content=body, headers={"Content-Type": "application/json"}
+    )
+    with open(os.devnull, "w") as out:
+        before = measure(legacy, response, out, args.iterations)
+        after = measure(current, response, out, args.iterations)
+
+    print(f"payload: {len(body) / 1e6:.2f} MB, backend: {JSON_BACKEND}")
+    print(f"double decode + print: {before * 1e3:8.2f} ms CPU/request")
+    print(f"single decode:         {after * 1e3:8.2f} ms CPU/request")
+    print(f"saved:                 {(before - after) * 1e3:8.2f} ms CPU/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: throughput and memory of booking exports, against the mock server.
+
+Compares the former approach (iterate over `Booking` objects and turn each
+back into a dict with `model_dump`, as done to load a DataFrame) with the
+columnar `BookingExporter`: plain column batches, CSV, and Arrow record
+batches and Parquet when pyarrow is installed. Reports rows per second and
+the peak memory allocated while exporting (traced in a separate run).
+
+Usage:
+    python benchmarks/bench_export.py [--offers N] [--bookings N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.client import PassCultureClient  # noqa: E402
+from pass_culture.export import BookingExporter  # noqa: E402
+from tests.mock_server import MockPassCultureServer  # noqa: E402
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+
+async def models(exporter: BookingExporter, offer_ids: list) -> int:
+    rows = []
+    for offer_id in offer_ids:
+        async for booking in exporter.client.bookings.iter_bookings(offer_id):
+            rows.append(booking.model_dump())
+    return len(rows)
+
+
+async def columns(exporter: BookingExporter, offer_ids: list) -> int:
+    rows = 0
+    async for batch in exporter.iter_columns(offer_ids):
+        rows += len(batch["id"])
+    return rows
+
+
+async def to_csv(exporter: BookingExporter, offer_ids: list) -> int:
+    with open(os.devnull, "w", newline="") as f:
+        return await exporter.write_csv(f, offer_ids)
+
+
+async def record_batches(exporter: BookingExporter, offer_ids: list) -> int:
+    rows = 0
+    async for batch in exporter.iter_record_batches(offer_ids):
+        rows += batch.num_rows
+    return rows
+
+
+async def to_parquet(exporter: BookingExporter, offer_ids: list) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        return await exporter.write_parquet(Path(directory) / "bookings.parquet", offer_ids)
+
+
+CASES = {
+    "model_dump": models,
+    "columns": columns,
+    "csv": to_csv,
+}
+if pyarrow is not None:
+    CASES["arrow"] = record_batches
+    CASES["parquet"] = to_parquet
+
+
+async def execute(case, args, trace_memory: bool):
+    server = MockPassCultureServer(
+        offers=args.offers, bookings_per_offer=args.bookings, page_size=args.page_size
+    )
+    http_client = server.http_client()
+    client = PassCultureClient(
+        api_key="bench", api_endpoint=str(http_client.base_url), http_client=http_client
+    )
+    exporter = BookingExporter(client, batch_size=args.batch_size)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    rows = await case(exporter, list(server.offers))
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await http_client.aclose()
+    return rows, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--offers", type=int, default=10)
+    parser.add_argument("--bookings", type=int, default=5000, help="bookings per offer")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    if pyarrow is None:
+        print("pyarrow is not installed: skipping the arrow and parquet cases")
+    for name, case in CASES.items():
+        rows, elapsed, _ = asyncio.run(execute(case, args, trace_memory=False))
+        _, _, peak = asyncio.run(execute(case, args, trace_memory=True))
+        print(
+            f"{name:11s} {rows:8d} rows  {elapsed * 1e3:9.1f} ms  "
+            f"{rows / elapsed:10.0f} rows/s  peak {peak / 2**20:7.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
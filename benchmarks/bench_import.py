@@ -0,0 +1,97 @@
+"""
+Benchmark: import and first-use time of the package.
+
+Each case runs in a fresh interpreter, several times, and reports the median
+time and the modules it loaded:
+    package     import pass_culture
+    client      build a PassCultureClient
+    bookings    build a client and access its bookings endpoint
+
+With `--check`, also fails (exit status 1) when a case loads a module it
+shouldn't (pydantic models before an endpoint is used, the .env file when
+settings are passed explicitly...) or when `import pass_culture` exceeds the
+time budget. This is what CI runs.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat N] [--check] [--budget-ms MS]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = {
+    "package": "import pass_culture",
+    "client": (
+        "import pass_culture\n"
+        "pass_culture.PassCultureClient(api_key='key', api_endpoint='http://localhost')"
+    ),
+    "bookings": (
+        "import pass_culture\n"
+        "pass_culture.PassCultureClient(api_key='key', api_endpoint='http://localhost').bookings"
+    ),
+}
+
+# Modules each case must not load.
+FORBIDDEN = {
+    "package": ("pydantic", "httpx", "dotenv", "pass_culture.client", "pass_culture.models"),
+    "client": ("dotenv", "pass_culture.endpoints", "pass_culture.models"),
+    "bookings": ("dotenv", "pass_culture.models.EventOffers", "pass_culture.models.PriceCategory"),
+}
+
+RUNNER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+exec(compile({code!r}, "<case>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def run_case(code: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", RUNNER.format(root=str(ROOT), code=code)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def loaded(modules: list, prefix: str) -> list:
+    return [module for module in modules if module == prefix or module.startswith(prefix + ".")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--check", action="store_true", help="fail on forbidden imports or a slow import")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="time budget of `import pass_culture`")
+    args = parser.parse_args()
+
+    failures = []
+    for name, code in CASES.items():
+        runs = [run_case(code) for _ in range(args.repeat)]
+        median = statistics.median(run["elapsed"] for run in runs)
+        modules = runs[0]["modules"]
+        own = loaded(modules, "pass_culture")
+        print(f"{name:10s} {median * 1e3:8.2f} ms  {len(modules):4d} modules ({len(own)} from pass_culture)")
+        for prefix in FORBIDDEN[name]:
+            if loaded(modules, prefix):
+                failures.append(f"{name}: loads {prefix}")
+        if name == "package" and median * 1e3 > args.budget_ms:
+            failures.append(f"{name}: {median * 1e3:.2f} ms exceeds the {args.budget_ms:g} ms budget")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: cost of turning a decoded bookings page into return values.
+
+Compares full validation (the default) with the lazy, construct and raw
+response modes for pages of 50, 500 and 5000 bookings. Lazy mode is
+measured twice: without touching the bookings, and after accessing every
+one of them.
+
+With pydantic 2, validation runs in pydantic-core and building models in
+Python with `model_construct` (construct mode) is slower. The savings come
+from not building models at all (raw), or only for the bookings actually
+used (lazy).
+
+Usage:
+    python benchmarks/bench_response_modes.py [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.models.bookings import BookingList  # noqa: E402
+from pass_culture.parsing import ResponseMode, parse  # noqa: E402
+
+
+def make_page(size: int) -> dict:
+    return {
+        "data": [
+            {
+                "confirmationDate": "2024-05-01T10:00:00Z",
+                "creationDate": "2024-04-28T09:12:44Z",
+                "id": i,
+                "offerEan": None,
+                "offerId": 1234,
+                "offerName": "Concert de printemps",
+                "price": 12.5,
+                "priceCategoryId": 42,
+                "priceCategoryLabel": "Tarif plein",
+                "quantity": 1,
+                "status": "CONFIRMED",
+                "stockId": 987,
+                "userBirthDate": "2006-02-14",
+                "userEmail": "jeune@example.com",
+                "userFirstName": "Camille",
+                "userLastName": "Martin",
+                "userPhoneNumber": "+33600000000",
+                "userPostalCode": "75011",
+                "venueAddress": "1 rue de la Paix, Paris",
+                "venueDepartementCode": "75",
+                "venueId": 55,
+                "venueName": "La Salle",
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def lazy_all(page: dict):
+    bookings = parse(BookingList, page, ResponseMode.LAZY).bookings
+    for booking in bookings:
+        pass
+
+
+CASES = {
+    "validate": lambda page: parse(BookingList, page, ResponseMode.VALIDATE),
+    "lazy (no access)": lambda page: parse(BookingList, page, ResponseMode.LAZY),
+    "lazy (all accessed)": lazy_all,
+    "construct": lambda page: parse(BookingList, page, ResponseMode.CONSTRUCT),
+    "raw": lambda page: parse(BookingList, page, ResponseMode.RAW),
+}
+
+
+def measure(func, page: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in (50, 500, 5000):
+        page = make_page(size)
+        baseline = measure(CASES["validate"], page, args.repeat)
+        print(f"{size} bookings")
+        for name, func in CASES.items():
+            elapsed = measure(func, page, args.repeat)
+            print(
+                f"  {name:20s} {elapsed * 1e3:9.3f} ms  "
+                f"({baseline / elapsed if elapsed else float('inf'):6.1f}x vs validate)"
+            )
+
+
+if __name__ == "__main__":
+    main()
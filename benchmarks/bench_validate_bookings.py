@@ -0,0 +1,50 @@
+"""
+Benchmark: bulk booking validation throughput against a local mock server.
+
+Reports validated tokens per second for increasing concurrency levels,
+with a fixed simulated API latency.
+
+Usage:
+    python benchmarks/bench_validate_bookings.py [--tokens N] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.client import PassCultureClient  # noqa: E402
+from tests.mock_server import MockPassCultureServer, booking_token  # noqa: E402
+
+
+async def run(tokens: int, latency: float, concurrency: int) -> float:
+    server = MockPassCultureServer(latency=latency, offers=1, bookings_per_offer=tokens)
+    http_client = server.http_client()
+    async with PassCultureClient(
+        api_key="bench", api_endpoint=str(http_client.base_url), http_client=http_client
+    ) as client:
+        batch = [booking_token(i) for i in range(1, tokens + 1)]
+        start = time.perf_counter()
+        results = await client.bookings.validate_bookings(batch, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+    await http_client.aclose()
+    assert all(result.success for result in results.values())
+    return tokens / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{args.tokens} tokens, {args.latency * 1e3:.0f} ms simulated latency")
+    for concurrency in (1, 2, 4, 8, 16, 32, 64):
+        rate = asyncio.run(run(args.tokens, args.latency, concurrency))
+        print(f"concurrency {concurrency:3d}: {rate:9.1f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Load-test benchmark suite running the wrapper against the in-process mock server.
+
+For each scenario, reports p50/p99 request latency as seen by
+`PassCultureClient.request`, requests per second, items per second and the
+peak memory allocated while it ran.
+
+Scenarios:
+    pagination   iterate over every booking of an offer with iter_bookings
+    validation   validate a batch of booking tokens with validate_bookings
+    creation     create event offers concurrently with create_event_offer
+    images       same as creation, each offer with a streamed image (ImageFile)
+
+Usage:
+    python benchmarks/suite.py [--scenario NAME ...] [--latency SECONDS]
+                               [--error-rate RATE] [--throttle-rate RATE]
+"""
+import argparse
+import asyncio
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pass_culture.client import PassCultureClient  # noqa: E402
+from pass_culture.images import ImageFile  # noqa: E402
+from tests.mock_server import MockPassCultureServer, booking_token  # noqa: E402
+from pass_culture.models.AccessibilityInfo import AccessibilityInfo  # noqa: E402
+from pass_culture.models.CategoryRelatedFields import CategoryEnum, CategoryRelatedFields  # noqa: E402
+from pass_culture.models.LocationInfo import LocationInfo  # noqa: E402
+from pass_culture.retry import RetryPolicy  # noqa: E402
+
+
+class TimedClient(PassCultureClient):
+    """PassCultureClient recording the latency of every request."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    async def request(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().request(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+async def pagination(client: TimedClient, server: MockPassCultureServer, args) -> int:
+    count = 0
+    async for _ in client.bookings.iter_bookings(1):
+        count += 1
+    return count
+
+
+async def validation(client: TimedClient, server: MockPassCultureServer, args) -> int:
+    tokens = [booking_token(i) for i in range(1, args.items + 1)]
+    results = await client.bookings.validate_bookings(tokens, concurrency=args.concurrency)
+    return sum(result.success for result in results.values())
+
+
+async def creation(client: TimedClient, server: MockPassCultureServer, args, image=None) -> int:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    accessibility = AccessibilityInfo(
+        audioDisabilityCompliant=True,
+        mentalDisabilityCompliant=True,
+        motorDisabilityCompliant=True,
+        visualDisabilityCompliant=True,
+    )
+    category = CategoryRelatedFields(category=CategoryEnum.CONCERT, speaker="Orchestre")
+    location = LocationInfo(type="physical", venueId=server.venue_id)
+
+    async def create(i: int) -> None:
+        async with semaphore:
+            await client.event_offers.create_event_offer(
+                accessibility=accessibility,
+                categoryRelatedField=category,
+                hasTicket=False,
+                location=location,
+                name=f"Concert {i}",
+                idAtProvider=f"bench-{i}",
+                description="Benchmark offer",
+                eventDuration=120,
+                image=image,
+            )
+
+    await asyncio.gather(*(create(i) for i in range(args.items)))
+    return args.items
+
+
+async def images(client: TimedClient, server: MockPassCultureServer, args) -> int:
+    # A PNG header for a 600x900 image followed by filler: only the header is
+    # ever parsed.
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII5s", 13, b"IHDR", 600, 900, b"\x08\x02\0\0\0")
+    with tempfile.NamedTemporaryFile(suffix=".png") as f:
+        f.write(header)
+        f.truncate(args.image_size)
+        f.flush()
+        return await creation(client, server, args, image=ImageFile(f.name, credit="Benchmark"))
+
+
+SCENARIOS = {
+    "pagination": pagination,
+    "validation": validation,
+    "creation": creation,
+    "images": images,
+}
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def execute(name: str, args, trace_memory: bool):
+    server = MockPassCultureServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        bookings_per_offer=args.items,
+        page_size=args.page_size,
+    )
+    http_client = server.http_client()
+    client = TimedClient(
+        api_key="bench",
+        api_endpoint=str(http_client.base_url),
+        http_client=http_client,
+        retry_policy=RetryPolicy(base_delay=0.01),
+    )
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    items = await SCENARIOS[name](client, server, args)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await http_client.aclose()
+    return client.latencies, items, elapsed, peak
+
+
+def run(name: str, args) -> None:
+    # Memory is traced in a separate run: tracemalloc slows everything down.
+    latencies, items, elapsed, _ = asyncio.run(execute(name, args, trace_memory=False))
+    _, _, _, peak = asyncio.run(execute(name, args, trace_memory=True))
+    print(
+        f"{name:11s} {len(latencies):6d} req  "
+        f"p50 {percentile(latencies, 0.5) * 1e3:7.2f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms  "
+        f"mean {statistics.fmean(latencies) * 1e3:7.2f} ms  "
+        f"{len(latencies) / elapsed:8.1f} req/s  "
+        f"{items / elapsed:9.1f} items/s  "
+        f"peak {peak / 2**20:7.2f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--items", type=int, default=5000, help="bookings, tokens or offers per scenario")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--image-size", type=int, default=2**20, help="bytes per image in the images scenario")
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for name in args.scenario or SCENARIOS:
+        run(name, args)
+
+
+if __name__ == "__main__":
+    main()
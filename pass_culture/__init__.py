@@ -1,25 +1,75 @@
-from client import PassCultureClient
-from exceptions import PassCultureAPIError, AuthenticationError, RateLimitError, ResourceNotFoundError
+"""
+Async client for the Pass Culture API.
 
-__all__ = [
-    "PassCultureClient",
-    "PassCultureAPIError",
-    "AuthenticationError",
-    "RateLimitError",
-    "ResourceNotFoundError",
-]
+Public names are imported from their submodule on first access, so that
+`import pass_culture` stays cheap for short-lived programs.
+"""
+from typing import TYPE_CHECKING
 
-import dotenv
-import asyncio
+from ._lazy import lazy_exports
 
-async def main(client   : PassCultureClient):
-    balec = await client.bookings.validate_booking("TNUJTH")
-    
-    print(balec)
+_EXPORTS = {
+    "PassCultureClient": "client",
+    "create_http_client": "client",
+    "PassCultureClientPool": "pool",
+    "SyncPassCultureClient": "blocking",
+    "BackgroundLoop": "blocking",
+    "Settings": "config",
+    "TransportSettings": "config",
+    "PassCultureAPIError": "exceptions",
+    "AuthenticationError": "exceptions",
+    "RateLimitError": "exceptions",
+    "ResourceNotFoundError": "exceptions",
+    "CircuitOpenError": "exceptions",
+    "ResponseCache": "cache",
+    "RetryPolicy": "retry",
+    "CircuitBreaker": "resilience",
+    "HedgePolicy": "resilience",
+    "TokenBucketLimiter": "ratelimit",
+    "ResponseMode": "parsing",
+    "Instrumentation": "instrumentation",
+    "MetricsCollector": "instrumentation",
+    "OpenTelemetryHook": "instrumentation",
+    "FingerprintStore": "fingerprints",
+    "MemoryFingerprintStore": "fingerprints",
+    "SQLiteFingerprintStore": "fingerprints",
+    "ImageFile": "images",
+    "InvalidImageError": "images",
+    "EventOfferUpserter": "upsert",
+    "BookingSyncEngine": "booking_sync",
+    "BookingExporter": "export",
+    "BookingIndex": "booking_index",
+    "WriteBehindQueue": "write_behind",
+    "SQLiteJournal": "write_behind",
+    "SQLiteBookingStore": "booking_sync",
+}
 
-if __name__ == "__main__":
-    dotenv.load_dotenv()
-    api_key = dotenv.get_key(dotenv.find_dotenv(), "API_TEST_KEY")
-    endpoint = dotenv.get_key(dotenv.find_dotenv(), "API_TEST_ENDPOINT")
-    client = PassCultureClient(api_key=api_key, api_endpoint=endpoint)
-    asyncio.run(main(client))
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .blocking import BackgroundLoop, SyncPassCultureClient
+    from .booking_index import BookingIndex
+    from .booking_sync import BookingSyncEngine, SQLiteBookingStore
+    from .cache import ResponseCache
+    from .client import PassCultureClient, create_http_client
+    from .config import Settings, TransportSettings
+    from .export import BookingExporter
+    from .exceptions import (
+        AuthenticationError,
+        CircuitOpenError,
+        PassCultureAPIError,
+        RateLimitError,
+        ResourceNotFoundError,
+    )
+    from .fingerprints import FingerprintStore, MemoryFingerprintStore, SQLiteFingerprintStore
+    from .images import ImageFile, InvalidImageError
+    from .instrumentation import Instrumentation, MetricsCollector, OpenTelemetryHook
+    from .parsing import ResponseMode
+    from .pool import PassCultureClientPool
+    from .ratelimit import TokenBucketLimiter
+    from .resilience import CircuitBreaker, HedgePolicy
+    from .retry import RetryPolicy
+    from .upsert import EventOfferUpserter
+    from .write_behind import SQLiteJournal, WriteBehindQueue
@@ -0,0 +1,27 @@
+"""
+Validate a booking against the API configured in the .env file.
+
+Usage:
+    python -m pass_culture TOKEN
+"""
+import asyncio
+import sys
+
+import dotenv
+
+from .client import PassCultureClient
+
+
+async def main(client: PassCultureClient, token: str):
+    result = await client.bookings.validate_booking(token)
+
+    print(result)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(__doc__.strip())
+    api_key = dotenv.get_key(dotenv.find_dotenv(), "API_TEST_KEY")
+    endpoint = dotenv.get_key(dotenv.find_dotenv(), "API_TEST_ENDPOINT")
+    client = PassCultureClient(api_key=api_key, api_endpoint=endpoint)
+    asyncio.run(main(client, sys.argv[1]))
@@ -0,0 +1,30 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module `__getattr__` and `__dir__` of a package whose public
+    names are imported from their submodule on first access.
+
+    Args:
+        package: Name of the package (its `__name__`)
+        exports: Public name -> submodule, relative to the package
+
+    Returns:
+        The (`__getattr__`, `__dir__`) functions to assign in the package
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{module}", package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
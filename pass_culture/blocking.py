@@ -0,0 +1,255 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional
+
+from .endpoints.base import BaseEndpoint
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever in a daemon thread, for synchronous callers.
+
+    Coroutines are submitted from any thread with `run`, which blocks until
+    they finish. After a fork (Celery prefork workers, for instance), the
+    child process starts a loop of its own on first use.
+    """
+
+    _default: Optional["BackgroundLoop"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @classmethod
+    def default(cls) -> "BackgroundLoop":
+        """Return the loop shared by the synchronous clients of the process."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first access."""
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid():
+                    self._start()
+        return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="pass-culture-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop, self._pid = loop, os.getpid()
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        Raises:
+            RuntimeError: If called from the loop's own thread, which would deadlock
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run can't be called from the loop thread")
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread."""
+        if self._loop is None or self._pid != os.getpid():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+
+
+class _SyncProxy:
+    """
+    Synchronous view of an async object: coroutine methods block until done,
+    async generator methods become iterators, endpoints are wrapped in turn.
+
+    The target is looked up through `resolve` on every call, so that a
+    proxy keeps working when its target is replaced.
+    """
+
+    def __init__(self, resolve: Callable[[], Any], runner: BackgroundLoop):
+        self._resolve = resolve
+        self._runner = runner
+
+    @property
+    def _target(self) -> Any:
+        return self._resolve()
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if isinstance(value, BaseEndpoint):
+            value = _SyncProxy(lambda: getattr(self._target, name), self._runner)
+        elif inspect.isasyncgenfunction(value):
+            value = self._iterator(name, value)
+        elif inspect.iscoroutinefunction(value):
+            value = self._blocking(name, value)
+        else:
+            return value
+        if not name.startswith("_"):
+            # Cached, so that repeated calls skip the introspection.
+            self.__dict__[name] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(dir(self._target)) | set(self.__dict__))
+
+    def _blocking(self, name: str, method: Callable[..., Awaitable]) -> Callable:
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            return self._runner.run(getattr(self._target, name)(*args, **kwargs))
+
+        call.__async__ = lambda: getattr(self._target, name)
+        return call
+
+    def _iterator(self, name: str, method: Callable[..., Any]) -> Callable:
+        runner = self._runner
+
+        @functools.wraps(method)
+        def iterate(*args, **kwargs) -> Iterator:
+            generator = getattr(self._target, name)(*args, **kwargs)
+            try:
+                while True:
+                    try:
+                        yield runner.run(generator.__anext__())
+                    except StopAsyncIteration:
+                        return
+            finally:
+                runner.run(generator.aclose())
+
+        return iterate
+
+
+class SyncPassCultureClient(_SyncProxy):
+    """
+    Synchronous Pass Culture client, for Django views, Celery tasks and
+    other synchronous code.
+
+    It mirrors `PassCultureClient`: every endpoint method has the same
+    name and arguments and returns the same values, without `await`.
+    Iterators such as `bookings.iter_bookings` are plain iterators.
+
+    Calls run on a long-lived background event loop (see `BackgroundLoop`)
+    where the underlying async client keeps its connection pool between
+    calls. Instances are thread-safe: concurrent callers share the pool, and
+    their requests run concurrently on the loop.
+
+    After a fork, the child process rebuilds the async client from the
+    constructor arguments on first use, on its own loop: the parent's
+    connections are never shared. Objects given as arguments (an
+    `http_client`, a rate limiter) are reused as they are.
+    """
+
+    def __init__(self, *args, loop: Optional[BackgroundLoop] = None, **kwargs):
+        """
+        Initialize the client.
+
+        Args:
+            loop: Background loop to run on, defaults to the process-wide one
+            *args, **kwargs: `PassCultureClient` arguments
+        """
+        runner = loop or BackgroundLoop.default()
+        super().__init__(self._current, runner)
+        self._args, self._kwargs = args, kwargs
+        self._lock = threading.Lock()
+        self._client = runner.run(self._create(args, kwargs))
+        self._pid = os.getpid()
+
+    def _current(self):
+        """The async client of this process, rebuilt after a fork."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._client = self._runner.run(self._create(self._args, self._kwargs))
+                    self._pid = os.getpid()
+        return self._client
+
+    @staticmethod
+    async def _create(args, kwargs):
+        # Built on the loop, which the async client belongs to.
+        from .client import PassCultureClient
+
+        return PassCultureClient(*args, **kwargs)
+
+    @property
+    def async_client(self):
+        """The underlying `PassCultureClient`."""
+        return self._target
+
+    def map(
+        self,
+        method: Callable,
+        *iterables: Iterable,
+        concurrency: int = 16,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Call an endpoint method for every item of `iterables`, concurrently.
+
+        Example:
+            results = client.map(client.bookings.get_booking, tokens)
+
+        Args:
+            method: Method of this client (`client.bookings.get_booking`) or of
+                the underlying async client
+            *iterables: Positional arguments of the calls, zipped as with `map`
+            concurrency: Maximum number of calls running at the same time
+            return_exceptions: Return exceptions in the results instead of
+                raising the first one
+
+        Returns:
+            The results, in the order of the arguments
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        resolve = getattr(method, "__async__", None)
+        method = resolve() if resolve is not None else method
+        calls = list(zip(*iterables))
+
+        async def run_all() -> List[Any]:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def run_one(args):
+                async with semaphore:
+                    return await method(*args)
+
+            return await asyncio.gather(
+                *(run_one(args) for args in calls), return_exceptions=return_exceptions
+            )
+
+        return self._runner.run(run_all())
+
+    def close(self) -> None:
+        """Close the underlying client. The background loop keeps running."""
+        self._runner.run(self._target.close())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,285 @@
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from pydantic import BaseModel
+
+from .models.bookings import Booking, BookingStatus
+from .parsing import ResponseMode
+
+if TYPE_CHECKING:
+    from .client import PassCultureClient
+
+_STATUSES: Sequence[BookingStatus] = tuple(BookingStatus)
+_STATUS_CODES = {status.value: code for code, status in enumerate(_STATUSES)}
+# Stored in place of a missing price category ID.
+_NO_ID = -1
+
+
+class IndexedBooking:
+    """
+    A booking as stored by a `BookingIndex`: the indexed fields, plus the
+    extra fields the index was asked to keep.
+    """
+
+    __slots__ = ("id", "token", "offer_id", "stock_id", "price_category_id", "quantity", "status", "extra")
+
+    def __init__(self, id, token, offer_id, stock_id, price_category_id, quantity, status, extra):
+        self.id = id
+        self.token = token
+        self.offer_id = offer_id
+        self.stock_id = stock_id
+        self.price_category_id = price_category_id
+        self.quantity = quantity
+        self.status = status
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return f"IndexedBooking(id={self.id}, token={self.token!r}, status={self.status.value})"
+
+
+class BookingIndex:
+    """
+    Compact in-memory index of a venue's bookings, for door control.
+
+    Only the ID, token, offer, stock, price category, quantity and status of
+    each booking are kept, in arrays (one slot per booking), plus the
+    `fields` the index is created with, as interned strings. Hash indexes
+    give O(1) lookups by token and ID, and by stock, price category or
+    status for the lists of matching bookings.
+
+    The index is filled from `list_bookings` results (`add`, `add_page` or
+    `load`), and, once attached to a client (`attach`), follows the
+    validations, validation reverts and cancellations made through it.
+    """
+
+    def __init__(self, fields: Iterable[str] = ()):
+        """
+        Initialize an empty index.
+
+        Args:
+            fields: Other `Booking` fields to keep, `user_last_name` for instance
+        """
+        self.fields = tuple(fields)
+        for name in self.fields:
+            if name not in Booking.model_fields:
+                raise ValueError(f"Unknown booking field: {name}")
+        self._keys = tuple(Booking.model_fields[name].alias or name for name in self.fields)
+        self._ids = array("q")
+        self._offer_ids = array("q")
+        self._stock_ids = array("q")
+        self._price_category_ids = array("q")
+        self._quantities = array("l")
+        self._statuses = bytearray()
+        self._tokens: List[Optional[str]] = []
+        self._extra: List[List[Optional[str]]] = [[] for _ in self.fields]
+        self._by_id: Dict[int, int] = {}
+        self._by_token: Dict[str, int] = {}
+        self._by_stock: Dict[int, array] = {}
+        self._by_price_category: Dict[int, array] = {}
+        self._by_status: List[Set[int]] = [set() for _ in _STATUSES]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._by_token
+
+    @staticmethod
+    def _intern(value: Any) -> Any:
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def add(self, booking: Any) -> None:
+        """
+        Add a booking, or update it if its ID is already indexed.
+
+        Args:
+            booking: `Booking` object, or raw booking dict as returned by the API
+        """
+        if isinstance(booking, BaseModel):
+            booking = booking.model_dump(by_alias=True)
+        booking_id = booking["id"]
+        stock_id = booking["stockId"]
+        price_category_id = booking.get("priceCategoryId")
+        if price_category_id is None:
+            price_category_id = _NO_ID
+        status = booking["status"]
+        code = _STATUS_CODES[status.value if isinstance(status, BookingStatus) else status]
+        token = self._intern(booking.get("token"))
+
+        row = self._by_id.get(booking_id)
+        if row is None:
+            row = len(self._ids)
+            self._ids.append(booking_id)
+            self._offer_ids.append(booking["offerId"])
+            self._stock_ids.append(stock_id)
+            self._price_category_ids.append(price_category_id)
+            self._quantities.append(booking["quantity"])
+            self._statuses.append(code)
+            self._tokens.append(token)
+            for values, key in zip(self._extra, self._keys):
+                values.append(self._intern(booking.get(key)))
+            self._by_id[booking_id] = row
+            self._by_stock.setdefault(stock_id, array("l")).append(row)
+            if price_category_id != _NO_ID:
+                self._by_price_category.setdefault(price_category_id, array("l")).append(row)
+        else:
+            self._move(self._by_stock, self._stock_ids, row, stock_id)
+            self._move(self._by_price_category, self._price_category_ids, row, price_category_id)
+            self._offer_ids[row] = booking["offerId"]
+            self._quantities[row] = booking["quantity"]
+            self._by_status[self._statuses[row]].discard(row)
+            self._statuses[row] = code
+            previous = self._tokens[row]
+            if previous is not None and previous != token:
+                del self._by_token[previous]
+            self._tokens[row] = token
+            for values, key in zip(self._extra, self._keys):
+                values[row] = self._intern(booking.get(key))
+        self._by_status[code].add(row)
+        if token is not None:
+            self._by_token[token] = row
+
+    @staticmethod
+    def _move(index: Dict[int, array], values: array, row: int, value: int) -> None:
+        """Set `values[row]`, moving the row between the lists of `index`."""
+        previous = values[row]
+        if previous == value:
+            return
+        if previous != _NO_ID:
+            rows = index[previous]
+            rows.remove(row)
+            if not rows:
+                del index[previous]
+        if value != _NO_ID:
+            index.setdefault(value, array("l")).append(row)
+        values[row] = value
+
+    def add_page(self, page: Any) -> None:
+        """Add the bookings of a `list_bookings` result (`BookingList` or raw dict)."""
+        for booking in page["data"] if isinstance(page, dict) else page.bookings:
+            self.add(booking)
+
+    async def load(self, client: "PassCultureClient", offerIds: Iterable[int], **filters) -> int:
+        """
+        Add the bookings of offers, fetched page after page in RAW response
+        mode, so that no `Booking` object is built.
+
+        Args:
+            client: Client to fetch the bookings with
+            offerIds: IDs of the offers whose bookings to index
+            **filters: Other `list_bookings` filters
+
+        Returns:
+            Number of bookings in the index
+        """
+        for offerId in offerIds:
+            pages = client.bookings.iter_booking_pages(offerId, response_mode=ResponseMode.RAW, **filters)
+            try:
+                async for page in pages:
+                    self.add_page(page)
+            finally:
+                await pages.aclose()
+        return len(self)
+
+    def set_status(self, token: str, status: BookingStatus) -> bool:
+        """
+        Change the status of a booking.
+
+        Returns:
+            Whether the token is indexed
+        """
+        row = self._by_token.get(token)
+        if row is None:
+            return False
+        code = _STATUS_CODES[BookingStatus(status).value]
+        self._by_status[self._statuses[row]].discard(row)
+        self._statuses[row] = code
+        self._by_status[code].add(row)
+        return True
+
+    def __call__(self, event: str, fields: Dict[str, Any]) -> None:
+        # Instrumentation hook, see `attach`.
+        if event == "booking_status":
+            self.set_status(fields["token"], fields["status"])
+
+    def attach(self, client: "PassCultureClient") -> "BookingIndex":
+        """
+        Follow the status changes made through `client`: successful calls to
+        `validate_booking`, `revert_validation` and `delete_booking` (and the
+        bulk `validate_bookings`) update the index.
+        """
+        client.instrumentation.add(self)
+        return self
+
+    def detach(self, client: "PassCultureClient") -> None:
+        """Stop following the status changes made through `client`."""
+        client.instrumentation.remove(self)
+
+    def _entry(self, row: int) -> IndexedBooking:
+        price_category_id = self._price_category_ids[row]
+        return IndexedBooking(
+            self._ids[row],
+            self._tokens[row],
+            self._offer_ids[row],
+            self._stock_ids[row],
+            None if price_category_id == _NO_ID else price_category_id,
+            self._quantities[row],
+            _STATUSES[self._statuses[row]],
+            {name: values[row] for name, values in zip(self.fields, self._extra)},
+        )
+
+    def get(self, token: str) -> Optional[IndexedBooking]:
+        """Return the booking with a token, or None."""
+        row = self._by_token.get(token)
+        return None if row is None else self._entry(row)
+
+    def get_by_id(self, booking_id: int) -> Optional[IndexedBooking]:
+        """Return the booking with an ID, or None."""
+        row = self._by_id.get(booking_id)
+        return None if row is None else self._entry(row)
+
+    def status_of(self, token: str) -> Optional[BookingStatus]:
+        """Return the status of the booking with a token, or None if it isn't indexed."""
+        row = self._by_token.get(token)
+        return None if row is None else _STATUSES[self._statuses[row]]
+
+    def find(
+        self,
+        stock_id: Optional[int] = None,
+        price_category_id: Optional[int] = None,
+        status: Optional[BookingStatus] = None,
+    ) -> List[IndexedBooking]:
+        """
+        Return the bookings matching every given criterion, in indexing order.
+
+        Args:
+            stock_id: Stock of the bookings
+            price_category_id: Price category of the bookings
+            status: Status of the bookings
+        """
+        candidates = []
+        if stock_id is not None:
+            candidates.append(self._by_stock.get(stock_id, ()))
+        if price_category_id is not None:
+            candidates.append(self._by_price_category.get(price_category_id, ()))
+        if status is not None:
+            candidates.append(self._by_status[_STATUS_CODES[BookingStatus(status).value]])
+        if not candidates:
+            rows: Iterable[int] = range(len(self))
+        else:
+            candidates.sort(key=len)
+            rows = candidates[0]
+            for other in candidates[1:]:
+                other = other if isinstance(other, set) else set(other)
+                rows = [row for row in rows if row in other]
+        return [self._entry(row) for row in sorted(rows)]
+
+    def count(self, stock_id: Optional[int] = None, status: Optional[BookingStatus] = None) -> int:
+        """Return the number of bookings of a stock and/or with a status."""
+        if stock_id is None:
+            return len(self) if status is None else len(self._by_status[_STATUS_CODES[BookingStatus(status).value]])
+        if status is None:
+            return len(self._by_stock.get(stock_id, ()))
+        code = _STATUS_CODES[BookingStatus(status).value]
+        return sum(1 for row in self._by_stock.get(stock_id, ()) if self._statuses[row] == code)
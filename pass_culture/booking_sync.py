@@ -0,0 +1,363 @@
+import json
+import sqlite3
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .fingerprints import fingerprint
+from .models.bookings import Booking, BookingStatus
+from .parsing import ResponseMode
+
+
+class BookingChangeType(str, Enum):
+    """Kind of change detected by a sync."""
+    INSERTED = "INSERTED"
+    CHANGED = "CHANGED"
+    CANCELLED = "CANCELLED"
+
+
+class BookingChange(BaseModel):
+    """
+    A booking that was inserted, changed or cancelled since the previous sync.
+    """
+
+    type: BookingChangeType
+    booking: Booking
+    previous_status: Optional[BookingStatus] = None
+
+
+def booking_fingerprint(data: dict) -> str:
+    """Return a stable hash of a raw booking."""
+    return fingerprint(data)
+
+
+class SQLiteBookingStore:
+    """
+    Local SQLite store of bookings and per-offer sync watermarks.
+    """
+
+    def __init__(self, path: str = "bookings.sqlite3"):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: Path of the SQLite database, or ":memory:"
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS bookings (
+                id INTEGER PRIMARY KEY,
+                offer_id INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bookings_offer ON bookings (offer_id, status);
+            CREATE TABLE IF NOT EXISTS watermarks (
+                offer_id INTEGER NOT NULL,
+                scope TEXT NOT NULL,
+                first_index INTEGER NOT NULL,
+                beginning_datetime TEXT,
+                synced_at TEXT NOT NULL,
+                PRIMARY KEY (offer_id, scope)
+            );
+            """
+        )
+
+    def fingerprints(self, ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """Return the (status, fingerprint) of the known bookings among `ids`."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        rows = self._db.execute(
+            f"SELECT id, status, fingerprint FROM bookings WHERE id IN ({','.join('?' * len(ids))})",
+            ids,
+        )
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def save(self, rows: Iterable[Tuple[int, int, str, str, str]]) -> None:
+        """Insert or replace (id, offer_id, status, fingerprint, data) rows."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO bookings (id, offer_id, status, fingerprint, data) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def ids(self, offer_id: int, status: BookingStatus) -> List[int]:
+        """Return the sorted IDs of the stored bookings of an offer with a status."""
+        rows = self._db.execute(
+            "SELECT id FROM bookings WHERE offer_id = ? AND status = ? ORDER BY id",
+            (offer_id, BookingStatus(status).value),
+        )
+        return [row[0] for row in rows]
+
+    def tokens(self, ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """Return the tokens of the stored bookings among `ids`."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        rows = self._db.execute(
+            f"SELECT id, data FROM bookings WHERE id IN ({','.join('?' * len(ids))})", ids
+        )
+        return {row[0]: json.loads(row[1]).get("token") for row in rows}
+
+    def watermark(self, offer_id: int, scope: str) -> Tuple[int, Optional[str]]:
+        """Return the next `firstIndex` and the `beginningDatetime` of a sync scope."""
+        row = self._db.execute(
+            "SELECT first_index, beginning_datetime FROM watermarks WHERE offer_id = ? AND scope = ?",
+            (offer_id, scope),
+        ).fetchone()
+        return (row[0], row[1]) if row else (1, None)
+
+    def set_watermark(
+        self, offer_id: int, scope: str, first_index: int, beginning_datetime: Optional[str]
+    ) -> None:
+        """Record how far a sync scope went."""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks (offer_id, scope, first_index, beginning_datetime, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (offer_id, scope, first_index, beginning_datetime, datetime.now(timezone.utc).isoformat()),
+            )
+
+    def reset(self, offer_id: int) -> None:
+        """Forget the watermarks of an offer, so that the next sync rescans it."""
+        with self._db:
+            self._db.execute("DELETE FROM watermarks WHERE offer_id = ?", (offer_id,))
+
+    def bookings(self, offer_id: int, status: Optional[BookingStatus] = None) -> Iterable[Booking]:
+        """Iterate over the stored bookings of an offer."""
+        query = "SELECT data FROM bookings WHERE offer_id = ?"
+        params = [offer_id]
+        if status:
+            query += " AND status = ?"
+            params.append(BookingStatus(status).value)
+        for (data,) in self._db.execute(query, params):
+            yield Booking.model_validate_json(data)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BookingSyncEngine:
+    """
+    Incremental synchronisation of bookings into a local store.
+
+    Each offer is synced in scopes: the full booking list, plus one list per
+    swept status (cancelled and used bookings by default), each with its own
+    watermark. Bookings are compared to the store by fingerprint and only
+    the differences are written and emitted.
+
+    The full list is append-only: its watermark is the `firstIndex`
+    following the last booking seen, and the next sync resumes from there.
+
+    Status lists are not: a booking changing status enters a list at its
+    place in booking order, or leaves it, shifting the others. Their
+    watermark is their length, and the store knows which bookings they held.
+    A sync reads the end of each list, then compares, between the pages it
+    read, the number of bookings the API lists with the number the store
+    holds. Only the stretches where they differ are read, by bisection, so
+    a sync costs a few requests per changed booking. Bookings which left a
+    status list, a reverted validation for instance, are fetched by token.
+
+    The API has no change feed. Where as many bookings entered a status
+    list as left it between two pages read, the counts match and the
+    changes are only picked up by a full rescan (`full=True`).
+    """
+
+    ALL = "ALL"
+
+    def __init__(
+        self,
+        client,
+        store: SQLiteBookingStore,
+        statuses: Iterable[BookingStatus] = (BookingStatus.CANCELLED, BookingStatus.USED),
+    ):
+        """
+        Initialize the sync engine.
+
+        Args:
+            client: PassCultureClient used to list bookings
+            store: Local booking store
+            statuses: Statuses whose filtered lists are swept to detect status changes
+        """
+        self.client = client
+        self.store = store
+        self.statuses = tuple(BookingStatus(status) for status in statuses)
+
+    async def sync(
+        self,
+        offerId: int,
+        beginningDatetime: Optional[str] = None,
+        full: bool = False,
+    ) -> AsyncIterator[BookingChange]:
+        """
+        Sync the bookings of an offer and stream what changed.
+
+        Args:
+            offerId: ID of the offer to sync
+            beginningDatetime: Only sync bookings of events starting after this
+                date (ISO 8601). Changing it restarts the offer's sync from scratch.
+            full: Rescan the full list from the start instead of resuming
+
+        Yields:
+            BookingChange objects for inserted, changed and cancelled bookings
+        """
+        firstIndex, since = self.store.watermark(offerId, self.ALL)
+        if full or since != beginningDatetime:
+            firstIndex = 1
+        pages = self.client.bookings.iter_booking_pages(
+            offerId,
+            firstIndex=firstIndex,
+            beginningDatetime=beginningDatetime,
+            response_mode=ResponseMode.RAW,
+        )
+        async for page in pages:
+            bookings = page["data"]
+            for change in self._apply(offerId, bookings):
+                yield change
+            firstIndex += len(bookings)
+            self.store.set_watermark(offerId, self.ALL, firstIndex, beginningDatetime)
+        self.store.set_watermark(offerId, self.ALL, firstIndex, beginningDatetime)
+
+        for status in self.statuses:
+            length, since = self.store.watermark(offerId, status.value)
+            rescan = full or since != beginningDatetime or length == 1
+            changes, length = await self._sync_status(
+                offerId, status, beginningDatetime, None if rescan else length - 1
+            )
+            for change in changes:
+                yield change
+            self.store.set_watermark(offerId, status.value, length, beginningDatetime)
+
+    async def _sync_status(
+        self,
+        offerId: int,
+        status: BookingStatus,
+        beginningDatetime: Optional[str],
+        length: Optional[int],
+    ) -> Tuple[List[BookingChange], int]:
+        """
+        Find the changes of a status list, reading it only where it differs
+        from the store.
+
+        Args:
+            length: Number of bookings of the list at the previous sync, None
+                to read the whole list
+
+        Returns:
+            The changes, and the `firstIndex` following the end of the list
+        """
+        known = self.store.ids(offerId, status)
+        changes: List[BookingChange] = []
+        left = set()
+        page_size = 1
+
+        async def read(position: int) -> List[int]:
+            """Apply the page starting at a 0-based position of the list, return its IDs."""
+            nonlocal page_size
+            page = await self.client.bookings.list_bookings(
+                offerId,
+                firstIndex=position + 1,
+                status=status,
+                beginningDatetime=beginningDatetime,
+                response_mode=ResponseMode.RAW,
+            )
+            changes.extend(self._apply(offerId, page["data"]))
+            page_size = max(page_size, len(page["data"]))
+            return [data["id"] for data in page["data"]]
+
+        def compare(ids: List[int]) -> None:
+            """Bookings of the store within the IDs of consecutive listed bookings have left the list."""
+            listed = set(ids)
+            for booking_id in known[bisect_right(known, ids[0]) : bisect_left(known, ids[-1])]:
+                if booking_id not in listed:
+                    left.add(booking_id)
+
+        async def bisect(before: int, before_id: Optional[int], after: int, after_id: int) -> None:
+            """Compare the bookings listed strictly between two positions with the store."""
+            listed = after - before - 1
+            low = bisect_right(known, before_id) if before_id is not None else 0
+            high = bisect_left(known, after_id)
+            if listed == high - low:
+                return
+            if listed == 0:
+                left.update(known[low:high])
+                return
+            start = before + 1 + max(0, (listed - page_size) // 2)
+            ids = (await read(start))[: after - start]
+            if not ids:
+                return
+            compare(ids)
+            await bisect(before, before_id, start, ids[0])
+            await bisect(start + len(ids) - 1, ids[-1], after, after_id)
+
+        # Read the end of the list, from the last booking seen by the previous
+        # sync. Bookings may have left the list since: step back if it's shorter.
+        position = 0 if length is None else max(0, length - 1)
+        tail = await read(position)
+        while not tail and position > 0:
+            position //= 2
+            tail = await read(position)
+        if not tail:
+            left.update(known)
+            end = 0
+        else:
+            end = position + len(tail)
+            while True:
+                ids = await read(end)
+                if not ids:
+                    break
+                tail.extend(ids)
+                end += len(ids)
+            compare(tail)
+            left.update(known[bisect_right(known, tail[-1]) :])
+            await bisect(-1, None, position, tail[0])
+
+        # Bookings which left the list aren't listed anywhere we read.
+        for token in self.store.tokens(sorted(left)).values():
+            if token is not None:
+                data = await self.client.bookings.get_booking(token, response_mode=ResponseMode.RAW)
+                changes.extend(self._apply(offerId, [data]))
+        return changes, end + 1
+
+    def _apply(self, offerId: int, bookings: list) -> list:
+        """Compare a page of raw bookings with the store, save and return the changes."""
+        known = self.store.fingerprints(data["id"] for data in bookings)
+        rows, changes = [], []
+        for data in bookings:
+            fingerprint = booking_fingerprint(data)
+            previous = known.get(data["id"])
+            if previous is not None and previous[1] == fingerprint:
+                continue
+            status = data["status"]
+            rows.append((data["id"], offerId, status, fingerprint, json.dumps(data)))
+            if previous is None:
+                change_type = BookingChangeType.INSERTED
+            elif status == BookingStatus.CANCELLED and previous[0] != BookingStatus.CANCELLED:
+                change_type = BookingChangeType.CANCELLED
+            else:
+                change_type = BookingChangeType.CHANGED
+            changes.append(
+                BookingChange(
+                    type=change_type,
+                    booking=Booking.model_validate(data),
+                    previous_status=previous[0] if previous else None,
+                )
+            )
+        if rows:
+            self.store.save(rows)
+        return changes
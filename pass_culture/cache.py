@@ -0,0 +1,143 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+DEFAULT_ROUTE_TTLS = {
+    "bookings/v1/token/": 10.0,
+    "offers/v1/events/": 60.0,
+}
+
+
+def request_key(method: str, path: str, params: Optional[dict] = None) -> Tuple[Hashable, ...]:
+    """
+    Build a hashable key identifying a request.
+
+    Parameters set to None are dropped and the remaining ones are sorted, so
+    that equivalent calls share the same key.
+    """
+    if not params:
+        return (method, path, ())
+    normalized = tuple(
+        sorted(
+            (name, value.value if hasattr(value, "value") else str(value))
+            for name, value in params.items()
+            if value is not None
+        )
+    )
+    return (method, path, normalized)
+
+
+class CacheEntry:
+    """A cached response body with its freshness and validator."""
+
+    __slots__ = ("data", "etag", "expires_at")
+
+    def __init__(self, data: Any, etag: Optional[str], expires_at: float):
+        self.data = data
+        self.etag = etag
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of GET response bodies with per-route TTLs.
+
+    Only routes matching one of the configured path prefixes are cached.
+    Stale entries carrying an ETag are kept so that they can be revalidated
+    with `If-None-Match` instead of being downloaded again.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        route_ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            route_ttls: Mapping of path prefixes to time-to-live in seconds.
+                The longest matching prefix wins. Defaults to `DEFAULT_ROUTE_TTLS`.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.route_ttls = dict(DEFAULT_ROUTE_TTLS if route_ttls is None else route_ttls)
+        self._prefixes = sorted(self.route_ttls, key=len, reverse=True)
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        """Return the TTL of a path, or None when the route is not cached."""
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.route_ttls[prefix]
+        return None
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the entry for a key, fresh or stale, and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: Hashable, data: Any, etag: Optional[str], ttl: float) -> None:
+        """Store a response body under a key, evicting the least recently used entries."""
+        self._entries[key] = CacheEntry(data, etag, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def refresh(self, key: Hashable, ttl: float) -> Optional[CacheEntry]:
+        """Extend the freshness of an entry after a successful revalidation."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + ttl
+            self.revalidations += 1
+        return entry
+
+    def invalidate(self, paths: Iterable[str]) -> int:
+        """
+        Drop every entry for the given paths, whatever their query parameters.
+
+        A path ending with "/" is a prefix: it drops the entries of every path
+        under it, for when the exact path of a changed resource isn't known.
+
+        Returns:
+            Number of dropped entries
+        """
+        paths = set(paths)
+        prefixes = tuple(path for path in paths if path.endswith("/"))
+        stale = [
+            key for key in self._entries if key[1] in paths or (prefixes and key[1].startswith(prefixes))
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
@@ -1,12 +1,57 @@
-from typing import Optional
+import asyncio
+import copy
+import logging
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Optional, Set
 
 import httpx
 
-from config import Settings
-from endpoints.base import BaseEndpoint
-from endpoints.bookings import BookingsEndpoint
-from exceptions import PassCultureAPIError
+from .cache import ResponseCache, request_key
+from .config import Settings, TransportSettings
+from .decoding import decode_response
+from .exceptions import CircuitOpenError, PassCultureAPIError, RateLimitError
+from .fingerprints import FingerprintStore, scope_of
+from .images import StreamingJSONBody
+from .instrumentation import Hook, Instrumentation, RequestTrace, route_of
+from .ratelimit import TokenBucketLimiter, parse_retry_after
+from .parsing import ResponseMode
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
 
+if TYPE_CHECKING:
+    from .resilience import CircuitBreaker, CircuitState, HedgePolicy
+    from .endpoints.bookings import BookingsEndpoint
+    from .endpoints.EventOffers import EventOffersEndpoint
+    from .endpoints.PriceCategories import PriceCategoriesEndpoint
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(
+    api_endpoint: str, transport: Optional[TransportSettings] = None
+) -> httpx.AsyncClient:
+    """
+    Create an HTTP client configured from transport settings.
+
+    The returned client can be shared by several `PassCultureClient`
+    instances (one per API key, for instance) so that they reuse the same
+    connection pool. The caller is responsible for closing it.
+
+    Args:
+        api_endpoint: Base URL for the API
+        transport: Connection pool, keep-alive, HTTP/2 and timeout settings
+
+    Returns:
+        A configured httpx.AsyncClient
+    """
+    transport = transport or TransportSettings()
+    return httpx.AsyncClient(
+        base_url=api_endpoint,
+        timeout=transport.timeouts(),
+        limits=transport.limits(),
+        http2=transport.http2,
+    )
 
 class PassCultureClient:
     """
@@ -18,6 +63,18 @@ class PassCultureClient:
         api_key: Optional[str] = None,
         api_endpoint: Optional[str] = None,
         timeout: int = 30,
+        transport: Optional[TransportSettings] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        response_mode: ResponseMode = ResponseMode.VALIDATE,
+        hooks: Optional[Iterable[Hook]] = None,
+        fingerprint_store: Optional[FingerprintStore] = None,
+        fingerprint_scope: Optional[str] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        hedging: Optional["HedgePolicy"] = None,
     ):
         """
         Initialize the Pass Culture API client.
@@ -25,20 +82,79 @@ class PassCultureClient:
         Args:
             api_key: API key for authentication
             api_endpoint: Base URL for the API
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds, used when no transport settings are given
+            transport: Connection pool, keep-alive, HTTP/2 and timeout settings
+            http_client: Shared HTTP client (see `create_http_client`). It must
+                be bound to the same API endpoint and is not closed by this client.
+            rate_limiter: Client-side rate limiter applied to every request
+            retry_policy: Retry policy for network errors and transient server
+                errors (defaults to `RetryPolicy()`, use `max_attempts=1` to disable)
+            cache: Response cache for read endpoints, disabled by default
+            coalesce_requests: Share a single upstream call between concurrent
+                identical GET requests
+            response_mode: How read endpoints build their return values (see
+                `ResponseMode`). Can be overridden per call.
+            hooks: Instrumentation hooks receiving request, retry, queue wait,
+                decoding and validation events (see `Instrumentation`)
+            fingerprint_store: Store of the fingerprints of written offers and
+                price categories. When set, updates whose body didn't change
+                since the last write are skipped and counted in `skipped_updates`.
+            fingerprint_scope: Namespace of this client's keys in the fingerprint
+                store (a venue ID, for instance). Defaults to a digest of the API
+                key, so that resources of different accounts sharing an
+                `idAtProvider` don't suppress each other's updates.
+            circuit_breaker: Per-route circuit breaker, failing requests fast
+                while a route keeps failing
+            hedging: Policy sending a second copy of GET requests slower than
+                the route's usual latency, the first answer winning
         """
         self.settings = Settings(
             api_key=api_key,
             api_endpoint=api_endpoint,
+            transport=transport or TransportSettings(timeout=timeout),
         )
-        self.timeout = timeout
-        self._client = httpx.AsyncClient(
-            base_url=self.settings.api_endpoint,
-            timeout=self.timeout,
+        self.timeout = self.settings.transport.timeout
+        self._owns_client = http_client is None
+        self._client = http_client or create_http_client(
+            self.settings.api_endpoint, self.settings.transport
         )
-        
-        # Initialize endpoints
-        self.bookings = BookingsEndpoint(self) 
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self.singleflight = SingleFlight() if coalesce_requests else None
+        self.response_mode = ResponseMode(response_mode)
+        self.instrumentation = Instrumentation(hooks)
+        self.fingerprint_store = fingerprint_store
+        self.fingerprint_scope = fingerprint_scope or scope_of(self.settings.api_key)
+        self.skipped_updates = 0
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        # Requests left to complete after a hedge won, see `_hedged`.
+        self._background: Set[asyncio.Task] = set()
+
+    # Endpoints are built on first access, so that their modules and models
+    # are only imported by the programs using them.
+
+    @cached_property
+    def bookings(self) -> "BookingsEndpoint":
+        """Bookings endpoint."""
+        from .endpoints.bookings import BookingsEndpoint
+
+        return BookingsEndpoint(self)
+
+    @cached_property
+    def event_offers(self) -> "EventOffersEndpoint":
+        """Event offers endpoint."""
+        from .endpoints.EventOffers import EventOffersEndpoint
+
+        return EventOffersEndpoint(self)
+
+    @cached_property
+    def price_categories(self) -> "PriceCategoriesEndpoint":
+        """Price categories endpoint."""
+        from .endpoints.PriceCategories import PriceCategoriesEndpoint
+
+        return PriceCategoriesEndpoint(self)
         
     def _get_default_headers(self, applicationData : bool) -> dict:
         """
@@ -58,33 +174,382 @@ class PassCultureClient:
         path: str,
         params: Optional[dict] = None,
         data: Optional[dict] = None,
-        json_data: Optional[dict] = None,
+        json_data: Any = None,
+        idempotent: Optional[bool] = None,
+        invalidates: Optional[Iterable[str]] = None,
     ) -> dict:
         """
         Make an HTTP request to the Pass Culture API.
+
+        When a rate limiter is configured, the request waits for its turn and
+        429 responses are retried after the advertised delay until the
+        limiter's wait budget runs out. Network errors and transient 5xx
+        responses are retried according to the retry policy. GET requests on
+        cached routes are served from the response cache when one is configured.
+
+        Args:
+            idempotent: Whether the request can safely be sent twice. Defaults
+                to the retry policy's view of the HTTP method.
+            invalidates: Paths whose cached responses are made obsolete by this request
         """
-        try:
-            response = await self._client.request(
+        if method == "GET":
+            return await self._get_request(path, params)
+
+        response = await self._send(method, path, params, data, json_data, idempotent)
+        payload = self._decode(method, path, response)
+        if self.cache is not None and invalidates:
+            self.cache.invalidate(invalidates)
+        return payload
+
+    async def _get_request(self, path: str, params: Optional[dict]) -> dict:
+        """
+        Make a GET request, going through the response cache and coalescing
+        concurrent identical requests when they are enabled.
+        """
+        cache = self.cache
+        ttl = cache.ttl_for(path) if cache is not None else None
+        key = request_key("GET", path, params)
+        if ttl:
+            entry = cache.get(key)
+            if entry is not None and entry.fresh:
+                cache.hits += 1
+                return entry.data
+            cache.misses += 1
+
+        def fetch():
+            return self._fetch(key, path, params, ttl)
+
+        if self.singleflight is not None:
+            # Callers joining an in-flight request get their own copy, so that
+            # RAW results can be altered without affecting the other callers.
+            return await self.singleflight.do(key, fetch, share=copy.deepcopy)
+        return await fetch()
+
+    async def _fetch(
+        self, key: tuple, path: str, params: Optional[dict], ttl: Optional[float]
+    ) -> dict:
+        """
+        Fetch a GET response from the API, revalidating and storing it in the
+        cache when the route is cached.
+        """
+        if not ttl:
+            response = await self._send("GET", path, params)
+            return self._decode("GET", path, response)
+
+        cache = self.cache
+        entry = cache.get(key)
+        headers = None
+        if entry is not None and entry.etag:
+            headers = {"If-None-Match": entry.etag}
+        response = await self._send("GET", path, params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key, ttl)
+            return entry.data
+        payload = self._decode("GET", path, response)
+        cache.store(key, payload, response.headers.get("ETag"), ttl)
+        return payload
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        json_data: Any = None,
+        idempotent: Optional[bool] = None,
+        headers: Optional[dict] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, applying rate limiting and retries.
+
+        `json_data` is a JSON-like object, or a body already encoded by
+        `serialization.encode_body` (bytes or `StreamingJSONBody`). JSON
+        bodies holding `ImageFile` values are streamed (see
+        `StreamingJSONBody`) instead of being encoded in memory.
+        """
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        instrumentation = self.instrumentation
+        breaker = self.circuit_breaker
+        hedging = self.hedging
+        idempotent = policy.is_idempotent(method, idempotent)
+        route = route_of(path) if breaker or hedging else None
+        if hedging and not (method == "GET" and idempotent and hedging.applies_to(route)):
+            hedging = None
+        rate_limit_deadline = limiter.deadline() if limiter else None
+        retry_deadline = policy.start()
+        request_headers = self._get_default_headers(json_data is not None)
+        content = None
+        if isinstance(json_data, dict):
+            content = StreamingJSONBody.wrap(json_data)
+        elif json_data is not None:
+            # Already encoded, see `serialization.encode_body`.
+            content = json_data
+        if content is not None:
+            json_data = None
+            if isinstance(content, StreamingJSONBody):
+                request_headers["Content-Length"] = str(content.content_length)
+        if headers:
+            request_headers.update(headers)
+
+        def send(trace: Optional[RequestTrace]):
+            return self._client.request(
                 method=method,
                 url=path,
                 params=params,
                 data=data,
                 json=json_data,
-                headers=self._get_default_headers(json_data is not None),
+                content=content,
+                headers=request_headers,
+                extensions={"trace": trace} if trace else None,
+            )
+
+        attempt = 0
+        while True:
+            if breaker:
+                admitted = self._check_circuit(route)
+            trace = RequestTrace() if instrumentation else None
+            try:
+                # Inside the `try`, so that a probe stuck in the limiter is abandoned.
+                if limiter:
+                    waited = await limiter.acquire(rate_limit_deadline)
+                    if instrumentation:
+                        instrumentation.emit(
+                            "queue_wait", method=method, route=route_of(path), duration=waited
+                        )
+                started = time.perf_counter()
+                if hedging:
+                    response = await self._hedged(route, send, trace, rate_limit_deadline)
+                else:
+                    response = await send(trace)
+            except httpx.RequestError as e:
+                if breaker:
+                    self._record_circuit(route, False, admitted)
+                if instrumentation:
+                    self._emit_request(method, path, started, trace, e.request, None)
+                delay = None
+                if policy.should_retry_error(e, idempotent):
+                    delay = policy.next_delay(attempt, retry_deadline)
+                if delay is None:
+                    raise PassCultureAPIError(f"Request error: {str(e)}")
+                logger.debug("%s %s failed (%r), retrying in %.2fs", method, path, e, delay)
+                self._emit_retry(method, path, attempt, type(e).__name__, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker:
+                    breaker.abandon(route, admitted)
+                raise
+            if breaker:
+                self._record_circuit(route, response.status_code < 500, admitted)
+            if instrumentation:
+                self._emit_request(method, path, started, trace, response.request, response)
+            retry_after = limiter.observe(response) if limiter else None
+            if response.status_code == 429:
+                if not limiter:
+                    raise RateLimitError(
+                        f"HTTP error: 429 - {response.text}",
+                        retry_after=parse_retry_after(response.headers),
+                    )
+                logger.debug("%s %s throttled, retrying in %.2fs", method, path, retry_after)
+                self._emit_retry(method, path, attempt, "429", retry_after)
+                continue
+            if policy.should_retry_status(response.status_code, idempotent):
+                delay = policy.next_delay(
+                    attempt, retry_deadline, parse_retry_after(response.headers)
+                )
+                if delay is not None:
+                    logger.debug(
+                        "%s %s -> %s, retrying in %.2fs", method, path, response.status_code, delay
+                    )
+                    self._emit_retry(method, path, attempt, str(response.status_code), delay)
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+            return response
+
+    def _check_circuit(self, route: str) -> "CircuitState":
+        """
+        Let a request through the circuit breaker, or raise CircuitOpenError.
+
+        Returns the state the request was let through in.
+        """
+        try:
+            admitted, changed = self.circuit_breaker.before(route)
+        except CircuitOpenError:
+            if self.instrumentation:
+                self.instrumentation.emit("circuit_open", route=route)
+            raise
+        if changed and self.instrumentation:
+            self.instrumentation.emit("circuit", route=route, state=changed)
+        return admitted
+
+    def _record_circuit(self, route: str, success: bool, admitted: "CircuitState") -> None:
+        """Report the outcome of a request to the circuit breaker."""
+        changed = self.circuit_breaker.record(route, success, admitted)
+        if changed:
+            logger.debug("Circuit of %s is now %s", route, changed.value)
+            if self.instrumentation:
+                self.instrumentation.emit("circuit", route=route, state=changed)
+
+    async def _hedged(
+        self,
+        route: str,
+        send: Callable[[Optional[RequestTrace]], Awaitable[httpx.Response]],
+        trace: Optional[RequestTrace],
+        rate_limit_deadline: Optional[float],
+    ) -> httpx.Response:
+        """
+        Send a GET request, and a second copy of it if no response came back
+        after the hedging delay of its route. The first response wins.
+
+        The latency of the original request is recorded in the hedging
+        policy: when the copy wins, the original one is left to complete in
+        the background so that slow requests keep counting as slow, rather
+        than as fast as the copy. A copy losing the race is cancelled.
+        """
+        hedging = self.hedging
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(send(trace))
+
+        def observe(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is None:
+                hedging.observe(route, time.perf_counter() - started)
+
+        primary.add_done_callback(observe)
+        tasks = [primary]
+        try:
+            delay = hedging.delay(route)
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not hedging.allow(route):
+                return await primary
+
+            async def hedge() -> httpx.Response:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire(rate_limit_deadline)
+                return await send(None)
+
+            tasks.append(asyncio.ensure_future(hedge()))
+            if self.instrumentation:
+                self.instrumentation.emit("hedge", route=route, outcome="sent")
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            hedging.wins[route] += 1
+                            if self.instrumentation:
+                                self.instrumentation.emit("hedge", route=route, outcome="won")
+                            if not primary.done():
+                                self._background.add(primary)
+                                primary.add_done_callback(self._background.discard)
+                        return task.result()
+            # Both failed: report the error of the original request.
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    if task not in self._background:
+                        task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def _emit_request(
+        self,
+        method: str,
+        path: str,
+        started: float,
+        trace: RequestTrace,
+        request: httpx.Request,
+        response: Optional[httpx.Response],
+    ) -> None:
+        """
+        Report one HTTP attempt to the instrumentation hooks.
+        """
+        self.instrumentation.emit(
+            "request",
+            method=method,
+            route=route_of(path),
+            status_code=response.status_code if response is not None else None,
+            duration=time.perf_counter() - started,
+            request_bytes=int(request.headers.get("Content-Length", 0)),
+            response_bytes=len(response.content) if response is not None else 0,
+            phases=trace.phases(),
+        )
+
+    def _emit_retry(
+        self, method: str, path: str, attempt: int, reason: str, delay: Optional[float]
+    ) -> None:
+        """
+        Report a retry to the instrumentation hooks.
+        """
+        if self.instrumentation:
+            self.instrumentation.emit(
+                "retry",
+                method=method,
+                route=route_of(path),
+                attempt=attempt + 1,
+                reason=reason,
+                delay=delay,
             )
+
+    def _decode(self, method: str, path: str, response: httpx.Response) -> dict:
+        """
+        Check the status of a response and decode its body.
+        """
+        try:
             response.raise_for_status()
-            print(response.json())
-            return response.json()
+            if self.instrumentation:
+                started = time.perf_counter()
+                payload = decode_response(response)
+                self.instrumentation.emit(
+                    "decode",
+                    route=route_of(path),
+                    duration=time.perf_counter() - started,
+                    bytes=len(response.content),
+                )
+            else:
+                payload = decode_response(response)
         except httpx.HTTPStatusError as e:
-            raise PassCultureAPIError(f"HTTP error: {e.response.status_code} - {e.response.text}")
-        except httpx.RequestError as e:
-            raise PassCultureAPIError(f"Request error: {str(e)}")
+            try:
+                errors = decode_response(e.response) or None
+            except ValueError:
+                errors = None
+            raise PassCultureAPIError(
+                f"HTTP error: {e.response.status_code} - {e.response.text}",
+                status_code=e.response.status_code,
+                errors=errors,
+            )
+        except ValueError as e:
+            raise PassCultureAPIError(f"Invalid JSON response: {str(e)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s -> %s (%d bytes)",
+                method,
+                path,
+                response.status_code,
+                len(response.content),
+                extra={
+                    "method": method,
+                    "path": path,
+                    "status_code": response.status_code,
+                    "response_bytes": len(response.content),
+                },
+            )
+        return payload
         
     async def close(self):
         """
-        Close the underlying HTTP client.
+        Close the underlying HTTP client, unless it is shared.
         """
-        await self._client.aclose()
+        for task in list(self._background):
+            task.cancel()
+        if self._owns_client:
+            await self._client.aclose()
         
     async def __aenter__(self):
         return self
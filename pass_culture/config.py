@@ -1,11 +1,94 @@
 import os
 from typing import Optional
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, field_validator
+import httpx
+from pydantic import BaseModel, Field, field_validator
 
-# Load environment variables from .env file
-load_dotenv()
+_environment_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Load environment variables from the .env file, once.
+
+    Called when a setting isn't passed explicitly, rather than at import
+    time, so that programs passing their settings never search the file.
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _environment_loaded = True
+
+
+def getenv(name: str) -> str:
+    """Return an environment variable, loading the .env file first."""
+    load_environment()
+    return os.getenv(name, "")
+
+
+class TransportSettings(BaseModel):
+    """
+    Connection pool, keep-alive, HTTP/2 and timeout settings for the
+    underlying HTTP client.
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    http2: bool = False
+    timeout: float = 30
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+
+    @field_validator(
+        "max_connections",
+        "max_keepalive_connections",
+        "keepalive_expiry",
+        "timeout",
+        "connect_timeout",
+        "read_timeout",
+        "write_timeout",
+        "pool_timeout",
+    )
+    def validate_positive(cls, v):
+        """Reject negative or zero limits and timeouts."""
+        if v is not None and v <= 0:
+            raise ValueError("must be strictly positive")
+        return v
+
+    @field_validator("http2")
+    def validate_http2(cls, v: bool) -> bool:
+        """Make sure the HTTP/2 dependencies are installed when enabled."""
+        if v:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ValueError(
+                    "HTTP/2 support requires the 'h2' package. Install it with `pip install httpx[http2]`."
+                )
+        return v
+
+    def limits(self) -> httpx.Limits:
+        """Build the httpx connection pool limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        """Build the httpx timeouts, falling back to `timeout` for unset phases."""
+        return httpx.Timeout(
+            self.timeout,
+            connect=self.connect_timeout or self.timeout,
+            read=self.read_timeout or self.timeout,
+            write=self.write_timeout or self.timeout,
+            pool=self.pool_timeout or self.timeout,
+        )
 
 
 class Settings(BaseModel):
@@ -15,12 +98,13 @@ class Settings(BaseModel):
     
     api_key: str
     api_endpoint: str
+    transport: TransportSettings = Field(default_factory=TransportSettings)
     
     @field_validator("api_key", mode="before")
     def validate_api_key(cls, v: Optional[str]) -> str:
         """Validate and retrieve API key."""
         if not v:
-            v = os.getenv("API_KEY", "")
+            v = getenv("API_KEY")
         if not v:
             raise ValueError("API key is required. Set it via API_KEY environment variable or pass it to the client.")
         return v
@@ -29,7 +113,7 @@ class Settings(BaseModel):
     def validate_api_endpoint(cls, v: Optional[str]) -> str:
         """Validate and retrieve API endpoint."""
         if not v:
-            v = os.getenv("API_ENDPOINT", "")
+            v = getenv("API_ENDPOINT")
         if not v:
             raise ValueError(
                 "API endpoint is required. Set it via API_ENDPOINT environment variable or pass it to the client."
@@ -0,0 +1,41 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(content: bytes) -> Any:
+    """
+    Decode a JSON document with the fastest available backend.
+
+    Args:
+        content: Raw JSON bytes
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode_response(response) -> Any:
+    """
+    Decode the body of an HTTP response exactly once.
+
+    Args:
+        response: httpx.Response whose body has been read
+
+    Returns:
+        The decoded JSON body, or an empty dict when the body is empty
+    """
+    content = response.content
+    if not content:
+        return {}
+    return loads(content)
@@ -1,13 +1,68 @@
-from typing import Optional
+import asyncio
+from collections import deque
+from typing import AsyncIterator, List, Optional, Union
 
-from models.common import CtxMessageType
-from models.EventOffers import EventOffer, EventOfferList
-from models.AccessibilityInfo import AccessibilityInfo
-from models.CategoryRelatedFields import CategoryRelatedFields
-from models.LocationInfo import LocationInfo
-from models.PriceCategory import PriceCategory
-from models.ImageBody import ImageBody
-from endpoints.base import BaseEndpoint
+from ..models.common import CtxMessageType
+from ..models.EventOffers import EventOffer, EventOfferBody, EventOfferList
+from ..models.AccessibilityInfo import AccessibilityInfo
+from ..models.CategoryRelatedFields import CategoryRelatedFields
+from ..models.LocationInfo import LocationInfo
+from ..models.PriceCategory import PriceCategory
+from ..models.ImageBody import ImageBody
+from .base import BaseEndpoint
+from ..images import ImageFile
+from ..parsing import ResponseMode
+from ..serialization import encode_body
+
+
+def build_event_offer_body(
+    accessibility: AccessibilityInfo,
+    categoryRelatedField: CategoryRelatedFields,
+    hasTicket: bool,
+    location: LocationInfo,
+    name: str,
+    bookingAllowedDateTime: Optional[str] = None,
+    bookingContact: Optional[str] = None,
+    bookingEmail: Optional[str] = None,
+    description: Optional[str] = None,
+    enableDoubleBooking: Optional[bool] = True,
+    eventDuration: Optional[int] = None,
+    externalTicketOfficeUrl: Optional[str] = None,
+    idAtProvider: Optional[str] = None,
+    image: Union[ImageBody, ImageFile, None] = None,
+    itemCollectionDetails: Optional[str] = None,
+    priceCategories: Optional[list[PriceCategory]] = None,
+    publicationDate: Optional[str] = None,
+) -> EventOfferBody:
+    """
+    Build the body sent to create or update an event offer.
+
+    Takes the same arguments as `EventOffersEndpoint.create_event_offer`. The
+    arguments are trusted: the body is built with `model_construct`, and
+    nested models are used as they are, without being validated or copied.
+    None values are left out of the encoded body.
+    """
+    return EventOfferBody.model_construct(
+        **{
+            "accessibility": accessibility,
+            "categoryRelatedField": categoryRelatedField,
+            "hasTicket": hasTicket,
+            "location": location,
+            "name": name,
+            "bookingAllowedDateTime": bookingAllowedDateTime,
+            "bookingContact": bookingContact,
+            "bookingEmail": bookingEmail,
+            "description": description,
+            "enableDoubleBooking": enableDoubleBooking,
+            "eventDuration": eventDuration,
+            "externalTicketOfficeUrl": externalTicketOfficeUrl,
+            "idAtProvider": idAtProvider,
+            "image": image,
+            "itemCollectionDetails": itemCollectionDetails,
+            "priceCategories": priceCategories or None,
+            "publicationDate": publicationDate,
+        }
+    )
 
 
 class EventOffersEndpoint(BaseEndpoint):
@@ -17,6 +72,22 @@ class EventOffersEndpoint(BaseEndpoint):
 
     eventOffersBaseRoute = "offers/v1"
 
+    @staticmethod
+    def _fingerprint_key(idAtProvider: str) -> str:
+        return f"event_offer:{idAtProvider}"
+
+    def record_event_offer(self, body: EventOfferBody) -> None:
+        """
+        Record an event offer body as written, so that identical calls to
+        `update_event_offer` are skipped. Used by writers which don't go
+        through `create_event_offer` or `update_event_offer`.
+
+        Args:
+            body: Event offer body, as built by `build_event_offer_body`
+        """
+        if body.idAtProvider:
+            self._remember(self._fingerprint_key(body.idAtProvider), body)
+
     async def get_event_offers(
         self,
         venueId: int,
@@ -24,6 +95,7 @@ class EventOffersEndpoint(BaseEndpoint):
         firstIndex: Optional[int] = 1,
         idsAtProvider: Optional[str] = None,
         addressId: Optional[int] = None,
+        response_mode: Optional[ResponseMode] = None,
     ) -> EventOfferList:
         """
         List event offers with optional filtering.
@@ -33,6 +105,7 @@ class EventOffersEndpoint(BaseEndpoint):
             firstIndex: Index for pagination (default is 1)
             idsAtProvider: Optional IDs at provider to filter event offers
             addressId: Optional address ID to filter event offers
+            response_mode: Optional override of the client's ResponseMode
 
         Returns:
             EventOfferList object containing the event offers and pagination info
@@ -45,20 +118,140 @@ class EventOffersEndpoint(BaseEndpoint):
             "addressId": addressId,
         }
         data = await self._get(f"{self.eventOffersBaseRoute}/events", params=params)
-        return EventOfferList.model_validate(data)
+        return self._parse(EventOfferList, data, response_mode, operation="get_event_offers")
+
+    async def iter_event_offers(
+        self,
+        venueId: int,
+        limit: Optional[int] = 50,
+        idsAtProvider: Optional[str] = None,
+        addressId: Optional[int] = None,
+        concurrency: int = 4,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[EventOffer]:
+        """
+        Iterate over every event offer of a venue.
+
+        The first page is fetched to read the pagination info, then the
+        remaining `firstIndex` windows are fetched concurrently. Offers are
+        still yielded in page order.
+
+        Args:
+            venueId: ID of the venue to list event offers for
+            limit: Number of offers per page, None for the API's default page size
+            idsAtProvider: Optional IDs at provider to filter event offers
+            addressId: Optional address ID to filter event offers
+            concurrency: Maximum number of pages fetched at the same time
+            response_mode: Optional override of the client's ResponseMode
+
+        Yields:
+            EventOffer objects, in the order returned by the API
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        first_page = await self.get_event_offers(
+            venueId,
+            limit=limit,
+            firstIndex=1,
+            idsAtProvider=idsAtProvider,
+            addressId=addressId,
+            response_mode=response_mode,
+        )
+        if isinstance(first_page, dict):
+            offers = first_page["events"]
+            pages, page_size = first_page["pagination"]["pages"], first_page["pagination"]["limit"]
+        else:
+            offers = first_page.event_offers
+            pages, page_size = first_page.pagination.pages, first_page.pagination.limit
+        # Without an explicit limit, the windows follow the page size the API used.
+        if limit is None:
+            limit = page_size
+        for offer in offers:
+            yield offer
+
+        windows = iter(range(1 + limit, 1 + pages * limit, limit))
+        # Sliding window of in-flight pages: caps parallelism and keeps the
+        # number of buffered pages bounded while preserving order.
+        in_flight = deque()
+
+        def schedule() -> None:
+            for firstIndex in windows:
+                in_flight.append(
+                    asyncio.ensure_future(
+                        self.get_event_offers(
+                            venueId,
+                            limit=limit,
+                            firstIndex=firstIndex,
+                            idsAtProvider=idsAtProvider,
+                            addressId=addressId,
+                            response_mode=response_mode,
+                        )
+                    )
+                )
+                if len(in_flight) >= concurrency:
+                    return
+
+        try:
+            schedule()
+            while in_flight:
+                page = await in_flight.popleft()
+                schedule()
+                offers = page["events"] if isinstance(page, dict) else page.event_offers
+                for offer in offers:
+                    yield offer
+        finally:
+            for task in in_flight:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def get_all_event_offers(
+        self,
+        venueId: int,
+        limit: Optional[int] = 50,
+        idsAtProvider: Optional[str] = None,
+        addressId: Optional[int] = None,
+        concurrency: int = 4,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> List[EventOffer]:
+        """
+        Fetch every event offer of a venue as a single list.
+
+        Args:
+            Same as `iter_event_offers`.
+
+        Returns:
+            List of EventOffer objects, in the order returned by the API
+        """
+        return [
+            offer
+            async for offer in self.iter_event_offers(
+                venueId,
+                limit=limit,
+                idsAtProvider=idsAtProvider,
+                addressId=addressId,
+                concurrency=concurrency,
+                response_mode=response_mode,
+            )
+        ]
 
-    async def get_event_offer(self, event_offer_id: int) -> EventOffer:
+    async def get_event_offer(
+        self, event_offer_id: int, response_mode: Optional[ResponseMode] = None
+    ) -> EventOffer:
         """
         Get details of a specific event offer.
 
         Args:
             event_offer_id: ID of the event offer to retrieve
+            response_mode: Optional override of the client's ResponseMode
 
         Returns:
             EventOffer object with the details
         """
         data = await self._get(f"{self.eventOffersBaseRoute}/events/{event_offer_id}")
-        return EventOffer.model_validate(data)
+        return self._parse(EventOffer, data, response_mode, operation="get_event_offer")
 
     async def create_event_offer(
         self,
@@ -75,7 +268,7 @@ class EventOffersEndpoint(BaseEndpoint):
         eventDuration: Optional[int] = None,
         externalTicketOfficeUrl: Optional[str] = None,
         idAtProvider: Optional[str] = None,
-        image: ImageBody = None,
+        image: Union[ImageBody, ImageFile, None] = None,
         itemCollectionDetails: Optional[str] = None,
         priceCategories: Optional[list[PriceCategory]] = None,
         publicationDate: Optional[str] = None,
@@ -89,28 +282,32 @@ class EventOffersEndpoint(BaseEndpoint):
         Returns:
             Updated EventOffer object
         """
-        params = {
-            "accessibility": accessibility.model_dump(),
-            "categoryRelatedField": categoryRelatedField.model_dump(),
-            "hasTicket": hasTicket,
-            "location": location.model_dump(),
-            "name": name,
-            "bookingAllowedDateTime": bookingAllowedDateTime,
-            "bookingContact": bookingContact,
-            "bookingEmail": bookingEmail,
-            "description": description,
-            "enableDoubleBooking": enableDoubleBooking,
-            "eventDuration": eventDuration,
-            "externalTicketOfficeUrl": externalTicketOfficeUrl,
-            "idAtProvider": idAtProvider,
-            "image": image.model_dump() if image else None,
-            "itemCollectionDetails": itemCollectionDetails,
-            "priceCategories": (
-                [pc.model_dump() for pc in priceCategories] if priceCategories else None
-            ),
-            "publicationDate": publicationDate,
-        }
-        data = await self._post(f"{self.eventOffersBaseRoute}/events", json=params)
+        params = build_event_offer_body(
+            accessibility=accessibility,
+            categoryRelatedField=categoryRelatedField,
+            hasTicket=hasTicket,
+            location=location,
+            name=name,
+            bookingAllowedDateTime=bookingAllowedDateTime,
+            bookingContact=bookingContact,
+            bookingEmail=bookingEmail,
+            description=description,
+            enableDoubleBooking=enableDoubleBooking,
+            eventDuration=eventDuration,
+            externalTicketOfficeUrl=externalTicketOfficeUrl,
+            idAtProvider=idAtProvider,
+            image=image,
+            itemCollectionDetails=itemCollectionDetails,
+            priceCategories=priceCategories,
+            publicationDate=publicationDate,
+        )
+        data = await self._post(
+            f"{self.eventOffersBaseRoute}/events",
+            json_data=encode_body(params),
+            invalidates=[f"{self.eventOffersBaseRoute}/events"],
+        )
+        if idAtProvider:
+            self._remember(self._fingerprint_key(idAtProvider), params)
         return CtxMessageType.model_validate(data)
 
     async def update_event_offer(
@@ -128,40 +325,85 @@ class EventOffersEndpoint(BaseEndpoint):
         eventDuration: Optional[int] = None,
         externalTicketOfficeUrl: Optional[str] = None,
         idAtProvider: Optional[str] = None,
-        image: ImageBody = None,
+        image: Union[ImageBody, ImageFile, None] = None,
         itemCollectionDetails: Optional[str] = None,
         priceCategories: Optional[list[PriceCategory]] = None,
         publicationDate: Optional[str] = None,
-    ) -> CtxMessageType:
+        force: bool = False,
+    ) -> Optional[CtxMessageType]:
         """
         Update an existing event offer.
 
+        When the client has a fingerprint store, the update is skipped if the
+        offer (identified by `idAtProvider`) was last created or updated with
+        the same body.
+
+        Arguments left to None are not sent, so the offer keeps its current
+        values for them. To clear a field, send it as None with
+        `patch_event_offer`.
+
         Args:
-            booking_id: ID of the event offer to cancel
+            idAtProvider: Provider ID of the event offer to update
+            force: Send the update even if the body is unchanged
 
         Returns:
-            Updated EventOffer object
+            CtxMessageType object containing the result of the operation, or
+            None when the update was skipped
         """
-        params = {
-            "accessibility": accessibility.model_dump(),
-            "categoryRelatedField": categoryRelatedField.model_dump(),
-            "hasTicket": hasTicket,
-            "location": location.model_dump(),
-            "name": name,
-            "bookingAllowedDateTime": bookingAllowedDateTime,
-            "bookingContact": bookingContact,
-            "bookingEmail": bookingEmail,
-            "description": description,
-            "enableDoubleBooking": enableDoubleBooking,
-            "eventDuration": eventDuration,
-            "externalTicketOfficeUrl": externalTicketOfficeUrl,
-            "idAtProvider": idAtProvider,
-            "image": image.model_dump() if image else None,
-            "itemCollectionDetails": itemCollectionDetails,
-            "priceCategories": (
-                [pc.model_dump() for pc in priceCategories] if priceCategories else None
-            ),
-            "publicationDate": publicationDate,
-        }
-        data = await self._patch(f"{self.eventOffersBaseRoute}/events", json=params)
+        params = build_event_offer_body(
+            accessibility=accessibility,
+            categoryRelatedField=categoryRelatedField,
+            hasTicket=hasTicket,
+            location=location,
+            name=name,
+            bookingAllowedDateTime=bookingAllowedDateTime,
+            bookingContact=bookingContact,
+            bookingEmail=bookingEmail,
+            description=description,
+            enableDoubleBooking=enableDoubleBooking,
+            eventDuration=eventDuration,
+            externalTicketOfficeUrl=externalTicketOfficeUrl,
+            idAtProvider=idAtProvider,
+            image=image,
+            itemCollectionDetails=itemCollectionDetails,
+            priceCategories=priceCategories,
+            publicationDate=publicationDate,
+        )
+
+        async def write():
+            # The offer is addressed by its provider ID, so its own path isn't
+            # known here: drop every cached offer.
+            return await self._patch(
+                f"{self.eventOffersBaseRoute}/events",
+                json_data=encode_body(params),
+                invalidates=[f"{self.eventOffersBaseRoute}/events", f"{self.eventOffersBaseRoute}/events/"],
+            )
+
+        if not idAtProvider:
+            return CtxMessageType.model_validate(await write())
+        data = await self._write_if_changed(
+            self._fingerprint_key(idAtProvider), params, write, force=force, operation="update_event_offer"
+        )
+        return CtxMessageType.model_validate(data) if data is not None else None
+
+    async def patch_event_offer(self, event_offer_id: int, changes: dict) -> CtxMessageType:
+        """
+        Send a partial update of an event offer.
+
+        Args:
+            event_offer_id: ID of the event offer to update
+            changes: Subset of the event offer body (see `build_event_offer_body`)
+                holding only the fields to change
+
+        Returns:
+            CtxMessageType object containing the result of the operation
+        """
+        data = await self._patch(
+            f"{self.eventOffersBaseRoute}/events/{event_offer_id}",
+            json_data=changes,
+            invalidates=[
+                f"{self.eventOffersBaseRoute}/events",
+                f"{self.eventOffersBaseRoute}/events/{event_offer_id}",
+            ],
+        )
         return CtxMessageType.model_validate(data)
@@ -1,8 +1,18 @@
-from typing import Optional
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from models.common import CtxMessageType
-from models.PriceCategory import PriceCategory, PriceCategoriesList
-from endpoints.base import BaseEndpoint
+from ..exceptions import PassCultureAPIError
+from ..models.common import CtxMessageType
+from ..models.PriceCategory import (
+    PriceCategory,
+    PriceCategoriesList,
+    PricingAction,
+    PricingChange,
+    PricingResult,
+)
+from .base import BaseEndpoint
+from ..parsing import ResponseMode
 
 
 class PriceCategoriesEndpoint(BaseEndpoint):
@@ -12,27 +22,40 @@ class PriceCategoriesEndpoint(BaseEndpoint):
 
     priceCategoriesBaseRoute = "offers/v1/events"
 
+    def _event_paths(self, eventId: int) -> list:
+        """Paths whose cached responses change when an event's price categories change."""
+        return [
+            f"{self.priceCategoriesBaseRoute}/{eventId}",
+            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories",
+        ]
+
     async def get_price_categories(
         self,
         eventId: int,
         limit: Optional[int] = 50,
         firstIndex: Optional[int] = 1,
         idsAtProvider: Optional[str] = None,
+        response_mode: Optional[ResponseMode] = None,
     ) -> PriceCategoriesList:
         """
         List price categories for a specific event.
 
         Args:
             eventId: ID of the event to filter price categories
+            limit: Maximum number of price categories to return
+            firstIndex: Index for pagination
+            idsAtProvider: Comma-separated provider IDs to filter by
+            response_mode: Optional override of the client's ResponseMode
 
         Returns:
             PriceCategoriesList object containing the price categories and pagination info
         """
-
+        params = {"limit": limit, "firstIndex": firstIndex, "idsAtProvider": idsAtProvider}
         data = await self._get(
-            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories"
+            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories",
+            params={key: value for key, value in params.items() if value is not None},
         )
-        return PriceCategoriesList.model_validate(data)
+        return self._parse(PriceCategoriesList, data, response_mode, operation="get_price_categories")
 
     async def create_price_category(
         self, eventId: int, priceCategoriesList: PriceCategoriesList
@@ -48,32 +71,212 @@ class PriceCategoriesEndpoint(BaseEndpoint):
         """
         params = {
             "priceCategories": [
-                pc.model_dump() for pc in priceCategoriesList.price_categories
+                pc.model_dump(by_alias=True, exclude_none=True, exclude={"id"})
+                for pc in priceCategoriesList.priceCategories
             ]
         }
         data = await self._post(
-            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories", json=params
+            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories",
+            json_data=params,
+            invalidates=self._event_paths(eventId),
         )
 
         return CtxMessageType.model_validate(data)
 
     async def update_price_category(
-        self, eventId: int, priceCategoryId: int, priceCategory: PriceCategory
-    ) -> CtxMessageType:
+        self,
+        eventId: int,
+        priceCategoryId: int,
+        priceCategory: PriceCategory,
+        force: bool = False,
+    ) -> Optional[CtxMessageType]:
         """
         Update a specific price category for an event.
 
+        When the client has a fingerprint store, the update is skipped if the
+        price category was last updated with the same body.
+
         Args:
             eventId: ID of the event to update the price category for
             priceCategoryId: ID of the price category to update
             priceCategory: PriceCategory object with updated details
+            force: Send the update even if the body is unchanged
 
         Returns:
-            CtxMessageType object containing the result of the operation
+            CtxMessageType object containing the result of the operation, or
+            None when the update was skipped
         """
-        params = priceCategory.model_dump()
-        data = await self._put(
-            f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories/{priceCategoryId}",
-            json=params,
+        params = priceCategory.model_dump(by_alias=True, exclude_none=True, exclude={"id"})
+
+        async def write():
+            return await self._put(
+                f"{self.priceCategoriesBaseRoute}/{eventId}/price_categories/{priceCategoryId}",
+                json_data=params,
+                invalidates=self._event_paths(eventId),
+            )
+
+        data = await self._write_if_changed(
+            f"price_category:{eventId}:{priceCategoryId}",
+            params,
+            write,
+            force=force,
+            operation="update_price_category",
         )
-        return CtxMessageType.model_validate(data)
+        return CtxMessageType.model_validate(data) if data is not None else None
+
+    async def apply_pricing_plan(
+        self,
+        plan: Iterable[Union[PricingChange, dict]],
+        concurrency: int = 8,
+        match_existing: bool = True,
+        force: bool = False,
+    ) -> List[PricingResult]:
+        """
+        Apply a pricing plan: price category creations and updates across
+        many events, concurrently.
+
+        The price categories to create for an event are sent in a single
+        `create_price_category` call. With `match_existing`, those whose
+        `idAtProvider` already exists on the event are updated instead, so
+        that running the same plan twice doesn't duplicate them: this costs
+        one `get_price_categories` call per event with creations. Updates are
+        sent one by one, through `update_price_category`, and skipped when
+        unchanged if the client has a fingerprint store. When the plan
+        changes the same price category twice, the last change wins and the
+        earlier ones are reported as SUPERSEDED. The API doesn't return the
+        IDs of created price categories: they are read back by `idAtProvider`
+        with one more `get_price_categories` call per event with creations.
+
+        Args:
+            plan: Changes to apply, as PricingChange objects or dicts
+            concurrency: Maximum number of calls in flight
+            match_existing: Update the existing price categories of an event
+                that match a creation by `idAtProvider`
+            force: Send the updates even if their body is unchanged
+
+        Returns:
+            One PricingResult per change, in the order of the plan
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+        changes = [PricingChange.model_validate(change) if isinstance(change, dict) else change for change in plan]
+        results: List[Optional[PricingResult]] = [None] * len(changes)
+
+        # Per event, the positions of the creations, and of the updates by price category.
+        events: "OrderedDict[int, Tuple[List[int], Dict[int, List[int]]]]" = OrderedDict()
+        for position, change in enumerate(changes):
+            creations, updates = events.setdefault(change.eventId, ([], {}))
+            category_id = change.priceCategoryId or change.priceCategory.id
+            if category_id is None:
+                creations.append(position)
+            else:
+                updates.setdefault(category_id, []).append(position)
+
+        def settle(positions: List[int], **outcome) -> None:
+            # `positions` target the same price category: only the last one was sent.
+            last = max(positions)
+            for position in positions:
+                change = changes[position]
+                if position == last:
+                    results[position] = PricingResult(
+                        eventId=change.eventId, priceCategory=change.priceCategory, **outcome
+                    )
+                else:
+                    results[position] = PricingResult(
+                        eventId=change.eventId,
+                        priceCategory=change.priceCategory,
+                        action=PricingAction.SUPERSEDED,
+                        priceCategoryId=outcome.get("priceCategoryId"),
+                    )
+
+        async def update(eventId: int, category_id: int, positions: List[int]) -> None:
+            async with semaphore:
+                try:
+                    message = await self.update_price_category(
+                        eventId, category_id, changes[max(positions)].priceCategory, force=force
+                    )
+                except Exception as e:
+                    settle(positions, action=PricingAction.FAILED, priceCategoryId=category_id, error=e)
+                    return
+            action = PricingAction.UNCHANGED if message is None else PricingAction.UPDATED
+            settle(positions, action=action, priceCategoryId=category_id, message=message)
+
+        async def create(eventId: int, positions: List[int]) -> None:
+            # Creations of the same idAtProvider are merged, the last one winning.
+            groups: Dict[object, List[int]] = OrderedDict()
+            for position in sorted(positions):
+                key = changes[position].priceCategory.id_at_provider or position
+                groups.setdefault(key, []).append(position)
+            categories = [changes[group[-1]].priceCategory for group in groups.values()]
+            async with semaphore:
+                try:
+                    message = await self.create_price_category(
+                        eventId, PriceCategoriesList(priceCategories=categories)
+                    )
+                except Exception as e:
+                    for group in groups.values():
+                        settle(group, action=PricingAction.FAILED, error=e)
+                    return
+            created, error = await find(eventId, {category.id_at_provider for category in categories} - {None})
+            if error is None:
+                error = PassCultureAPIError("Created price category not found by its idAtProvider")
+            for category, group in zip(categories, groups.values()):
+                category_id = created.get(category.id_at_provider)
+                if category_id is not None:
+                    self._remember(
+                        f"price_category:{eventId}:{category_id}",
+                        category.model_dump(by_alias=True, exclude_none=True, exclude={"id"}),
+                    )
+                settle(
+                    group,
+                    action=PricingAction.CREATED,
+                    priceCategoryId=category_id,
+                    message=message,
+                    error=error if category.id_at_provider is not None and category_id is None else None,
+                )
+
+        async def find(eventId: int, idsAtProvider: set) -> Tuple[Dict[str, int], Optional[Exception]]:
+            """IDs of the price categories of an event by provider ID, and the error of the lookup."""
+            if not idsAtProvider:
+                return {}, None
+            async with semaphore:
+                try:
+                    data = await self.get_price_categories(
+                        eventId, idsAtProvider=",".join(sorted(idsAtProvider)), response_mode=ResponseMode.RAW
+                    )
+                except Exception as e:
+                    return {}, e
+            found = {
+                category.get("idAtProvider"): category["id"]
+                for category in data.get("data", [])
+                if category.get("idAtProvider") in idsAtProvider
+            }
+            return found, None
+
+        async def apply_event(eventId: int, creations: List[int], updates: Dict[int, List[int]]) -> None:
+            if creations and match_existing:
+                existing, error = await find(
+                    eventId, {changes[p].priceCategory.id_at_provider for p in creations} - {None}
+                )
+                if error is not None:
+                    for position in creations:
+                        settle([position], action=PricingAction.FAILED, error=error)
+                    creations = []
+                remaining = []
+                for position in creations:
+                    category_id = existing.get(changes[position].priceCategory.id_at_provider)
+                    if category_id is None:
+                        remaining.append(position)
+                    else:
+                        updates.setdefault(category_id, []).append(position)
+                creations = remaining
+            calls = [update(eventId, category_id, positions) for category_id, positions in updates.items()]
+            if creations:
+                calls.append(create(eventId, creations))
+            await asyncio.gather(*calls)
+
+        await asyncio.gather(
+            *(apply_event(eventId, creations, updates) for eventId, (creations, updates) in events.items())
+        )
+        return results
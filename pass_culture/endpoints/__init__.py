@@ -1,3 +1,12 @@
-from endpoints.bookings import (BookingsEndpoint)
+from .._lazy import lazy_exports
 
-__all__ = ["BookingsEndpoint"]
\ No newline at end of file
+_EXPORTS = {
+    "BaseEndpoint": "base",
+    "BookingsEndpoint": "bookings",
+    "EventOffersEndpoint": "EventOffers",
+    "PriceCategoriesEndpoint": "PriceCategories",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
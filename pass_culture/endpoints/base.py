@@ -1,4 +1,11 @@
-from typing import Any, Dict, Optional
+import copy
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+from ..fingerprints import fingerprint
+from ..parsing import ResponseMode, parse
 
 
 class BaseEndpoint:
@@ -8,6 +15,39 @@ class BaseEndpoint:
     
     def __init__(self, client):
         self.client = client
+
+    def _parse(
+        self,
+        model: Type[BaseModel],
+        data: Any,
+        response_mode: Optional[ResponseMode] = None,
+        *,
+        operation: str,
+    ) -> Any:
+        """
+        Turn a decoded response into a model, following the per-call response
+        mode or, by default, the client's. `operation` names the endpoint
+        method in the "validate" instrumentation event.
+
+        In RAW mode, the data is copied when the client has a response cache,
+        so that callers can't alter the cached responses.
+        """
+        response_mode = ResponseMode(response_mode or self.client.response_mode)
+        if response_mode is ResponseMode.RAW and self.client.cache is not None:
+            data = copy.deepcopy(data)
+        instrumentation = self.client.instrumentation
+        if not instrumentation:
+            return parse(model, data, response_mode)
+        started = time.perf_counter()
+        result = parse(model, data, response_mode)
+        instrumentation.emit(
+            "validate",
+            model=model.__name__,
+            operation=operation,
+            response_mode=response_mode.value,
+            duration=time.perf_counter() - started,
+        )
+        return result
         
     async def _get(
         self, path: str, params: Optional[Dict[str, Any]] = None
@@ -18,18 +58,87 @@ class BaseEndpoint:
         return await self.client.request("GET", path, params=params)
     
     async def _post(
-        self, path: str, json_data: Optional[Dict[str, Any]] = None
+        self,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        invalidates: Optional[Iterable[str]] = None,
     ) -> Dict[str, Any]:
         """
         Make a POST request to the API.
         """
-        return await self.client.request("POST", path, json_data=json_data)
+        return await self.client.request(
+            "POST", path, json_data=json_data, invalidates=invalidates
+        )
     
     async def _patch(
-        self, path: str, json_data: Optional[Dict[str, Any]] = None
+        self,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+        invalidates: Optional[Iterable[str]] = None,
     ) -> Dict[str, Any]:
         """
         Make a PATCH request to the API.
+
+        PATCH requests are only retried when flagged as idempotent.
         """
-        return await self.client.request("PATCH", path, json_data=json_data
-    )
\ No newline at end of file
+        return await self.client.request(
+            "PATCH",
+            path,
+            json_data=json_data,
+            idempotent=idempotent,
+            invalidates=invalidates,
+        )
+
+    async def _put(
+        self,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        invalidates: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make a PUT request to the API.
+        """
+        return await self.client.request(
+            "PUT", path, json_data=json_data, invalidates=invalidates
+        )
+
+    async def _write_if_changed(
+        self,
+        key: str,
+        body: Any,
+        write: Callable[[], Awaitable[Any]],
+        force: bool = False,
+        *,
+        operation: str,
+    ) -> Any:
+        """
+        Run `write` unless `body` is the last body successfully written to the
+        resource `key`, according to the client's fingerprint store.
+        `operation` names the endpoint method in the "skip" instrumentation event.
+
+        Returns the result of `write`, or None when the write was skipped.
+        """
+        store = self.client.fingerprint_store
+        if store is None:
+            return await write()
+        key = self._fingerprint_scoped(key)
+        digest = fingerprint(body)
+        if not force and store.get(key) == digest:
+            self.client.skipped_updates += 1
+            if self.client.instrumentation:
+                self.client.instrumentation.emit("skip", operation=operation)
+            return None
+        result = await write()
+        store.set(key, digest)
+        return result
+
+    def _remember(self, key: str, body: Any) -> None:
+        """Record `body` as the current content of the resource `key`."""
+        store = self.client.fingerprint_store
+        if store is not None:
+            store.set(self._fingerprint_scoped(key), fingerprint(body))
+
+    def _fingerprint_scoped(self, key: str) -> str:
+        """Prefix a fingerprint key with the client's scope."""
+        return f"{self.client.fingerprint_scope}:{key}"
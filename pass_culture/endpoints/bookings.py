@@ -1,8 +1,12 @@
-from typing import Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Optional
 
-from models.common import CtxMessageType
-from models.bookings import Booking, BookingList,BookingStatus
-from endpoints.base import BaseEndpoint
+from ..models.common import CtxMessageType
+from ..models.bookings import Booking, BookingList, BookingStatus, BookingValidationResult
+from .base import BaseEndpoint
+from ..parsing import ResponseMode
 
 
 
@@ -12,7 +16,28 @@ class BookingsEndpoint(BaseEndpoint):
     """
     
     bookingsBaseRoute = "bookings/v1"
+
+    def __init__(self, client):
+        super().__init__(client)
+        # token -> (expiry, pending or finished validation), oldest first
+        self._recent_validations: "OrderedDict[str, tuple]" = OrderedDict()
     
+    def _booking_paths(self, booking_id) -> list:
+        """Paths whose cached responses change when a booking changes state."""
+        return [f"bookings/v1/token/{booking_id}", "bookings/v1/bookings"]
+
+    def _status_changed(self, token: str, status: BookingStatus) -> None:
+        """
+        Report a successful change of a booking's status to the hooks.
+
+        A booking which is no longer used must not be reported as validated
+        by `validate_bookings`: its recent validation is forgotten.
+        """
+        if status is not BookingStatus.USED:
+            self._recent_validations.pop(token, None)
+        if self.client.instrumentation:
+            self.client.instrumentation.emit("booking_status", token=token, status=status)
+
     async def list_bookings(
         self, 
         offerId : int,
@@ -20,7 +45,8 @@ class BookingsEndpoint(BaseEndpoint):
         priceCategoryId: Optional[int] = None,
         stockId: Optional[int] = None,
         status : Optional[BookingStatus] = None,
-        beginningDatetime : Optional[str] = None
+        beginningDatetime : Optional[str] = None,
+        response_mode: Optional[ResponseMode] = None,
     ) -> BookingList:
         """
         List bookings with optional filtering.
@@ -32,6 +58,7 @@ class BookingsEndpoint(BaseEndpoint):
             stockId: Optional stock ID to filter bookings
             status: Optional booking status to filter by (BookingStatus enum)
             beginningDatetime: Optional datetime to filter bookings that start after this date. The expected format is ISO 8601 (standard format for timezone aware datetime). 
+            response_mode: Optional override of the client's ResponseMode
             
         Returns:
             BookingList object containing the bookings and pagination info
@@ -47,22 +74,113 @@ class BookingsEndpoint(BaseEndpoint):
             params["beginningDatetime"] = beginningDatetime
             
         data = await self._get("bookings/v1/bookings", params=params)
-        return BookingList.model_validate(data)
-    
-    async def get_booking(self, booking_id: int) -> Booking:
+        return self._parse(BookingList, data, response_mode, operation="list_bookings")
+
+    async def iter_booking_pages(
+        self,
+        offerId : int,
+        firstIndex : Optional[int] = 1,
+        priceCategoryId: Optional[int] = None,
+        stockId: Optional[int] = None,
+        status : Optional[BookingStatus] = None,
+        beginningDatetime : Optional[str] = None,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[BookingList]:
+        """
+        Iterate over the pages of `list_bookings`, following `firstIndex`.
+
+        The next page is requested while the current one is being consumed,
+        so at most two pages are held in memory at any time. Iteration stops
+        at the first empty page.
+
+        Args:
+            Same filters as `list_bookings`.
+
+        Yields:
+            BookingList objects, one per page
+        """
+        filters = {
+            "priceCategoryId": priceCategoryId,
+            "stockId": stockId,
+            "status": status,
+            "beginningDatetime": beginningDatetime,
+            "response_mode": response_mode,
+        }
+        pending = asyncio.ensure_future(
+            self.list_bookings(offerId, firstIndex=firstIndex, **filters)
+        )
+        try:
+            while True:
+                page = await pending
+                bookings = page["data"] if isinstance(page, dict) else page.bookings
+                if not bookings:
+                    return
+                firstIndex += len(bookings)
+                pending = asyncio.ensure_future(
+                    self.list_bookings(offerId, firstIndex=firstIndex, **filters)
+                )
+                yield page
+        finally:
+            # Don't leave the prefetch running (or its error unretrieved)
+            # when the caller stops iterating early.
+            if not pending.done():
+                pending.cancel()
+            elif not pending.cancelled():
+                pending.exception()
+
+    async def iter_bookings(
+        self,
+        offerId : int,
+        firstIndex : Optional[int] = 1,
+        priceCategoryId: Optional[int] = None,
+        stockId: Optional[int] = None,
+        status : Optional[BookingStatus] = None,
+        beginningDatetime : Optional[str] = None,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[Booking]:
+        """
+        Iterate over every booking of an offer, page after page.
+
+        Args:
+            Same filters as `list_bookings`.
+
+        Yields:
+            Booking objects, in the order returned by the API
+        """
+        pages = self.iter_booking_pages(
+            offerId,
+            firstIndex=firstIndex,
+            priceCategoryId=priceCategoryId,
+            stockId=stockId,
+            status=status,
+            beginningDatetime=beginningDatetime,
+            response_mode=response_mode,
+        )
+        try:
+            async for page in pages:
+                bookings = page["data"] if isinstance(page, dict) else page.bookings
+                for booking in bookings:
+                    yield booking
+        finally:
+            await pages.aclose()
+
+    async def get_booking(
+        self, booking_id: int, response_mode: Optional[ResponseMode] = None
+    ) -> Booking:
         """
         Get details of a specific booking.
         
         Args:
             booking_id: ID of the booking to retrieve
+            response_mode: Optional override of the client's ResponseMode
             
         Returns:
             Booking object with the details
         """
         data = await self._get(f"bookings/v1/token/{booking_id}")
-        return Booking.model_validate(data)
+        return self._parse(Booking, data, response_mode, operation="get_booking")
     
-    async def delete_booking(self, booking_id: int) -> CtxMessageType:
+    async def delete_booking(self, booking_id: int) -> Optional[CtxMessageType]:
         """
         Cancel an existing booking.
         
@@ -72,10 +190,15 @@ class BookingsEndpoint(BaseEndpoint):
         Returns:
             Updated Booking object
         """
-        data = await self._patch(f"bookings/v1/cancel/token/{booking_id}")
-        return CtxMessageType.model_validate(data)
+        data = await self._patch(
+            f"bookings/v1/cancel/token/{booking_id}",
+            idempotent=True,
+            invalidates=self._booking_paths(booking_id),
+        )
+        self._status_changed(booking_id, BookingStatus.CANCELLED)
+        return CtxMessageType.model_validate(data) if data else None
     
-    async def validate_booking(self, booking_id: str) -> CtxMessageType:
+    async def validate_booking(self, booking_id: str) -> Optional[CtxMessageType]:
         """
         Validate a booking (e.g., when the user attends the event).
         
@@ -88,10 +211,13 @@ class BookingsEndpoint(BaseEndpoint):
         """
         data = await self._patch(
             f"bookings/v1/use/token/{booking_id}",
+            idempotent=True,
+            invalidates=self._booking_paths(booking_id),
         )
-        return CtxMessageType.model_validate(data)
+        self._status_changed(booking_id, BookingStatus.USED)
+        return CtxMessageType.model_validate(data) if data else None
     
-    async def revert_validation(self, booking_id: int) -> CtxMessageType:
+    async def revert_validation(self, booking_id: int) -> Optional[CtxMessageType]:
         """
         Revert the validation of a booking.
         
@@ -101,5 +227,83 @@ class BookingsEndpoint(BaseEndpoint):
         Returns:
             Updated Booking object
         """
-        data = await self._patch(f"bookings/v1/keep/token/{booking_id}")
-        return CtxMessageType.model_validate(data)
\ No newline at end of file
+        data = await self._patch(
+            f"bookings/v1/keep/token/{booking_id}",
+            idempotent=True,
+            invalidates=self._booking_paths(booking_id),
+        )
+        self._status_changed(booking_id, BookingStatus.CONFIRMED)
+        return CtxMessageType.model_validate(data) if data else None
+
+    async def validate_bookings(
+        self,
+        tokens: Iterable[str],
+        concurrency: int = 10,
+        dedup_window: float = 60.0,
+    ) -> Dict[str, BookingValidationResult]:
+        """
+        Validate many booking tokens concurrently (e.g., at a venue check-in gate).
+
+        Repeated scans of a token are sent only once: within the batch, and
+        across calls while a previous validation is in flight or succeeded
+        less than `dedup_window` seconds ago. Failures are reported per token,
+        with the API's status code and error details, and never abort the batch.
+
+        Args:
+            tokens: Booking tokens to validate
+            concurrency: Maximum number of validations in flight
+            dedup_window: Time in seconds, from its success, during which a
+                validation is reused for repeated scans of the same token
+
+        Returns:
+            Mapping of each distinct token to its BookingValidationResult
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+        recent = self._recent_validations
+
+        # Entries are ordered by the time their validation succeeded, so the
+        # oldest ones are dropped first. With different dedup windows an
+        # expired entry may remain behind a live one: lookups check expiry.
+        now = time.monotonic()
+        while recent and next(iter(recent.values()))[0] <= now:
+            recent.popitem(last=False)
+
+        async def validate(token: str) -> BookingValidationResult:
+            async with semaphore:
+                try:
+                    message = await self.validate_booking(token)
+                except Exception as e:
+                    recent.pop(token, None)
+                    return BookingValidationResult(
+                        token=token,
+                        error=e,
+                        status_code=getattr(e, "status_code", None),
+                        errors=getattr(e, "errors", None),
+                    )
+                recent[token] = (time.monotonic() + dedup_window, asyncio.current_task())
+                recent.move_to_end(token)
+                return BookingValidationResult(token=token, message=message)
+
+        pending = {}
+        for token in tokens:
+            if token in pending:
+                continue
+            entry = recent.get(token)
+            if entry is not None and entry[0] > now:
+                pending[token] = (entry[1], True)
+                continue
+            task = asyncio.ensure_future(validate(token))
+            # Pending validations don't expire until they succeed.
+            recent[token] = (float("inf"), task)
+            recent.move_to_end(token)
+            pending[token] = (task, False)
+
+        results = {}
+        for token, (task, deduplicated) in pending.items():
+            result = await asyncio.shield(task)
+            if deduplicated:
+                result = result.model_copy(update={"deduplicated": True})
+            results[token] = result
+        return results
@@ -1,6 +1,18 @@
+from typing import Any, Optional
+
+
 class PassCultureAPIError(Exception):
-    """Base exception for all Pass Culture API errors."""
-    pass
+    """
+    Base exception for all Pass Culture API errors.
+
+    `status_code` is the HTTP status of the response, if any, and `errors`
+    the decoded error body returned by the API, if it was JSON.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, errors: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.errors = errors
 
 
 class AuthenticationError(PassCultureAPIError):
@@ -10,9 +22,21 @@ class AuthenticationError(PassCultureAPIError):
 
 class RateLimitError(PassCultureAPIError):
     """Raised when the API rate limit is exceeded."""
-    pass
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
 
 
 class ResourceNotFoundError(PassCultureAPIError):
     """Raised when a requested resource is not found."""
-    pass
\ No newline at end of file
+    pass
+
+
+class CircuitOpenError(PassCultureAPIError):
+    """Raised when a request is rejected because the circuit of its route is open."""
+
+    def __init__(self, message: str, route: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.route = route
+        self.retry_after = retry_after
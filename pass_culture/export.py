@@ -0,0 +1,247 @@
+import csv
+import os
+from typing import IO, TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from .models.bookings import BookingStatus
+from .parsing import ResponseMode
+
+if TYPE_CHECKING:
+    from .client import PassCultureClient
+
+# (response key, column name, column type), in the order of the Booking model.
+BOOKING_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("confirmationDate", "confirmation_date", "string"),
+    ("creationDate", "creation_date", "string"),
+    ("id", "id", "int64"),
+    ("offerEan", "offer_ean", "string"),
+    ("offerId", "offer_id", "int64"),
+    ("offerName", "offer_name", "string"),
+    ("price", "price", "float64"),
+    ("priceCategoryId", "price_category_id", "int64"),
+    ("priceCategoryLabel", "price_category_label", "string"),
+    ("quantity", "quantity", "int64"),
+    ("status", "status", "status"),
+    ("stockId", "stock_id", "int64"),
+    ("userBirthDate", "user_birth_date", "string"),
+    ("userEmail", "user_email", "string"),
+    ("userFirstName", "user_first_name", "string"),
+    ("userLastName", "user_last_name", "string"),
+    ("userPhoneNumber", "user_phone_number", "string"),
+    ("userPostalCode", "user_postal_code", "string"),
+    ("venueAddress", "venue_address", "string"),
+    ("venueDepartementCode", "venue_departement_code", "string"),
+    ("venueId", "venue_id", "int64"),
+    ("venueName", "venue_name", "string"),
+)
+
+# Dictionary of the status column, the same for every batch.
+STATUS_VALUES: Tuple[str, ...] = tuple(status.value for status in BookingStatus)
+_STATUS_INDEX = {value: index for index, value in enumerate(STATUS_VALUES)}
+
+ColumnBatch = Dict[str, List[Any]]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow and Parquet export requires the 'pyarrow' package. "
+            "Install it with `pip install pyarrow`."
+        )
+    return pyarrow
+
+
+def booking_schema():
+    """
+    Return the Arrow schema of exported bookings.
+
+    IDs and quantities are 64-bit integers, prices 64-bit floats and the
+    status is dictionary-encoded with `STATUS_VALUES` as its dictionary.
+    """
+    pa = _import_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "status": pa.dictionary(pa.int8(), pa.string()),
+    }
+    return pa.schema([pa.field(name, types[kind]) for _, name, kind in BOOKING_COLUMNS])
+
+
+def to_record_batch(columns: ColumnBatch):
+    """
+    Convert a batch of columns from `BookingExporter.iter_columns` to an
+    Arrow record batch.
+    """
+    pa = _import_pyarrow()
+    schema = booking_schema()
+    arrays = []
+    for _, name, kind in BOOKING_COLUMNS:
+        values = columns[name]
+        if kind == "status":
+            indices = pa.array([_status_index(value) for value in values], pa.int8())
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(STATUS_VALUES, pa.string())))
+        else:
+            arrays.append(pa.array(values, schema.field(name).type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _status_index(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return _STATUS_INDEX[value]
+    except KeyError:
+        raise ValueError(f"Unknown booking status: {value!r}")
+
+
+class BookingExporter:
+    """
+    Export the bookings of many offers as columns, without building a
+    `Booking` object per row.
+
+    Pages are fetched in RAW response mode and their values are appended
+    straight to per-column lists, which are handed out every `batch_size`
+    rows, as lists (`iter_columns`), Arrow record batches
+    (`iter_record_batches`) or written to Parquet or CSV files. Memory is
+    bounded by the batch size plus the pages being fetched, whatever the
+    number of bookings.
+
+    Arrow and Parquet output require the `pyarrow` package, CSV doesn't.
+    """
+
+    def __init__(self, client: "PassCultureClient", batch_size: int = 50_000):
+        """
+        Initialize the exporter.
+
+        Args:
+            client: Client to fetch the bookings with
+            batch_size: Number of rows per batch
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.client = client
+        self.batch_size = batch_size
+        self.rows = 0
+
+    @staticmethod
+    def _empty_batch() -> ColumnBatch:
+        return {name: [] for _, name, _ in BOOKING_COLUMNS}
+
+    async def iter_columns(self, offerIds: Iterable[int], **filters) -> AsyncIterator[ColumnBatch]:
+        """
+        Iterate over the bookings of offers, `batch_size` rows at a time.
+
+        Args:
+            offerIds: IDs of the offers whose bookings to export
+            **filters: Other `list_bookings` filters (status, stockId...)
+
+        Yields:
+            Dicts of column name to list of values, every list holding the
+            same number of rows (`batch_size`, except for the last batch)
+        """
+        batch = self._empty_batch()
+        size = 0
+        for offerId in offerIds:
+            pages = self.client.bookings.iter_booking_pages(
+                offerId, response_mode=ResponseMode.RAW, **filters
+            )
+            try:
+                async for page in pages:
+                    rows = page["data"]
+                    while rows:
+                        chunk = rows[: self.batch_size - size]
+                        rows = rows[len(chunk) :]
+                        for key, name, _ in BOOKING_COLUMNS:
+                            batch[name].extend([row.get(key) for row in chunk])
+                        size += len(chunk)
+                        if size == self.batch_size:
+                            self.rows += size
+                            yield batch
+                            batch, size = self._empty_batch(), 0
+            finally:
+                await pages.aclose()
+        if size:
+            self.rows += size
+            yield batch
+
+    async def iter_record_batches(self, offerIds: Iterable[int], **filters):
+        """
+        Iterate over the bookings of offers as Arrow record batches.
+
+        Args:
+            Same as `iter_columns`.
+
+        Yields:
+            pyarrow.RecordBatch objects with the `booking_schema()` schema
+        """
+        async for columns in self.iter_columns(offerIds, **filters):
+            yield to_record_batch(columns)
+
+    async def to_table(self, offerIds: Iterable[int], **filters):
+        """
+        Return every booking of offers as one Arrow table, ready for
+        `to_pandas()`. Unlike the writers, this holds every row in memory.
+        """
+        pa = _import_pyarrow()
+        batches = [batch async for batch in self.iter_record_batches(offerIds, **filters)]
+        return pa.Table.from_batches(batches, schema=booking_schema())
+
+    async def write_parquet(
+        self,
+        path: Union[str, os.PathLike],
+        offerIds: Iterable[int],
+        compression: str = "zstd",
+        **filters,
+    ) -> int:
+        """
+        Write the bookings of offers to a Parquet file, one row group per batch.
+
+        Args:
+            path: Path of the file
+            offerIds: IDs of the offers whose bookings to export
+            compression: Parquet compression codec
+            **filters: Other `list_bookings` filters
+
+        Returns:
+            Number of rows written
+        """
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        rows = 0
+        with pq.ParquetWriter(path, booking_schema(), compression=compression) as writer:
+            async for batch in self.iter_record_batches(offerIds, **filters):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    async def write_csv(
+        self,
+        destination: Union[str, os.PathLike, IO[str]],
+        offerIds: Iterable[int],
+        **filters,
+    ) -> int:
+        """
+        Write the bookings of offers to a CSV file with a header row.
+
+        Args:
+            destination: Path of the file, or a text file opened with `newline=""`
+            offerIds: IDs of the offers whose bookings to export
+            **filters: Other `list_bookings` filters
+
+        Returns:
+            Number of rows written
+        """
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "w", newline="", encoding="utf-8") as f:
+                return await self.write_csv(f, offerIds, **filters)
+        writer = csv.writer(destination)
+        names = [name for _, name, _ in BOOKING_COLUMNS]
+        writer.writerow(names)
+        rows = 0
+        async for columns in self.iter_columns(offerIds, **filters):
+            writer.writerows(zip(*(columns[name] for name in names)))
+            rows += len(columns["id"])
+        return rows
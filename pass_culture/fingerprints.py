@@ -0,0 +1,139 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from .images import ImageFile
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint(body: Any) -> str:
+    """
+    Return a stable content hash of a request or response body.
+
+    The body is serialized as canonical JSON (sorted keys, compact
+    separators), so that two equal bodies always get the same fingerprint.
+    The base64 content of an image (`image.file`) is hashed on its own and
+    only its digest enters the body's hash, which keeps the canonical
+    serialization small for offers carrying large images. Streamed images
+    (`ImageFile`) are hashed as they are sent, chunk by chunk. Models are
+    hashed as they are encoded: by alias, without None values.
+    """
+    if isinstance(body, BaseModel):
+        body = body.model_dump(by_alias=True, exclude_none=True)
+    if isinstance(body, dict):
+        image = body.get("image")
+        if isinstance(image, ImageFile):
+            image = {"file": image} if image.credit is None else {"credit": image.credit, "file": image}
+        if isinstance(image, dict) and image.get("file"):
+            file = image["file"]
+            file = file.digest() if isinstance(file, ImageFile) else _digest(file.encode())
+            body = {**body, "image": {**image, "file": file}}
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return _digest(canonical.encode())
+
+
+def scope_of(api_key: Optional[str]) -> str:
+    """Return the default fingerprint scope of an API key: a digest, never the key itself."""
+    return hashlib.blake2b((api_key or "").encode(), digest_size=8).hexdigest()
+
+
+class FingerprintStore(ABC):
+    """
+    Store of the fingerprint of the last body successfully written per resource.
+
+    Subclass it to keep fingerprints elsewhere (Redis, a database shared by
+    several workers...): only `get`, `set` and `delete` are required. Keys
+    are prefixed with the client's `fingerprint_scope`, so that clients of
+    different accounts can share a store.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the fingerprint stored for a resource, if any."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Record the fingerprint of the body written to a resource."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Forget a resource, so that its next update is always sent."""
+
+
+class MemoryFingerprintStore(FingerprintStore):
+    """
+    In-process fingerprint store, lost when the process exits.
+    """
+
+    def __init__(self):
+        self._fingerprints: Dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._fingerprints.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._fingerprints[key] = value
+
+    def delete(self, key: str) -> None:
+        self._fingerprints.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+class SQLiteFingerprintStore(FingerprintStore):
+    """
+    Fingerprint store persisted in a local SQLite database, so that periodic
+    re-syncs running in separate processes skip what a previous run wrote.
+    """
+
+    def __init__(self, path: str = "fingerprints.sqlite3"):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: Path of the SQLite database, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL
+            );
+            """
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT fingerprint FROM fingerprints WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO fingerprints (key, fingerprint) VALUES (?, ?)", (key, value))
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM fingerprints WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,265 @@
+import base64
+import hashlib
+import json
+import os
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, Union
+
+ImageSource = Union[str, os.PathLike, bytes, bytearray, memoryview]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+MIN_SIZE = (400, 600)
+MAX_SIZE = (800, 1200)
+ASPECT_RATIO = 2 / 3
+# Relative tolerance on the aspect ratio, for sizes like 667x1000.
+ASPECT_RATIO_TOLERANCE = 0.01
+
+# JPEG start-of-frame markers, the ones holding the image size.
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# JPEG markers without a length field.
+_JPEG_STANDALONE = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+
+
+class InvalidImageError(ValueError):
+    """Raised when an image doesn't meet the API requirements."""
+    pass
+
+
+def _png_size(read_at: Callable[[int, int], bytes]) -> Tuple[int, int]:
+    header = read_at(0, 24)
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        raise InvalidImageError("Truncated PNG header")
+    return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+
+
+def _jpeg_size(read_at: Callable[[int, int], bytes]) -> Tuple[int, int]:
+    offset = 2
+    while True:
+        marker = read_at(offset, 2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise InvalidImageError("No JPEG frame header found")
+        if marker[1] == 0xFF:  # fill byte
+            offset += 1
+            continue
+        offset += 2
+        if marker[1] in _JPEG_STANDALONE:
+            continue
+        if marker[1] == 0xD9:
+            raise InvalidImageError("No JPEG frame header found")
+        segment = read_at(offset, 7)
+        if len(segment) < 2:
+            raise InvalidImageError("Truncated JPEG segment")
+        if marker[1] in _JPEG_SOF:
+            if len(segment) < 7:
+                raise InvalidImageError("Truncated JPEG frame header")
+            height = int.from_bytes(segment[3:5], "big")
+            width = int.from_bytes(segment[5:7], "big")
+            return width, height
+        offset += int.from_bytes(segment[:2], "big")
+
+
+def read_image_size(read_at: Callable[[int, int], bytes]) -> Tuple[str, int, int]:
+    """
+    Return the format, width and height of a PNG or JPEG image.
+
+    Only the headers are read: the PNG IHDR chunk, or the JPEG segments up to
+    the first frame header.
+
+    Args:
+        read_at: Function returning `size` bytes of the image from `offset`
+
+    Returns:
+        ("PNG" or "JPEG", width, height)
+    """
+    signature = read_at(0, 8)
+    if signature == PNG_SIGNATURE:
+        return ("PNG",) + _png_size(read_at)
+    if signature[:3] == b"\xff\xd8\xff":
+        return ("JPEG",) + _jpeg_size(read_at)
+    raise InvalidImageError("Image format must be PNG or JPEG")
+
+
+def check_image_size(width: int, height: int) -> None:
+    """
+    Check an image size against the API requirements: between 400x600 and
+    800x1200 pixels, with a 2:3 (portrait) aspect ratio.
+    """
+    if not (MIN_SIZE[0] <= width <= MAX_SIZE[0] and MIN_SIZE[1] <= height <= MAX_SIZE[1]):
+        raise InvalidImageError(
+            f"Image size must be between {MIN_SIZE[0]}x{MIN_SIZE[1]} and "
+            f"{MAX_SIZE[0]}x{MAX_SIZE[1]} pixels, got {width}x{height}"
+        )
+    if abs(width / height - ASPECT_RATIO) > ASPECT_RATIO * ASPECT_RATIO_TOLERANCE:
+        raise InvalidImageError(f"Image aspect ratio must be 2:3, got {width}x{height}")
+
+
+class ImageFile:
+    """
+    Image to upload with an event offer, read from a file or a buffer.
+
+    Unlike `ImageBody`, the image is never held as a base64 string: its size
+    is checked from the headers and its base64 encoding is streamed into the
+    request body chunk by chunk, when the request is sent. Pass it as the
+    `image` argument of `create_event_offer` or `update_event_offer`.
+    """
+
+    def __init__(
+        self,
+        source: ImageSource,
+        credit: Optional[str] = None,
+        chunk_size: int = 3 * 2**16,
+        check: bool = True,
+    ):
+        """
+        Initialize the image and read its size.
+
+        Args:
+            source: Path of the image, or its content as bytes or memoryview
+                (buffers are not copied)
+            credit: Credit for the image
+            chunk_size: Number of raw bytes encoded at a time, rounded to a
+                multiple of 3
+            check: Check the format, size and aspect ratio of the image
+
+        Raises:
+            InvalidImageError: The image is not a PNG or JPEG of a valid size
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.path = None
+            self._buffer = memoryview(source).cast("B")
+            self.size = len(self._buffer)
+        else:
+            self.path = os.fspath(source)
+            self._buffer = None
+            self.size = os.stat(self.path).st_size
+        self.credit = credit
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._digest: Optional[str] = None
+        if self._buffer is not None:
+            self.format, self.width, self.height = read_image_size(self._read_buffer)
+        else:
+            with open(self.path, "rb") as f:
+                self.format, self.width, self.height = read_image_size(self._file_reader(f))
+        if check:
+            check_image_size(self.width, self.height)
+
+    def _read_buffer(self, offset: int, size: int) -> bytes:
+        return bytes(self._buffer[offset : offset + size])
+
+    @staticmethod
+    def _file_reader(f) -> Callable[[int, int], bytes]:
+        def read_at(offset: int, size: int) -> bytes:
+            f.seek(offset)
+            return f.read(size)
+        return read_at
+
+    @property
+    def base64_size(self) -> int:
+        """Length of the base64 encoding of the image."""
+        return 4 * -(-self.size // 3)
+
+    def iter_chunks(self) -> Iterator[memoryview]:
+        """Iterate over the raw content of the image, `chunk_size` bytes at a time."""
+        if self._buffer is not None:
+            for offset in range(0, self.size, self.chunk_size):
+                yield self._buffer[offset : offset + self.chunk_size]
+            return
+        with open(self.path, "rb") as f:
+            buffer = bytearray(self.chunk_size)
+            view = memoryview(buffer)
+            while True:
+                # readinto only comes up short at the end of a regular file,
+                # which keeps every other chunk a multiple of 3 bytes long.
+                filled = f.readinto(buffer)
+                if not filled:
+                    return
+                yield view[:filled]
+
+    def iter_base64(self) -> Iterator[bytes]:
+        """Iterate over the base64 encoding of the image."""
+        for chunk in self.iter_chunks():
+            yield base64.b64encode(chunk)
+
+    def digest(self) -> str:
+        """
+        Return a hash of the base64 encoding of the image, computed once.
+
+        It matches the hash of the same image given as an `ImageBody`.
+        """
+        if self._digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            for chunk in self.iter_base64():
+                hasher.update(chunk)
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def to_image_body(self):
+        """Return an `ImageBody` holding the whole image as a base64 string."""
+        from .models.ImageBody import ImageBody
+
+        return ImageBody(credit=self.credit, file=b"".join(self.iter_base64()).decode())
+
+    def __repr__(self) -> str:
+        source = self.path if self.path is not None else f"<{self.size} bytes>"
+        return f"ImageFile({source!r}, {self.format} {self.width}x{self.height})"
+
+
+def image_placeholder(index: int) -> str:
+    """Placeholder standing for the `index`-th image of a body while it is encoded."""
+    return f"\x00image:{index}\x00"
+
+
+def _find_images(value: Any, images: List[ImageFile]) -> Any:
+    """Replace the ImageFile objects of a body with placeholders, collecting them."""
+    if isinstance(value, ImageFile):
+        images.append(value)
+        return image_placeholder(len(images) - 1)
+    if isinstance(value, dict):
+        return {key: _find_images(item, images) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_find_images(item, images) for item in value]
+    return value
+
+
+class StreamingJSONBody:
+    """
+    JSON request body whose `ImageFile` values are streamed as base64 strings.
+
+    The JSON around the images is encoded once and the images are encoded
+    chunk by chunk while the body is sent, so that a request never holds a
+    full copy of an image. The total length is known in advance and sent as
+    `Content-Length`. The body can be iterated several times, for retries.
+    """
+
+    def __init__(self, encoded: bytes, images: List[ImageFile]):
+        """
+        Args:
+            encoded: JSON body in which the images are replaced by their
+                `image_placeholder`
+            images: The images, in placeholder order
+        """
+        parts: List[Union[bytes, ImageFile]] = []
+        for index, image in enumerate(images):
+            before, encoded = encoded.split(json.dumps(image_placeholder(index)).encode(), 1)
+            parts += [before + b'"', image, b'"']
+        parts.append(encoded)
+        self._parts = parts
+        self.content_length = sum(
+            part.base64_size if isinstance(part, ImageFile) else len(part) for part in parts
+        )
+
+    @classmethod
+    def wrap(cls, body: Any) -> Optional["StreamingJSONBody"]:
+        """Return a streaming body for a JSON-like `body`, or None if it holds no ImageFile."""
+        images: List[ImageFile] = []
+        template = _find_images(body, images)
+        if not images:
+            return None
+        return cls(json.dumps(template, default=str).encode(), images)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, ImageFile):
+                for chunk in part.iter_base64():
+                    yield chunk
+            else:
+                yield part
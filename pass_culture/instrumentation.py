@@ -0,0 +1,296 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[str, Dict[str, Any]], None]
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_TOKEN_SEGMENT = re.compile(r"/token/[^/]+")
+
+
+def route_of(path: str) -> str:
+    """
+    Return the route template of a path, suitable as a low-cardinality label.
+
+    Numeric segments become `{id}` and booking tokens become `{token}`.
+    """
+    return _ID_SEGMENT.sub("/{id}", _TOKEN_SEGMENT.sub("/token/{token}", path))
+
+
+class Instrumentation:
+    """
+    Dispatcher of client events to hooks.
+
+    A hook is a callable receiving the event name and a dict of fields. The
+    client checks `bool(instrumentation)` before building any event, so an
+    instance without hooks costs a single attribute lookup per call site.
+    Exceptions raised by a hook are logged and never reach the API call.
+
+    Events emitted by the client:
+        request     one HTTP attempt: method, route, status_code (None on
+                    network errors), duration, request_bytes, response_bytes
+                    and, when the transport reports them, phases (connect,
+                    tls, wait, download)
+        queue_wait  time spent waiting for the rate limiter: method, route, duration
+        retry       a request is about to be retried: method, route, attempt,
+                    reason, delay
+        decode      JSON decoding of a response: route, duration, bytes
+        validate    conversion of a response into models: model, operation,
+                    response_mode, duration
+        skip        an update skipped because its body didn't change: operation
+        booking_status  a booking was validated, had its validation reverted
+                    or was cancelled: token, status (the new BookingStatus)
+        circuit     the circuit breaker state of a route changed: route, state
+        circuit_open    a request was rejected by an open circuit: route
+        hedge       a hedged GET request: route, outcome ("sent" when the
+                    second request is sent, "won" when it answered first)
+    """
+
+    def __init__(self, hooks: Optional[Iterable[Hook]] = None):
+        self._hooks: List[Hook] = list(hooks or ())
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def add(self, hook: Hook) -> Hook:
+        """Register a hook. Returns it, so that it can be used as a decorator."""
+        self._hooks.append(hook)
+        return hook
+
+    def remove(self, hook: Hook) -> None:
+        """Unregister a hook."""
+        self._hooks.remove(hook)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Send an event to every hook."""
+        for hook in self._hooks:
+            try:
+                hook(event, fields)
+            except Exception:
+                logger.exception("Instrumentation hook %r failed on a %s event", hook, event)
+
+
+class RequestTrace:
+    """
+    Collector of httpcore trace events for one HTTP attempt.
+
+    Passed to httpx as the `trace` request extension. Name resolution happens
+    inside the TCP connection step, so it is reported as part of `connect`.
+    """
+
+    __slots__ = ("events",)
+
+    PHASES = (
+        ("connect", "connection.connect_tcp.started", "connection.connect_tcp.complete"),
+        ("tls", "connection.start_tls.started", "connection.start_tls.complete"),
+        ("wait", "send_request_body.complete", "receive_response_headers.complete"),
+        ("download", "receive_response_body.started", "receive_response_body.complete"),
+    )
+
+    def __init__(self):
+        self.events: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        # "http11.*" and "http2.*" events are stored without their prefix.
+        if not event_name.startswith("connection."):
+            event_name = event_name.split(".", 1)[-1]
+        self.events[event_name] = time.perf_counter()
+
+    def phases(self) -> Dict[str, float]:
+        """Return the duration of every phase seen during the attempt."""
+        phases = {}
+        for phase, start, end in self.PHASES:
+            if start in self.events and end in self.events:
+                phases[phase] = self.events[end] - self.events[start]
+        return phases
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds, Prometheus style."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    DEFAULT_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Tuple[Tuple[str, Any], ...], **extra: Any) -> str:
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_label_value(value)}"' for name, value in items) + "}"
+
+
+class MetricsCollector:
+    """
+    Hook aggregating client events into counters and histograms.
+
+    Register it with `client.instrumentation.add(collector)` and export the
+    metrics with `to_prometheus()`.
+    """
+
+    PREFIX = "pass_culture"
+    # Values of the circuit_state gauge.
+    CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.gauges: Dict[Tuple[str, Tuple], float] = {}
+
+    def __call__(self, event: str, fields: Dict[str, Any]) -> None:
+        handler = getattr(self, f"_on_{event}", None)
+        if handler is not None:
+            with self._lock:
+                handler(fields)
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increment a counter."""
+        self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge."""
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def _on_request(self, fields: Dict[str, Any]) -> None:
+        method, route = fields["method"], fields["route"]
+        status = fields["status_code"] or "error"
+        self.inc("requests_total", method=method, route=route, status=status)
+        self.observe("request_duration_seconds", fields["duration"], method=method, route=route)
+        self.inc("request_bytes_total", fields.get("request_bytes") or 0, route=route)
+        self.inc("response_bytes_total", fields.get("response_bytes") or 0, route=route)
+        for phase, duration in (fields.get("phases") or {}).items():
+            self.observe("request_phase_seconds", duration, phase=phase)
+
+    def _on_queue_wait(self, fields: Dict[str, Any]) -> None:
+        self.observe("queue_wait_seconds", fields["duration"], route=fields["route"])
+
+    def _on_retry(self, fields: Dict[str, Any]) -> None:
+        self.inc("retries_total", route=fields["route"], reason=fields["reason"])
+
+    def _on_decode(self, fields: Dict[str, Any]) -> None:
+        self.observe("decode_seconds", fields["duration"], route=fields["route"])
+
+    def _on_validate(self, fields: Dict[str, Any]) -> None:
+        self.observe(
+            "validate_seconds",
+            fields["duration"],
+            operation=fields["operation"],
+            model=fields["model"],
+        )
+
+    def _on_skip(self, fields: Dict[str, Any]) -> None:
+        self.inc("skipped_updates_total", operation=fields["operation"])
+
+    def _on_circuit(self, fields: Dict[str, Any]) -> None:
+        state = getattr(fields["state"], "value", fields["state"])
+        self.set("circuit_state", self.CIRCUIT_STATES[state], route=fields["route"])
+        self.inc("circuit_transitions_total", route=fields["route"], state=state)
+
+    def _on_circuit_open(self, fields: Dict[str, Any]) -> None:
+        self.inc("circuit_rejections_total", route=fields["route"])
+
+    def _on_hedge(self, fields: Dict[str, Any]) -> None:
+        self.inc("hedged_requests_total", route=fields["route"], outcome=fields["outcome"])
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {self.PREFIX}_{name} counter")
+                for (metric, labels), value in sorted(self.counters.items(), key=str):
+                    if metric == name:
+                        lines.append(f"{self.PREFIX}_{name}{_labels(labels)} {value:g}")
+            for name in sorted({name for name, _ in self.gauges}):
+                lines.append(f"# TYPE {self.PREFIX}_{name} gauge")
+                for (metric, labels), value in sorted(self.gauges.items(), key=str):
+                    if metric == name:
+                        lines.append(f"{self.PREFIX}_{name}{_labels(labels)} {value:g}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {self.PREFIX}_{name} histogram")
+                for (metric, labels), histogram in sorted(self.histograms.items(), key=str):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{self.PREFIX}_{name}_bucket{_labels(labels, le=le)} {cumulative}")
+                    lines.append(f"{self.PREFIX}_{name}_sum{_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{self.PREFIX}_{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook:
+    """
+    Hook recording every HTTP attempt as an OpenTelemetry span.
+
+    Requires the `opentelemetry-api` package.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        Args:
+            tracer: OpenTelemetry tracer, defaults to the global tracer provider's
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetry support requires the 'opentelemetry-api' package. "
+                "Install it with `pip install opentelemetry-api`."
+            )
+        self._status = trace.Status
+        self._status_code = trace.StatusCode
+        self.tracer = tracer or trace.get_tracer("pass_culture")
+
+    def __call__(self, event: str, fields: Dict[str, Any]) -> None:
+        if event != "request":
+            return
+        end = time.time_ns()
+        start = end - int(fields["duration"] * 1e9)
+        span = self.tracer.start_span(
+            f"{fields['method']} {fields['route']}",
+            start_time=start,
+            attributes={
+                "http.request.method": fields["method"],
+                "url.path": fields["route"],
+                "http.response.status_code": fields["status_code"] or 0,
+                "http.request.body.size": fields.get("request_bytes") or 0,
+                "http.response.body.size": fields.get("response_bytes") or 0,
+                **{f"pass_culture.phase.{phase}": value for phase, value in (fields.get("phases") or {}).items()},
+            },
+        )
+        if fields["status_code"] is None or fields["status_code"] >= 500:
+            span.set_status(self._status(self._status_code.ERROR))
+        span.end(end_time=end)
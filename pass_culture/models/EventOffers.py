@@ -2,12 +2,13 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Any, Dict
 
-from ..models.common import PaginationInfo
+from .common import PaginationInfo
 from pydantic import BaseModel, Field
 
-from PriceCategory import PriceCategory
-from LocationInfo import LocationInfo
-from AccessibilityInfo import AccessibilityInfo
+from .PriceCategory import PriceCategory
+from .LocationInfo import LocationInfo
+from .AccessibilityInfo import AccessibilityInfo
+from .CategoryRelatedFields import CategoryRelatedFields as CategoryRelatedFieldsBody
 
 class CategoryRelatedFields(BaseModel):
     """Category related fields for the event offer."""
@@ -59,4 +60,43 @@ class EventOfferList(BaseModel):
     pagination: PaginationInfo
     
     class Config:
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+
+# Fields of `EventOfferBody` named differently in the `EventOffer` returned by the API.
+EVENT_OFFER_RESPONSE_KEYS = {
+    "bookingAllowedDateTime": "bookingAllowedDatetime",
+    "categoryRelatedField": "categoryRelatedFields",
+    "enableDoubleBooking": "enableDoubleBookings",
+    "publicationDate": "publicationDatetime",
+}
+
+
+class EventOfferBody(BaseModel):
+    """
+    Body of the requests creating or updating an event offer.
+
+    Encoded with `serialization.encode_body`, which omits None values.
+    """
+
+    accessibility: AccessibilityInfo
+    categoryRelatedField: CategoryRelatedFieldsBody
+    hasTicket: bool
+    location: LocationInfo
+    name: str
+    bookingAllowedDateTime: Optional[str] = None
+    bookingContact: Optional[str] = None
+    bookingEmail: Optional[str] = None
+    description: Optional[str] = None
+    enableDoubleBooking: Optional[bool] = True
+    eventDuration: Optional[int] = None
+    externalTicketOfficeUrl: Optional[str] = None
+    idAtProvider: Optional[str] = None
+    image: Optional[Any] = None  # ImageBody, or images.ImageFile to stream it
+    itemCollectionDetails: Optional[str] = None
+    priceCategories: Optional[List[PriceCategory]] = None
+    publicationDate: Optional[str] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
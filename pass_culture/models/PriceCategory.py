@@ -4,11 +4,13 @@ from typing import List, Optional, Any, Dict
 
 from pydantic import BaseModel, Field
 
+from .common import CtxMessageType
+
 
 class PriceCategory(BaseModel):
     """Price category for the event offer."""
 
-    id: int
+    id: Optional[int] = None  # None for a price category to create
     id_at_provider: Optional[str] = Field(None, alias="idAtProvider")
     label: str
     price: int  # Price in cents
@@ -26,3 +28,52 @@ class PriceCategoriesList(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+class PricingAction(str, Enum):
+    """Outcome of one change of a pricing plan."""
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    UNCHANGED = "UNCHANGED"
+    FAILED = "FAILED"
+    SUPERSEDED = "SUPERSEDED"  # Never sent: a later change of the plan targets the same price category
+
+
+class PricingChange(BaseModel):
+    """
+    One change of a pricing plan: a price category to create, or to update
+    when `priceCategoryId` (or the category's `id`) is set.
+    """
+
+    eventId: int
+    priceCategory: PriceCategory
+    priceCategoryId: Optional[int] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class PricingResult(BaseModel):
+    """
+    Result of one change of a pricing plan.
+
+    `priceCategoryId` is None for created price categories without
+    `idAtProvider`, which can't be told apart once created. A CREATED
+    result carrying an error is a price category created whose ID could
+    not be read back.
+    """
+
+    eventId: int
+    priceCategory: PriceCategory
+    action: PricingAction
+    priceCategoryId: Optional[int] = None
+    message: Optional[CtxMessageType] = None
+    error: Optional[Exception] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def success(self) -> bool:
+        """Whether the change went through."""
+        return self.error is None
@@ -1,7 +1,28 @@
-from models.bookings import (
-    Booking,
-    BookingList,
-    BookingStatus,
-)
+from .._lazy import lazy_exports
 
-__all__ = ["Offer", "OfferList", "OfferVenue", "PaginationInfo","CtxMessageType"]
\ No newline at end of file
+_EXPORTS = {
+    "AccessibilityInfo": "AccessibilityInfo",
+    "Booking": "bookings",
+    "BookingList": "bookings",
+    "BookingStatus": "bookings",
+    "BookingValidationResult": "bookings",
+    "CategoryEnum": "CategoryRelatedFields",
+    "CategoryRelatedFields": "CategoryRelatedFields",
+    "CtxMessageType": "common",
+    "EventOffer": "EventOffers",
+    "EventOfferBody": "EventOffers",
+    "EventOfferList": "EventOffers",
+    "EventOfferStatus": "EventOffers",
+    "ImageBody": "ImageBody",
+    "LocationInfo": "LocationInfo",
+    "PaginationInfo": "common",
+    "PriceCategory": "PriceCategory",
+    "PriceCategoriesList": "PriceCategory",
+    "PricingAction": "PriceCategory",
+    "PricingChange": "PriceCategory",
+    "PricingResult": "PriceCategory",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
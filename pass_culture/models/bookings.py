@@ -1,8 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from models.common import PaginationInfo
+from .common import CtxMessageType, PaginationInfo
 from pydantic import BaseModel, Field
 
 
@@ -30,6 +30,7 @@ class Booking(BaseModel):
     quantity: int
     status: BookingStatus
     stock_id: int = Field(..., alias="stockId")
+    token: Optional[str] = None
     user_birth_date: Optional[str] = Field(None, alias="userBirthDate")
     user_email: Optional[str] = Field(None, alias="userEmail")
     user_first_name: Optional[str] = Field(None, alias="userFirstName")
@@ -52,4 +53,25 @@ class BookingList(BaseModel):
     bookings: List[Booking] = Field(..., alias="data")
     
     class Config:
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+
+class BookingValidationResult(BaseModel):
+    """
+    Outcome of the validation of one booking token in a bulk operation.
+    """
+
+    token: str
+    message: Optional[CtxMessageType] = None
+    error: Optional[Exception] = None
+    status_code: Optional[int] = None
+    errors: Optional[Any] = None  # Error body of the API, e.g. {"booking": ["This booking has been used"]}
+    deduplicated: bool = False
+
+    @property
+    def success(self) -> bool:
+        """Whether the validation went through."""
+        return self.error is None
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -0,0 +1,154 @@
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+
+class ResponseMode(str, Enum):
+    """
+    How endpoint methods turn decoded JSON into return values.
+
+    - VALIDATE: full pydantic validation (default)
+    - LAZY: lists of nested models are validated item by item, when first
+      accessed; everything else is validated at once
+    - CONSTRUCT: trusted parsing with `model_construct`, recursively, without
+      validation or conversion: enums stay strings, and responses that don't
+      match the models don't raise. With pydantic 2 it is slower than
+      VALIDATE (see benchmarks/bench_response_modes.py)
+    - RAW: the decoded JSON is returned as is (copied when a response cache is enabled)
+    """
+
+    VALIDATE = "validate"
+    LAZY = "lazy"
+    CONSTRUCT = "construct"
+    RAW = "raw"
+
+
+def _model_type(annotation) -> Optional[Type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _nested_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, str, bool, Type[BaseModel]], ...]:
+    """
+    List the fields of a model holding nested models.
+
+    Returns:
+        Tuples of (input key, field name, is a list, nested model)
+    """
+    nested_fields = []
+    for name, field in model.model_fields.items():
+        annotation = _unwrap_optional(field.annotation)
+        many = False
+        nested = _model_type(annotation)
+        if nested is None and get_origin(annotation) in (list, List) and get_args(annotation):
+            nested = _model_type(get_args(annotation)[0])
+            many = True
+        if nested is not None:
+            nested_fields.append((field.alias or name, name, many, nested))
+    return tuple(nested_fields)
+
+
+def construct(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """
+    Build a model and its nested models from trusted data with
+    `model_construct`, without validation.
+    """
+    nested_fields = _nested_fields(model)
+    if nested_fields:
+        data = dict(data)
+        for key, name, many, nested in nested_fields:
+            if key not in data and name in data:
+                key = name
+            value = data.get(key)
+            if value is None:
+                continue
+            if many:
+                data[key] = [construct(nested, item) for item in value]
+            else:
+                data[key] = construct(nested, value)
+    return model.model_construct(**data)
+
+
+class LazyModelList(Sequence):
+    """
+    Read-only list of raw items validated into models the first time they
+    are accessed.
+    """
+
+    __slots__ = ("model", "_items", "_parsed")
+
+    def __init__(self, model: Type[BaseModel], items: List[Dict[str, Any]]):
+        self.model = model
+        self._items = items
+        self._parsed: List[Optional[BaseModel]] = [None] * len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        parsed = self._parsed[index]
+        if parsed is None:
+            parsed = self.model.model_validate(self._items[index])
+            self._parsed[index] = parsed
+        return parsed
+
+    def __repr__(self) -> str:
+        return f"LazyModelList({self.model.__name__}, {len(self)} items)"
+
+
+def lazy(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """
+    Build a model whose lists of nested models are validated on access.
+
+    The rest of the model, nested models outside of lists included, is
+    validated at once, so that its values are converted as in VALIDATE mode.
+    A model without such lists is simply validated.
+    """
+    lists = [
+        (key if key in data else name, name, nested)
+        for key, name, many, nested in _nested_fields(model)
+        if many and (key in data or name in data)
+    ]
+    if not lists:
+        return model.model_validate(data)
+    instance = model.model_validate({**data, **{key: [] for key, _, _ in lists}})
+    for key, name, nested in lists:
+        items = data[key]
+        setattr(instance, name, LazyModelList(nested, items) if items is not None else None)
+    return instance
+
+
+def parse(model: Type[BaseModel], data: Any, mode: ResponseMode = ResponseMode.VALIDATE) -> Any:
+    """
+    Turn decoded JSON into the value returned by an endpoint method.
+
+    Args:
+        model: Model the data is expected to match
+        data: Decoded JSON
+        mode: ResponseMode to apply
+
+    Returns:
+        A model instance, or the data itself in RAW mode
+    """
+    mode = ResponseMode(mode)
+    if mode is ResponseMode.VALIDATE:
+        return model.model_validate(data)
+    if mode is ResponseMode.RAW:
+        return data
+    if mode is ResponseMode.LAZY:
+        return lazy(model, data)
+    return construct(model, data)
@@ -0,0 +1,409 @@
+import asyncio
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Set
+
+import httpx
+from pydantic import BaseModel
+
+from .client import PassCultureClient
+from .config import TransportSettings
+from .ratelimit import TokenBucketLimiter
+
+
+class TenantSettings(BaseModel):
+    """
+    Settings of one tenant (a venue API key) of a `PassCultureClientPool`.
+    """
+
+    api_key: str
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_concurrency: Optional[int] = None
+
+
+class FairScheduler:
+    """
+    Share a number of request slots between tenants, round robin.
+
+    Waiting requests are queued per tenant and, whenever a slot frees up, it
+    goes to the next tenant in turn that has a request waiting, so that a busy
+    tenant can't starve the others. A tenant can also be capped to a number
+    of slots of its own.
+    """
+
+    def __init__(self, max_concurrency: int, tenant_max_concurrency: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Total number of slots
+            tenant_max_concurrency: Default number of slots a single tenant may hold
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self.limits: Dict[str, int] = {}
+        self.active = 0
+        self.in_flight: Counter = Counter()
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def _limit(self, tenant: str) -> Optional[int]:
+        return self.limits.get(tenant, self.tenant_max_concurrency)
+
+    def _eligible(self, tenant: str) -> bool:
+        limit = self._limit(tenant)
+        return limit is None or self.in_flight[tenant] < limit
+
+    async def acquire(self, tenant: str) -> None:
+        """Wait for a slot for `tenant`."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tenant, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before the cancellation.
+                self.release(tenant)
+            else:
+                queue = self._waiters.get(tenant)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._waiters[tenant]
+            raise
+
+    def release(self, tenant: str) -> None:
+        """Give back a slot held by `tenant`."""
+        self.active -= 1
+        self.in_flight[tenant] -= 1
+        if self.in_flight[tenant] <= 0:
+            del self.in_flight[tenant]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.active < self.max_concurrency and self._waiters:
+            tenant = next((tenant for tenant in self._waiters if self._eligible(tenant)), None)
+            if tenant is None:
+                return
+            # Served tenants move to the back of the line.
+            queue = self._waiters.pop(tenant)
+            waiter = queue.popleft()
+            if queue:
+                self._waiters[tenant] = queue
+            if waiter.done():
+                continue
+            self.active += 1
+            self.in_flight[tenant] += 1
+            waiter.set_result(None)
+
+
+class _SlotStream(httpx.AsyncByteStream):
+    """Response stream giving back its scheduler slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class _TenantTransport(httpx.AsyncBaseTransport):
+    """
+    Transport of one tenant client: holds a scheduler slot for each request,
+    from sending it until its response is read, then delegates to the shared
+    transport. It counts the requests in flight, queued ones included, and
+    records when the client was last used.
+    """
+
+    def __init__(self, pool: "PassCultureClientPool", tenant: str):
+        self._pool = pool
+        self._tenant = tenant
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool, tenant = self._pool, self._tenant
+        self.in_flight += 1
+        self.last_used = time.monotonic()
+        try:
+            await pool.scheduler.acquire(tenant)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        try:
+            response = await pool.http_transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_SlotStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self.last_used = time.monotonic()
+        self._pool.scheduler.release(self._tenant)
+
+    def idle(self, now: float, timeout: float) -> bool:
+        """Whether nothing was in flight for the last `timeout` seconds."""
+        return self.in_flight == 0 and now - self.last_used > timeout
+
+    async def aclose(self) -> None:
+        # The shared transport is closed by the pool.
+        pass
+
+
+class _TenantClient(NamedTuple):
+    client: PassCultureClient
+    http_client: httpx.AsyncClient
+    transport: _TenantTransport
+
+
+class PassCultureClientPool:
+    """
+    Clients for many tenants (venue API keys) sharing one connection pool.
+
+    Tenants are registered with `add_tenant`, which only records their
+    settings. Their `PassCultureClient` is built on first use and closed
+    after `idle_timeout` seconds without requests, so memory grows with the
+    number of active tenants, and sockets are bounded by the shared pool
+    whatever the number of tenants. The clients of removed tenants, or
+    replaced by new settings, are closed once idle in the same way.
+
+    Every tenant has its own rate limiter, kept across its clients so that
+    evictions don't reset its budget. Requests then go through a
+    `FairScheduler`, which hands out the pool's connections to tenants in
+    turn.
+    """
+
+    def __init__(
+        self,
+        api_endpoint: str,
+        transport: Optional[TransportSettings] = None,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate: Optional[float] = 10.0,
+        max_concurrency: Optional[int] = None,
+        tenant_max_concurrency: Optional[int] = None,
+        idle_timeout: float = 300.0,
+        **client_options,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            api_endpoint: Base URL for the API
+            transport: Connection pool, keep-alive, HTTP/2 and timeout settings
+            http_transport: Shared httpx transport, built from `transport` by default
+            rate: Default requests per second of a tenant, None for no rate limit
+            max_concurrency: Requests in flight across all tenants, defaults to
+                the connection pool size
+            tenant_max_concurrency: Default requests in flight for one tenant
+            idle_timeout: Seconds without requests after which a tenant's client
+                is closed
+            **client_options: Other `PassCultureClient` arguments, shared by
+                every tenant (retry policy, response mode, hooks...)
+        """
+        for option in ("http_client", "rate_limiter", "cache", "fingerprint_store"):
+            if option in client_options:
+                raise ValueError(f"{option} can't be shared between tenants")
+        self.api_endpoint = api_endpoint
+        self.transport = transport or TransportSettings()
+        self._owns_transport = http_transport is None
+        self.http_transport = http_transport or httpx.AsyncHTTPTransport(
+            limits=self.transport.limits(), http2=self.transport.http2
+        )
+        self.rate = rate
+        self.scheduler = FairScheduler(
+            max_concurrency or self.transport.max_connections or 100, tenant_max_concurrency
+        )
+        self.idle_timeout = idle_timeout
+        self.client_options = client_options
+        self.evictions = 0
+        self._tenants: Dict[str, TenantSettings] = {}
+        self._limiters: Dict[str, Optional[TokenBucketLimiter]] = {}
+        self._clients: Dict[str, _TenantClient] = {}
+        # Clients no longer handed out, closed once idle.
+        self._retired: List[_TenantClient] = []
+        self._closing: Set[asyncio.Task] = set()
+        self._last_eviction = time.monotonic()
+
+    def add_tenant(
+        self,
+        tenant: str,
+        api_key: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Register a tenant, or update its settings.
+
+        Args:
+            tenant: Name of the tenant, a venue ID for instance
+            api_key: API key of the tenant
+            rate: Requests per second, defaults to the pool's
+            burst: Requests that may be sent at once, defaults to `rate`
+            max_concurrency: Requests in flight, defaults to the pool's
+        """
+        settings = TenantSettings(api_key=api_key, rate=rate, burst=burst, max_concurrency=max_concurrency)
+        previous = self._tenants.get(tenant)
+        self._tenants[tenant] = settings
+        if max_concurrency is not None:
+            self.scheduler.limits[tenant] = max_concurrency
+        else:
+            self.scheduler.limits.pop(tenant, None)
+        if previous is None or previous == settings:
+            return
+        if (previous.rate, previous.burst) != (rate, burst):
+            self._limiters.pop(tenant, None)
+        # Settings changes apply to the next client built.
+        self._retire(tenant)
+
+    def remove_tenant(self, tenant: str) -> None:
+        """Forget a tenant. Its client is closed once its requests are done."""
+        self._tenants.pop(tenant, None)
+        self._limiters.pop(tenant, None)
+        self.scheduler.limits.pop(tenant, None)
+        self._retire(tenant)
+
+    def client(self, tenant: str) -> PassCultureClient:
+        """
+        Return the client of a tenant, building it if needed.
+
+        Fetch it from the pool for each unit of work rather than keeping it:
+        idle clients are dropped from the pool.
+
+        Raises:
+            KeyError: If the tenant is unknown
+        """
+        now = time.monotonic()
+        if now - self._last_eviction > self.idle_timeout / 2:
+            self.evict_idle()
+        entry = self._clients.get(tenant)
+        if entry is None:
+            entry = self._clients[tenant] = self._build_client(tenant, self._tenants[tenant])
+        entry.transport.last_used = now
+        return entry.client
+
+    __getitem__ = client
+
+    def _build_client(self, tenant: str, settings: TenantSettings) -> _TenantClient:
+        if tenant not in self._limiters:
+            rate = settings.rate or self.rate
+            self._limiters[tenant] = TokenBucketLimiter(rate, settings.burst) if rate else None
+        transport = _TenantTransport(self, tenant)
+        http_client = httpx.AsyncClient(
+            base_url=self.api_endpoint,
+            timeout=self.transport.timeouts(),
+            transport=transport,
+        )
+        client = PassCultureClient(
+            api_key=settings.api_key,
+            api_endpoint=self.api_endpoint,
+            transport=self.transport,
+            http_client=http_client,
+            rate_limiter=self._limiters[tenant],
+            **self.client_options,
+        )
+        return _TenantClient(client, http_client, transport)
+
+    def _retire(self, tenant: str) -> None:
+        entry = self._clients.pop(tenant, None)
+        if entry is not None:
+            self._retired.append(entry)
+
+    def evict_idle(self) -> int:
+        """
+        Drop the clients of tenants idle for more than `idle_timeout` seconds,
+        and close them along with the idle clients of removed tenants.
+
+        Clients are closed in the background, so this needs a running event
+        loop: without one, they are closed by a later call or by `close`.
+
+        Returns:
+            Number of clients dropped
+        """
+        now = time.monotonic()
+        self._last_eviction = now
+        idle = [tenant for tenant, entry in self._clients.items() if entry.transport.idle(now, self.idle_timeout)]
+        for tenant in idle:
+            self._retire(tenant)
+        self.evictions += len(idle)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return len(idle)
+        done = [entry for entry in self._retired if entry.transport.idle(now, self.idle_timeout)]
+        if done:
+            self._retired = [entry for entry in self._retired if entry not in done]
+            task = loop.create_task(self._aclose(done))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        return len(idle)
+
+    @staticmethod
+    async def _aclose(entries: List[_TenantClient]) -> None:
+        for entry in entries:
+            # The client doesn't own its HTTP client, so close both.
+            await entry.client.close()
+            await entry.http_client.aclose()
+
+    @property
+    def tenants(self) -> list:
+        """Names of the registered tenants."""
+        return list(self._tenants)
+
+    @property
+    def active_tenants(self) -> list:
+        """Names of the tenants whose client is built."""
+        return list(self._clients)
+
+    def stats(self) -> dict:
+        """Return the pool's tenant and scheduling counters."""
+        return {
+            "tenants": len(self._tenants),
+            "active_tenants": len(self._clients),
+            "retired_clients": len(self._retired),
+            "in_flight": self.scheduler.active,
+            "queued": self.scheduler.queued,
+            "evictions": self.evictions,
+        }
+
+    async def close(self) -> None:
+        """Close every client, and the shared transport if the pool owns it."""
+        for tenant in list(self._clients):
+            self._retire(tenant)
+        retired, self._retired = self._retired, []
+        await self._aclose(retired)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+        if self._owns_transport:
+            await self.http_transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
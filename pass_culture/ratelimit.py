@@ -0,0 +1,179 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from .exceptions import RateLimitError
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Read the delay advertised by a `Retry-After` header.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None when the header is missing or invalid
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Read the delay until the rate limit window resets, when the quota is exhausted.
+
+    Both `RateLimit-*` and `X-RateLimit-*` headers are understood. The reset
+    value may be a delay in seconds or a Unix timestamp.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None when requests may still be sent
+    """
+    for prefix in ("RateLimit", "X-RateLimit"):
+        remaining = headers.get(f"{prefix}-Remaining")
+        reset = headers.get(f"{prefix}-Reset")
+        if remaining is None or reset is None:
+            continue
+        try:
+            if int(remaining) > 0:
+                return None
+            reset = float(reset)
+        except ValueError:
+            continue
+        if reset > 1e9:
+            reset -= time.time()
+        return max(0.0, reset)
+    return None
+
+
+class TokenBucketLimiter:
+    """
+    Client-wide token bucket limiter adapting to the API's rate limit signals.
+
+    Callers are served in arrival order. When the server answers 429, sends
+    `Retry-After` or reports an exhausted quota, the bucket is paused for the
+    advertised delay and its rate is halved. The rate then climbs back
+    towards its configured value as requests succeed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[int] = None,
+        max_wait: Optional[float] = 60.0,
+        min_rate: float = 0.5,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Sustained number of requests per second
+            burst: Number of requests that may be sent at once (defaults to `rate`)
+            max_wait: Time budget in seconds a request may spend waiting for the
+                limiter, 429 retries included, before RateLimitError is raised.
+                None waits forever.
+            min_rate: Lower bound for the adapted rate
+        """
+        if rate <= 0:
+            raise ValueError("rate must be strictly positive")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst or max(1, int(rate))
+        self.max_wait = max_wait
+        self.throttled = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Created on first use, inside the event loop that will run the requests.
+        self._lock: Optional[asyncio.Lock] = None
+
+    def deadline(self) -> Optional[float]:
+        """Return the monotonic time at which a request starting now runs out of budget."""
+        if self.max_wait is None:
+            return None
+        return time.monotonic() + self.max_wait
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: Optional[float] = None) -> float:
+        """
+        Wait for a token.
+
+        Args:
+            deadline: Monotonic time after which waiting is pointless (see `deadline`)
+
+        Returns:
+            Time spent waiting, in seconds
+
+        Raises:
+            RateLimitError: If no token can be obtained before the deadline
+        """
+        start = time.monotonic()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if deadline is not None:
+            try:
+                await asyncio.wait_for(self._lock.acquire(), max(0.0, deadline - start))
+            except asyncio.TimeoutError:
+                raise RateLimitError("Rate limit wait budget exhausted while queued")
+        else:
+            await self._lock.acquire()
+        try:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.0)
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitError(
+                    f"Rate limit wait budget exhausted, next slot in {wait:.2f}s",
+                    retry_after=wait,
+                )
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._refill(time.monotonic())
+            self._tokens -= 1
+        finally:
+            self._lock.release()
+        return time.monotonic() - start
+
+    def observe(self, response) -> Optional[float]:
+        """
+        Adapt the limiter to a response.
+
+        Args:
+            response: httpx.Response received for a request sent through the limiter
+
+        Returns:
+            The delay advertised by the server, if any
+        """
+        delay = parse_retry_after(response.headers)
+        if delay is None:
+            delay = parse_rate_limit_reset(response.headers)
+        if response.status_code == 429:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if delay is None:
+                delay = 1 / self.rate
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+        if delay:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = min(self._tokens, 0.0)
+        return delay
@@ -0,0 +1,223 @@
+import time
+from collections import defaultdict, deque
+from enum import Enum
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(str, Enum):
+    """State of the circuit of a route."""
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probes")
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Per-route circuit breaker.
+
+    A route's circuit opens after `failure_threshold` consecutive failures
+    (network errors and 5xx responses): its requests then fail at once with
+    `CircuitOpenError` instead of waiting for the API. After
+    `recovery_timeout` seconds, the circuit is half open and lets up to
+    `half_open_max_calls` probe requests through: it closes on the first
+    success and opens again on a failure. Only the outcomes of the probes
+    decide: requests let through before the circuit opened don't count as
+    probes when they complete.
+
+    Routes are the templates of `instrumentation.route_of`, so that all the
+    bookings share the circuit of `bookings/v1/token/{token}`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures opening a circuit
+            recovery_timeout: Seconds a circuit stays open before probing
+            half_open_max_calls: Probe requests in flight while half open
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._circuits: Dict[str, _Circuit] = defaultdict(_Circuit)
+
+    def state(self, route: str) -> CircuitState:
+        """Return the state of the circuit of a route."""
+        circuit = self._circuits.get(route)
+        return circuit.state if circuit is not None else CircuitState.CLOSED
+
+    def states(self) -> Dict[str, CircuitState]:
+        """Return the state of every route seen so far."""
+        return {route: circuit.state for route, circuit in self._circuits.items()}
+
+    def before(self, route: str) -> Tuple[CircuitState, Optional[CircuitState]]:
+        """
+        Let a request through, or reject it.
+
+        Returns:
+            The state the request was let through in, to pass to `record` or
+            `abandon`, and the new state of the circuit if this call changed
+            it, else None
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with
+                enough probes in flight
+        """
+        circuit = self._circuits[route]
+        changed = None
+        if circuit.state is CircuitState.OPEN:
+            remaining = circuit.opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit open for {route}", route=route, retry_after=remaining)
+            circuit.state = changed = CircuitState.HALF_OPEN
+            circuit.probes = 0
+        if circuit.state is CircuitState.HALF_OPEN:
+            if circuit.probes >= self.half_open_max_calls:
+                raise CircuitOpenError(f"Circuit half open for {route}, probe in flight", route=route)
+            circuit.probes += 1
+        return circuit.state, changed
+
+    def record(self, route: str, success: bool, admitted: CircuitState) -> Optional[CircuitState]:
+        """
+        Record the outcome of a request let through by `before`.
+
+        Args:
+            route: Route of the request
+            success: Whether the API answered without a server error
+            admitted: State the request was let through in, as returned by `before`
+
+        Returns:
+            The new state of the circuit if this call changed it, else None
+        """
+        circuit = self._circuits[route]
+        if admitted is CircuitState.HALF_OPEN:
+            circuit.probes = max(0, circuit.probes - 1)
+        if circuit.state is not admitted:
+            # The circuit changed while the request was in flight: its
+            # outcome is about a state that no longer holds.
+            return None
+        if circuit.state is CircuitState.HALF_OPEN:
+            if success:
+                circuit.failures = 0
+                circuit.state = CircuitState.CLOSED
+            else:
+                circuit.state = CircuitState.OPEN
+                circuit.opened_at = time.monotonic()
+            return circuit.state
+        if success:
+            circuit.failures = 0
+            return None
+        circuit.failures += 1
+        if circuit.failures >= self.failure_threshold:
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = time.monotonic()
+            return circuit.state
+        return None
+
+    def abandon(self, route: str, admitted: CircuitState) -> None:
+        """Forget a request let through by `before` that was cancelled before completing."""
+        if admitted is CircuitState.HALF_OPEN:
+            circuit = self._circuits[route]
+            circuit.probes = max(0, circuit.probes - 1)
+
+
+class HedgePolicy:
+    """
+    When to send a second copy of a slow GET request.
+
+    The delay is the `quantile` of the latencies recently observed on the
+    route (the p95 by default), so that about one request in twenty is
+    hedged, and at most a `max_ratio` share of a route's requests are.
+    Routes are hedged once `min_samples` latencies were observed on them.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_delay: float = 0.01,
+        max_delay: Optional[float] = None,
+        min_samples: int = 20,
+        window: int = 200,
+        max_ratio: float = 0.1,
+        routes: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            quantile: Latency quantile after which a request is hedged
+            min_delay: Lower bound of the delay, in seconds
+            max_delay: Upper bound of the delay, in seconds
+            min_samples: Latencies to observe on a route before hedging it
+            window: Number of recent latencies kept per route
+            max_ratio: Maximum share of a route's requests that are hedged
+            routes: Route templates to hedge (see `route_of`), all GET routes by default
+        """
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.max_ratio = max_ratio
+        self.routes = frozenset(routes) if routes is not None else None
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.hedges: Dict[str, int] = defaultdict(int)
+        self.wins: Dict[str, int] = defaultdict(int)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._delays: Dict[str, float] = {}
+
+    def applies_to(self, route: str) -> bool:
+        """Tell whether the requests of a route may be hedged."""
+        return self.routes is None or route in self.routes
+
+    def observe(self, route: str, duration: float) -> None:
+        """Record the latency of a request."""
+        samples = self._samples.get(route)
+        if samples is None:
+            samples = self._samples[route] = deque(maxlen=self.window)
+        samples.append(duration)
+        self.requests[route] += 1
+        # The quantile is recomputed every few samples rather than per request.
+        if len(samples) >= self.min_samples and (route not in self._delays or self.requests[route] % 8 == 0):
+            ordered = sorted(samples)
+            delay = max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+            if self.max_delay is not None:
+                delay = min(delay, self.max_delay)
+            self._delays[route] = delay
+
+    def delay(self, route: str) -> Optional[float]:
+        """Return how long to wait before hedging a request, None not to hedge it."""
+        return self._delays.get(route)
+
+    def allow(self, route: str) -> bool:
+        """Tell whether a hedge may be sent now, and count it if so."""
+        if self.hedges[route] + 1 > self.max_ratio * self.requests[route]:
+            return False
+        self.hedges[route] += 1
+        return True
+
+    def rate(self, route: str) -> float:
+        """Share of the requests of a route that were hedged."""
+        return self.hedges[route] / self.requests[route] if self.requests[route] else 0.0
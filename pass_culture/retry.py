@@ -0,0 +1,98 @@
+import random
+import time
+from typing import Iterable, Optional
+
+import httpx
+
+
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff, full jitter and a total deadline.
+
+    Requests are retried on network errors and on the configured status
+    codes, but only when they are idempotent: safe HTTP methods, or calls
+    explicitly flagged as idempotent by the endpoint. Non-idempotent requests
+    are only retried when the connection could not be established, since
+    the server then never saw them.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.2,
+        max_delay: float = 10.0,
+        deadline: Optional[float] = 60.0,
+        retry_statuses: Iterable[int] = (500, 502, 503, 504),
+        idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS"),
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, the first one included (1 disables retries)
+            base_delay: Backoff of the first retry, in seconds, before jitter
+            max_delay: Upper bound of the backoff, in seconds, before jitter
+            deadline: Total time budget in seconds for all attempts, None for no limit
+            retry_statuses: HTTP status codes considered transient
+            idempotent_methods: HTTP methods retried without an explicit opt-in
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+
+    def start(self) -> Optional[float]:
+        """Return the monotonic time at which a request starting now must give up."""
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def is_idempotent(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """Tell whether a request may be sent again without side effects."""
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in self.idempotent_methods
+
+    def should_retry_error(self, error: httpx.RequestError, idempotent: bool) -> bool:
+        """Tell whether a network error is worth retrying."""
+        if idempotent:
+            return True
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        """Tell whether a response status is worth retrying."""
+        return idempotent and status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter backoff before the retry following `attempt` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def next_delay(
+        self,
+        attempt: int,
+        deadline: Optional[float],
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed (0-based)
+            deadline: Value returned by `start`
+            retry_after: Delay requested by the server, if any
+
+        Returns:
+            Delay in seconds, or None when no attempt is left within the deadline
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        return delay
@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Type, Union
+
+from pydantic import BaseModel
+
+from .images import ImageFile, StreamingJSONBody, image_placeholder
+
+class ModelEncoder:
+    """
+    JSON encoder of a request model, bound once per model class.
+
+    Encoding runs in pydantic-core, straight from the model's compiled
+    serializer to bytes: field aliases are applied, None values are omitted
+    and no intermediate dict is built.
+    """
+
+    __slots__ = ("model", "_to_json")
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self._to_json = model.__pydantic_serializer__.to_json
+
+    def encode(self, instance: BaseModel, fallback: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        Encode a model instance.
+
+        Args:
+            instance: Instance of the encoder's model, validated or built
+                with `model_construct`
+            fallback: Called with values of unknown types (see `encode_body`)
+
+        Returns:
+            The JSON document, as bytes
+        """
+        return self._to_json(
+            instance, by_alias=True, exclude_none=True, fallback=fallback, warnings=False
+        )
+
+
+@lru_cache(maxsize=None)
+def encoder_for(model: Type[BaseModel]) -> ModelEncoder:
+    """Return the encoder of a model class, creating it on first use."""
+    return ModelEncoder(model)
+
+
+def encode_body(instance: BaseModel) -> Union[bytes, StreamingJSONBody]:
+    """
+    Encode a request body model.
+
+    Args:
+        instance: Request body model
+
+    Returns:
+        The JSON body as bytes or, when the body holds `ImageFile` values, a
+        `StreamingJSONBody` streaming them
+    """
+    images: List[ImageFile] = []
+
+    def fallback(value: Any) -> Any:
+        if isinstance(value, ImageFile):
+            # Encoded like an ImageBody, with the file streamed.
+            images.append(value)
+            image = {"file": image_placeholder(len(images) - 1)}
+            if value.credit is not None:
+                image["credit"] = value.credit
+            return image
+        return str(value)
+
+    encoded = encoder_for(type(instance)).encode(instance, fallback)
+    if images:
+        return StreamingJSONBody(encoded, images)
+    return encoded
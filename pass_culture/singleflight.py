@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into a single execution.
+
+    The first caller for a key starts the call. Callers arriving for the same
+    key while it is in flight wait for that call and share its result or its
+    exception. A cancelled caller doesn't cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+        share: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Run `func` for a key, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call
+            func: Coroutine function performing the call
+            share: Optional function applied to the result handed to the
+                callers that joined the call, to give them their own copy
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            return await asyncio.shield(task)
+        self.shared += 1
+        result = await asyncio.shield(task)
+        return share(result) if share is not None else result
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every waiter may have been cancelled: mark the error as retrieved.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,285 @@
+import asyncio
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+
+from .endpoints.EventOffers import build_event_offer_body
+from .exceptions import PassCultureAPIError
+from .models.EventOffers import EVENT_OFFER_RESPONSE_KEYS
+from .parsing import ResponseMode
+
+# Write-only fields, not returned in a comparable form by the API: they are
+# sent on creation only. Price categories have their own endpoint.
+_CREATE_ONLY = ("image", "priceCategories")
+
+
+class UpsertAction(str, Enum):
+    """Outcome of the upsert of one event offer."""
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    UNCHANGED = "UNCHANGED"
+    FAILED = "FAILED"
+
+
+class UpsertResult(BaseModel):
+    """
+    Result of the upsert of one event offer.
+
+    A CREATED result carrying an error is an offer created whose ID could
+    not be read back.
+    """
+
+    idAtProvider: Optional[str]
+    action: UpsertAction
+    event_offer_id: Optional[int] = None
+    changes: List[str] = []
+    error: Optional[Exception] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def _normalize_key(key: str) -> str:
+    return key.replace("_", "").lower()
+
+
+def _as_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return value
+
+
+def _same(desired: Any, current: Any) -> bool:
+    """
+    Whether a desired value is already in place.
+
+    Request bodies use field names while responses use aliases, so dict keys
+    are compared case and underscore insensitively. Only the keys present
+    (and not None) in the desired value are compared.
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        current = {_normalize_key(key): value for key, value in current.items()}
+        return all(
+            _same(value, current.get(_normalize_key(key)))
+            for key, value in desired.items()
+            if value is not None
+        )
+    if isinstance(desired, (list, tuple)):
+        return (
+            isinstance(current, (list, tuple))
+            and len(desired) == len(current)
+            and all(_same(a, b) for a, b in zip(desired, current))
+        )
+    if isinstance(desired, Enum):
+        desired = desired.value
+    return _as_datetime(desired) == _as_datetime(current)
+
+
+def diff_event_offer(body: dict, current: dict) -> dict:
+    """
+    Return the minimal PATCH body turning an existing event offer into `body`.
+
+    Args:
+        body: Desired event offer, as built by `build_event_offer_body` and
+            dumped by alias
+        current: Raw event offer returned by the API
+
+    Returns:
+        The top-level fields of `body` which differ from `current`. Fields
+        left to None in `body` are not compared.
+    """
+    changes = {}
+    for key, value in body.items():
+        if value is None or key in _CREATE_ONLY or key == "idAtProvider":
+            continue
+        if not _same(value, current.get(EVENT_OFFER_RESPONSE_KEYS.get(key, key))):
+            changes[key] = value
+    return changes
+
+
+class EventOfferUpserter:
+    """
+    Batched create-or-update of event offers keyed by `idAtProvider`.
+
+    Offers are processed in batches. The existing offers of a batch are
+    fetched with a single filtered listing (`idsAtProvider`), then each offer
+    is either created, patched with only the fields that changed, or left
+    alone. The IDs of the created offers are read back with a second
+    listing once their batch is written. Writes run concurrently, at most
+    `concurrency` at a time, and the next batch is only read once the
+    current one is done, so arbitrarily large inputs are processed in
+    bounded memory.
+
+    Invalid offers (no `idAtProvider`, unexpected arguments) are reported as
+    failed results like API errors, and never stop the upsert.
+    """
+
+    def __init__(self, client, venueId: int, concurrency: int = 8, batch_size: int = 100):
+        """
+        Initialize the upserter.
+
+        Args:
+            client: PassCultureClient used to list, create and patch offers
+            venueId: ID of the venue owning the offers
+            concurrency: Maximum number of writes in flight
+            batch_size: Number of offers looked up per listing request
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.client = client
+        self.venueId = venueId
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def upsert(
+        self, offers: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+    ) -> AsyncIterator[UpsertResult]:
+        """
+        Create or update event offers.
+
+        Args:
+            offers: Keyword arguments of `create_event_offer`, one dict per
+                offer. `idAtProvider` is required.
+
+        Yields:
+            UpsertResult objects, in completion order, created offers last
+            in each batch
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batch = []
+        async for kwargs in _aiter(offers):
+            if not kwargs.get("idAtProvider"):
+                yield UpsertResult(
+                    idAtProvider=kwargs.get("idAtProvider"),
+                    action=UpsertAction.FAILED,
+                    error=ValueError("every offer needs an idAtProvider"),
+                )
+                continue
+            batch.append(kwargs)
+            if len(batch) == self.batch_size:
+                async for result in self._upsert_batch(batch, semaphore):
+                    yield result
+                batch = []
+        if batch:
+            async for result in self._upsert_batch(batch, semaphore):
+                yield result
+
+    async def upsert_all(self, offers) -> List[UpsertResult]:
+        """
+        Create or update event offers and return every result.
+
+        Args:
+            Same as `upsert`.
+
+        Returns:
+            List of UpsertResult objects
+        """
+        return [result async for result in self.upsert(offers)]
+
+    async def _find(self, idsAtProvider: Iterable[str]) -> Dict[str, dict]:
+        """Return the raw event offers with the given provider IDs, by provider ID."""
+        found = {}
+        async for offer in self.client.event_offers.iter_event_offers(
+            self.venueId,
+            limit=self.batch_size,
+            idsAtProvider=",".join(idsAtProvider),
+            response_mode=ResponseMode.RAW,
+        ):
+            found[offer["idAtProvider"]] = offer
+        return found
+
+    async def _upsert_batch(self, batch: list, semaphore: asyncio.Semaphore) -> AsyncIterator[UpsertResult]:
+        # Later duplicates of an idAtProvider win.
+        desired = {kwargs["idAtProvider"]: kwargs for kwargs in batch}
+        existing = await self._find(desired)
+
+        tasks = [
+            asyncio.ensure_future(self._write(idAtProvider, kwargs, existing.get(idAtProvider), semaphore))
+            for idAtProvider, kwargs in desired.items()
+        ]
+        created = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result.action is UpsertAction.CREATED:
+                    created.append(result)
+                else:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+        if not created:
+            return
+
+        # The API doesn't return the ID of a created offer: look them up.
+        try:
+            found = await self._find(result.idAtProvider for result in created)
+        except Exception as e:
+            found, error = {}, e
+        else:
+            error = PassCultureAPIError("Created event offer not found by its idAtProvider")
+        for result in created:
+            offer = found.get(result.idAtProvider)
+            if offer is not None:
+                yield result.model_copy(update={"event_offer_id": offer["id"]})
+            else:
+                yield result.model_copy(update={"error": error})
+
+    async def _write(
+        self, idAtProvider: str, kwargs: dict, current: Optional[dict], semaphore: asyncio.Semaphore
+    ) -> UpsertResult:
+        changes = []
+        try:
+            body = build_event_offer_body(**kwargs)
+            if current is None:
+                action, changes = UpsertAction.CREATED, sorted(body.model_dump(exclude_none=True))
+            else:
+                patch = diff_event_offer(body.model_dump(by_alias=True, exclude_none=True), current)
+                if not patch:
+                    self.client.event_offers.record_event_offer(body)
+                    return UpsertResult(
+                        idAtProvider=idAtProvider, action=UpsertAction.UNCHANGED, event_offer_id=current["id"]
+                    )
+                action, changes = UpsertAction.UPDATED, list(patch)
+
+            async with semaphore:
+                if current is None:
+                    await self.client.event_offers.create_event_offer(**kwargs)
+                    event_offer_id = None
+                else:
+                    await self.client.event_offers.patch_event_offer(current["id"], patch)
+                    event_offer_id = current["id"]
+        except Exception as e:
+            return UpsertResult(
+                idAtProvider=idAtProvider,
+                action=UpsertAction.FAILED,
+                event_offer_id=None if current is None else current["id"],
+                changes=changes,
+                error=e,
+            )
+        self.client.event_offers.record_event_offer(body)
+        return UpsertResult(
+            idAtProvider=idAtProvider, action=action, event_offer_id=event_offer_id, changes=changes
+        )
+
+
+async def _aiter(items) -> AsyncIterator:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,418 @@
+import asyncio
+import functools
+import random
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from .exceptions import PassCultureAPIError
+from .models.bookings import BookingStatus
+
+if TYPE_CHECKING:
+    from .client import PassCultureClient
+
+
+class OperationKind(str, Enum):
+    """Booking state change queued by a `WriteBehindQueue`."""
+    VALIDATE = "validate"
+    REVERT = "revert"
+    CANCEL = "cancel"
+
+
+class OperationState(str, Enum):
+    """Progress of a queued operation."""
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+# Endpoint method and booking status after success, per operation kind.
+_OPERATIONS = {
+    OperationKind.VALIDATE: ("validate_booking", BookingStatus.USED),
+    OperationKind.REVERT: ("revert_validation", BookingStatus.CONFIRMED),
+    OperationKind.CANCEL: ("delete_booking", BookingStatus.CANCELLED),
+}
+
+
+class QueuedOperation(BaseModel):
+    """
+    A booking state change recorded in the journal.
+    """
+
+    seq: int
+    kind: OperationKind
+    token: str
+    state: OperationState = OperationState.PENDING
+    attempts: int = 0
+    enqueued_at: float
+    updated_at: float
+    last_error: Optional[str] = None
+
+
+class SQLiteJournal:
+    """
+    Durable journal of queued booking operations, in a local SQLite database.
+
+    Every write is committed with `synchronous = FULL`, so that an operation
+    acknowledged to the caller survives a crash or a power loss.
+    """
+
+    _COLUMNS = "seq, kind, token, state, attempts, enqueued_at, updated_at, last_error"
+
+    def __init__(self, path: str = "write_behind.sqlite3"):
+        """
+        Open (and create if needed) the journal.
+
+        Args:
+            path: Path of the SQLite database, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = FULL;
+            CREATE TABLE IF NOT EXISTS operations (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                token TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS operations_state ON operations (state, seq);
+            CREATE INDEX IF NOT EXISTS operations_token ON operations (token, state);
+            """
+        )
+
+    def _operation(self, row) -> QueuedOperation:
+        return QueuedOperation(**dict(zip(self._COLUMNS.split(", "), row)))
+
+    def append(self, kind: OperationKind, token: str) -> QueuedOperation:
+        """
+        Record an operation, unless the same one is already pending.
+
+        Returns:
+            The new operation, or the pending one
+        """
+        kind = OperationKind(kind)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM operations WHERE token = ? AND state = ? "
+                "ORDER BY seq DESC LIMIT 1",
+                (token, OperationState.PENDING.value),
+            ).fetchone()
+            if row is not None and row[1] == kind.value:
+                return self._operation(row)
+            cursor = self._db.execute(
+                "INSERT INTO operations (kind, token, state, enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind.value, token, OperationState.PENDING.value, now, now),
+            )
+        return QueuedOperation(seq=cursor.lastrowid, kind=kind, token=token, enqueued_at=now, updated_at=now)
+
+    def update(
+        self,
+        seq: int,
+        state: OperationState,
+        attempts: int,
+        last_error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of an attempt."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE operations SET state = ?, attempts = ?, updated_at = ?, last_error = ? WHERE seq = ?",
+                (OperationState(state).value, attempts, time.time(), last_error, seq),
+            )
+
+    def operations(
+        self,
+        state: Optional[OperationState] = None,
+        token: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[QueuedOperation]:
+        """Return operations, oldest first, optionally filtered by state and token."""
+        query = f"SELECT {self._COLUMNS} FROM operations"
+        conditions, params = [], []
+        if state is not None:
+            conditions.append("state = ?")
+            params.append(OperationState(state).value)
+        if token is not None:
+            conditions.append("token = ?")
+            params.append(token)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY seq"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [self._operation(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of operations in each state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM operations GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in OperationState}
+        counts.update(rows)
+        return counts
+
+    def purge(self, older_than: float = 0.0) -> int:
+        """
+        Delete the operations done more than `older_than` seconds ago.
+
+        Returns:
+            Number of operations deleted
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM operations WHERE state = ? AND updated_at <= ?",
+                (OperationState.DONE.value, time.time() - older_than),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def is_transient(error: Exception) -> bool:
+    """Tell whether a failed operation is worth trying again later."""
+    if not isinstance(error, PassCultureAPIError):
+        return False
+    status_code = error.status_code
+    return status_code is None or status_code in (408, 429) or status_code >= 500
+
+
+class WriteBehindQueue:
+    """
+    Write-behind mode for booking state changes, for check-in gates.
+
+    `validate_booking`, `revert_validation` and `delete_booking` return as
+    soon as the operation is committed to the journal, and a background
+    worker sends them to the API: at most `concurrency` at a time, in order
+    for a given token, and again with exponential backoff after transient
+    errors (network errors, 429 and 5xx responses, once the client's own
+    retries are exhausted). Operations rejected by the API are marked
+    failed. When an earlier attempt may have reached the API, as after a
+    timeout or a crash between a request and its journal update, a
+    rejection is checked against the booking first: the operation is done
+    if the booking is in the expected state already. A first attempt is
+    never reconciled that way, so that a ticket scanned at two gates shows
+    up as failed on the second one.
+
+    The worker commits its journal updates from a thread, so that their
+    fsyncs don't block the event loop.
+
+    Pending operations left in the journal by a previous run are replayed
+    when the worker starts. The journal can be inspected with `pending`,
+    `failed` and `stats`.
+    """
+
+    def __init__(
+        self,
+        client: "PassCultureClient",
+        journal: Optional[SQLiteJournal] = None,
+        concurrency: int = 4,
+        max_attempts: int = 8,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            client: Client sending the operations
+            journal: Journal of the operations, a `write_behind.sqlite3` file by default
+            concurrency: Maximum number of operations in flight
+            max_attempts: Attempts of an operation before it is marked failed
+            base_delay: Backoff before the second attempt, in seconds, before jitter
+            max_delay: Upper bound of the backoff, in seconds, before jitter
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.client = client
+        self.journal = journal or SQLiteJournal()
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sent = 0
+        self.failures = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._busy: Set[str] = set()
+
+    # Local acknowledgement
+
+    def enqueue(self, kind: OperationKind, token: str) -> QueuedOperation:
+        """
+        Record an operation in the journal and wake the worker up.
+
+        Safe to call from any thread.
+        """
+        operation = self.journal.append(kind, token)
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return operation
+
+    def validate_booking(self, token: str) -> QueuedOperation:
+        """Queue the validation of a booking."""
+        return self.enqueue(OperationKind.VALIDATE, token)
+
+    def revert_validation(self, token: str) -> QueuedOperation:
+        """Queue the revert of a booking validation."""
+        return self.enqueue(OperationKind.REVERT, token)
+
+    def delete_booking(self, token: str) -> QueuedOperation:
+        """Queue the cancellation of a booking."""
+        return self.enqueue(OperationKind.CANCEL, token)
+
+    # Inspection
+
+    def pending(self, limit: Optional[int] = None) -> List[QueuedOperation]:
+        """Return the operations not sent successfully yet, oldest first."""
+        return self.journal.operations(OperationState.PENDING, limit=limit)
+
+    def failed(self, limit: Optional[int] = None) -> List[QueuedOperation]:
+        """Return the operations given up on, oldest first."""
+        return self.journal.operations(OperationState.FAILED, limit=limit)
+
+    def stats(self) -> dict:
+        """Return the journal counts by state and the worker's counters."""
+        return {**self.journal.counts(), "in_flight": len(self._tasks), "sent": self.sent, "failures": self.failures}
+
+    # Worker
+
+    def start(self) -> None:
+        """Start the worker on the running event loop, replaying the pending operations."""
+        if self._worker is not None and not self._worker.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker.
+
+        Args:
+            drain: Wait for the pending operations to be sent first
+            timeout: Maximum time to wait for them, in seconds
+        """
+        if self._worker is None:
+            return
+        if drain:
+            try:
+                await asyncio.wait_for(self.flush(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._worker.cancel()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(self._worker, *tasks, return_exceptions=True)
+        self._worker = self._loop = None
+
+    async def flush(self) -> None:
+        """Wait until every pending operation is either done or failed."""
+        while (await self._journal(self.journal.counts))[OperationState.PENDING.value]:
+            if self._worker is None or self._worker.done():
+                raise RuntimeError("The write-behind worker is not running")
+            if self._tasks:
+                await asyncio.wait(list(self._tasks.values()))
+            else:
+                await asyncio.sleep(0.01)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Start the oldest pending operation of each idle token. The window
+            # covers the operations in progress, plus enough to keep the
+            # concurrency slots busy.
+            window = len(self._tasks) + 8 * self.concurrency
+            blocked = set(self._busy)
+            for operation in await self._journal(self.journal.operations, OperationState.PENDING, limit=window):
+                if operation.token in blocked:
+                    continue
+                blocked.add(operation.token)
+                self._busy.add(operation.token)
+                self._tasks[operation.seq] = asyncio.ensure_future(self._process(operation))
+
+    async def _process(self, operation: QueuedOperation) -> None:
+        method_name, target = _OPERATIONS[operation.kind]
+        method = getattr(self.client.bookings, method_name)
+        attempts = operation.attempts
+        try:
+            while True:
+                async with self._semaphore:
+                    attempts += 1
+                    # Count the attempt before sending it, so that a replay
+                    # after a crash knows the request may have been applied.
+                    await self._journal(self.journal.update, operation.seq, OperationState.PENDING, attempts)
+                    try:
+                        await method(operation.token)
+                    except Exception as e:
+                        error = e
+                    else:
+                        await self._journal(self.journal.update, operation.seq, OperationState.DONE, attempts)
+                        self.sent += 1
+                        return
+                if not is_transient(error):
+                    if attempts > 1 and await self._already_applied(operation.token, target):
+                        await self._journal(self.journal.update, operation.seq, OperationState.DONE, attempts)
+                        return
+                    await self._fail(operation, attempts, error)
+                    return
+                if attempts >= self.max_attempts:
+                    await self._fail(operation, attempts, error)
+                    return
+                await self._journal(self.journal.update, operation.seq, OperationState.PENDING, attempts, str(error))
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+        finally:
+            del self._tasks[operation.seq]
+            self._busy.discard(operation.token)
+            self._wakeup.set()
+
+    async def _journal(self, method, *args, **kwargs):
+        """Run a journal method in a thread."""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    async def _fail(self, operation: QueuedOperation, attempts: int, error: Exception) -> None:
+        await self._journal(self.journal.update, operation.seq, OperationState.FAILED, attempts, str(error))
+        self.failures += 1
+
+    async def _already_applied(self, token: str, target: BookingStatus) -> bool:
+        try:
+            booking = await self.client.bookings.get_booking(token)
+        except Exception:
+            return False
+        status = booking["status"] if isinstance(booking, dict) else booking.status
+        return status == target
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
@@ -0,0 +1,69 @@
+from typing import Optional
+
+import httpx
+import pytest
+
+from pass_culture.client import PassCultureClient
+from pass_culture.models.AccessibilityInfo import AccessibilityInfo
+from pass_culture.models.CategoryRelatedFields import CategoryRelatedFields
+from pass_culture.models.LocationInfo import LocationInfo
+from pass_culture.retry import RetryPolicy
+from tests.mock_server import MockPassCultureServer
+
+
+@pytest.fixture
+def server() -> MockPassCultureServer:
+    return MockPassCultureServer(offers=3, bookings_per_offer=20, page_size=5)
+
+
+@pytest.fixture
+async def make_client(server):
+    """Build clients bound to the mock server, closed at teardown."""
+    http_clients = []
+
+    def make(transport: Optional[httpx.AsyncBaseTransport] = None, **options) -> PassCultureClient:
+        http_client = httpx.AsyncClient(
+            base_url="http://mock.passculture", transport=transport or server.transport()
+        )
+        http_clients.append(http_client)
+        options.setdefault("api_key", "test")
+        options.setdefault("retry_policy", RetryPolicy(base_delay=0.001, max_delay=0.01))
+        return PassCultureClient(api_endpoint="http://mock.passculture", http_client=http_client, **options)
+
+    yield make
+    for http_client in http_clients:
+        await http_client.aclose()
+
+
+@pytest.fixture
+def client(make_client) -> PassCultureClient:
+    return make_client()
+
+
+def failing_first(server: MockPassCultureServer, *responses: httpx.Response) -> httpx.MockTransport:
+    """Transport answering with `responses` first, then serving from the mock."""
+    queue = list(responses)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if queue:
+            return queue.pop(0)
+        return await server.handle(request)
+
+    return httpx.MockTransport(handle)
+
+
+def offer_fields(name: str = "Concert", **fields) -> dict:
+    """Arguments of `create_event_offer` for an event offer of the mock's venue."""
+    return dict(
+        accessibility=AccessibilityInfo(
+            audioDisabilityCompliant=True,
+            mentalDisabilityCompliant=True,
+            motorDisabilityCompliant=True,
+            visualDisabilityCompliant=True,
+        ),
+        categoryRelatedField=CategoryRelatedFields(category="CONCERT", speaker="Camille"),
+        hasTicket=False,
+        location=LocationInfo(type="physical", venueId=1),
+        name=name,
+        **fields,
+    )
@@ -0,0 +1,327 @@
+import asyncio
+import random
+import re
+from collections import Counter
+from typing import Dict, Optional, Tuple, Union
+
+import httpx
+
+from pass_culture.decoding import loads
+from pass_culture.models.EventOffers import EVENT_OFFER_RESPONSE_KEYS
+
+
+BASE36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def booking_token(booking_id: int) -> str:
+    """Return the 6-character token of a mock booking."""
+    token = ""
+    for _ in range(6):
+        booking_id, digit = divmod(booking_id, 36)
+        token = BASE36[digit] + token
+    return token
+
+
+def booking_id_from_token(token: str) -> Optional[int]:
+    """Return the ID of a mock booking from its token, or None if the token is malformed."""
+    try:
+        return int(token, 36)
+    except ValueError:
+        return None
+
+
+class MockPassCultureServer:
+    """
+    In-process mock of the Pass Culture API routes used by the endpoints.
+
+    Requests are served through an `httpx.MockTransport`, with a configurable
+    latency, error rate, 429 injection and payload size. Bookings are generated
+    on the fly from their ID, so that large offers don't cost memory; only
+    state changes (validations, cancellations) and created resources are
+    stored. Responses follow the shapes expected by the wrapper's models.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.05,
+        offers: int = 10,
+        bookings_per_offer: int = 1000,
+        page_size: int = 100,
+        record_padding: int = 0,
+        venue_id: int = 1,
+        seed: Optional[int] = 0,
+    ):
+        """
+        Initialize the mock server.
+
+        Args:
+            latency: Response delay in seconds, or a (min, max) range drawn uniformly
+            error_rate: Fraction of requests answered with a 503
+            throttle_rate: Fraction of requests answered with a 429
+            retry_after: Retry-After value sent with 429 responses, in seconds
+            offers: Number of event offers of the venue
+            bookings_per_offer: Number of bookings of each offer
+            page_size: Number of bookings per page of the bookings list
+            record_padding: Extra characters added to every booking, to inflate payloads
+            venue_id: ID of the venue owning the offers
+            seed: Seed of the random generator, None for a random one
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.bookings_per_offer = bookings_per_offer
+        self.page_size = page_size
+        self.padding = "x" * record_padding
+        self.venue_id = venue_id
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.statuses: Dict[int, str] = {}
+        self.offers: Dict[int, dict] = {offer_id: self._make_offer(offer_id) for offer_id in range(1, offers + 1)}
+        self.price_categories: Dict[int, Dict[int, dict]] = {
+            offer_id: {offer_id * 10: {"id": offer_id * 10, "idAtProvider": None, "label": "Tarif plein", "price": 1500}}
+            for offer_id in self.offers
+        }
+        self._routes = [
+            ("GET", re.compile(r"^/bookings/v1/bookings$"), self._list_bookings),
+            ("GET", re.compile(r"^/bookings/v1/token/(\w+)$"), self._get_booking),
+            ("PATCH", re.compile(r"^/bookings/v1/(use|keep|cancel)/token/(\w+)$"), self._change_booking),
+            ("GET", re.compile(r"^/offers/v1/events$"), self._list_offers),
+            ("POST", re.compile(r"^/offers/v1/events$"), self._create_offer),
+            ("PATCH", re.compile(r"^/offers/v1/events$"), self._update_offer),
+            ("PATCH", re.compile(r"^/offers/v1/events/(\d+)$"), self._patch_offer),
+            ("GET", re.compile(r"^/offers/v1/events/(\d+)$"), self._get_offer),
+            ("GET", re.compile(r"^/offers/v1/events/(\d+)/price_categories$"), self._list_price_categories),
+            ("POST", re.compile(r"^/offers/v1/events/(\d+)/price_categories$"), self._create_price_categories),
+            (
+                "PUT",
+                re.compile(r"^/offers/v1/events/(\d+)/price_categories/(\d+)$"),
+                self._update_price_category,
+            ),
+        ]
+
+    def transport(self) -> httpx.MockTransport:
+        """Return an httpx transport serving requests from this mock."""
+        return httpx.MockTransport(self.handle)
+
+    def http_client(self, base_url: str = "http://mock.passculture") -> httpx.AsyncClient:
+        """Return an HTTP client bound to this mock, to pass to `PassCultureClient`."""
+        return httpx.AsyncClient(base_url=base_url, transport=self.transport())
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Serve a request."""
+        delay = self.latency
+        if isinstance(delay, tuple):
+            delay = self.random.uniform(*delay)
+        if delay:
+            await asyncio.sleep(delay)
+
+        for method, pattern, handler in self._routes:
+            match = pattern.match(request.url.path)
+            if match and request.method == method:
+                break
+        else:
+            return httpx.Response(404, json={"global": ["Route not found"]})
+
+        self.requests[handler.__name__.lstrip("_")] += 1
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)})
+        if self.error_rate and self.random.random() < self.error_rate:
+            return httpx.Response(503, json={"global": ["Service unavailable"]})
+        content = await request.aread()
+        body = loads(content) if content else None
+        return handler(request, body, *match.groups())
+
+    # Bookings
+
+    def _booking_status(self, booking_id: int) -> str:
+        return self.statuses.get(booking_id, "CONFIRMED")
+
+    def _offer_of(self, booking_id: int) -> int:
+        return (booking_id - 1) // self.bookings_per_offer + 1
+
+    def _make_booking(self, booking_id: int) -> dict:
+        offer_id = self._offer_of(booking_id)
+        return {
+            "confirmationDate": "2024-05-01T10:00:00Z",
+            "creationDate": "2024-04-28T09:12:44Z",
+            "id": booking_id,
+            "offerEan": None,
+            "offerId": offer_id,
+            "offerName": f"Offer {offer_id}",
+            "price": 15.0,
+            "priceCategoryId": offer_id * 10,
+            "priceCategoryLabel": "Tarif plein",
+            "quantity": 1,
+            "status": self._booking_status(booking_id),
+            "stockId": offer_id * 100,
+            "token": booking_token(booking_id),
+            "userBirthDate": "2006-02-14",
+            "userEmail": f"user{booking_id}@example.com",
+            "userFirstName": "Camille",
+            "userLastName": "Martin",
+            "userPhoneNumber": "+33600000000",
+            "userPostalCode": "75011",
+            "venueAddress": "1 rue de la Paix, Paris" + self.padding,
+            "venueDepartementCode": "75",
+            "venueId": self.venue_id,
+            "venueName": "La Salle",
+        }
+
+    def _list_bookings(self, request: httpx.Request, body, *args) -> httpx.Response:
+        params = request.url.params
+        offer_id = int(params["offerId"])
+        if offer_id not in self.offers:
+            return httpx.Response(404, json={"offerId": ["Offer not found"]})
+        first_id = (offer_id - 1) * self.bookings_per_offer + 1
+        ids = range(first_id, first_id + self.bookings_per_offer)
+        status = params.get("status")
+        if status:
+            ids = [i for i in ids if self._booking_status(i) == status]
+        start = int(params.get("firstIndex", 1)) - 1
+        page = ids[max(start, 0) : max(start, 0) + self.page_size]
+        return httpx.Response(200, json={"data": [self._make_booking(i) for i in page]})
+
+    def _find_booking(self, token: str) -> Optional[int]:
+        booking_id = booking_id_from_token(token)
+        if booking_id is None or not 1 <= booking_id <= len(self.offers) * self.bookings_per_offer:
+            return None
+        return booking_id
+
+    def _get_booking(self, request: httpx.Request, body, token: str) -> httpx.Response:
+        booking_id = self._find_booking(token)
+        if booking_id is None:
+            return httpx.Response(404, json={"global": ["This countermark cannot be found"]})
+        return httpx.Response(200, json=self._make_booking(booking_id))
+
+    def _change_booking(self, request: httpx.Request, body, action: str, token: str) -> httpx.Response:
+        booking_id = self._find_booking(token)
+        if booking_id is None:
+            return httpx.Response(404, json={"global": ["This countermark cannot be found"]})
+        status = self._booking_status(booking_id)
+        expected, target = {
+            "use": ("CONFIRMED", "USED"),
+            "keep": ("USED", "CONFIRMED"),
+            "cancel": ("CONFIRMED", "CANCELLED"),
+        }[action]
+        if status != expected:
+            return httpx.Response(410, json={"booking": [f"This booking is {status.lower()}"]})
+        self.statuses[booking_id] = target
+        return httpx.Response(204)
+
+    # Event offers
+
+    def _make_offer(self, offer_id: int, id_at_provider: Optional[str] = None) -> dict:
+        return {
+            "accessibility": {
+                "audioDisabilityCompliant": True,
+                "mentalDisabilityCompliant": True,
+                "motorDisabilityCompliant": True,
+                "visualDisabilityCompliant": True,
+            },
+            "bookingAllowedDatetime": "2024-01-01T00:00:00Z",
+            "bookingContact": None,
+            "bookingEmail": None,
+            "categoryRelatedFields": {"category": "CONCERT"},
+            "description": None,
+            "enableDoubleBookings": True,
+            "eventDuration": 90,
+            "externalTicketOfficeUrl": None,
+            "hasTicket": False,
+            "id": offer_id,
+            "idAtProvider": id_at_provider or f"provider-{offer_id}",
+            "itemCollectionDetails": None,
+            "location": {"type": "physical", "venueId": self.venue_id},
+            "name": f"Offer {offer_id}",
+            "priceCategories": [],
+            "publicationDatetime": "2024-01-01T00:00:00Z",
+            "status": "ACTIVE",
+        }
+
+    def _apply_offer_body(self, offer: dict, body: dict) -> None:
+        for key, value in body.items():
+            key = EVENT_OFFER_RESPONSE_KEYS.get(key, key)
+            if key in offer and key != "priceCategories":
+                offer[key] = value
+
+    def _message(self, msg: str, **ctx) -> httpx.Response:
+        return httpx.Response(200, json={"ctx": ctx, "loc": [], "msg": msg, "type": "success"})
+
+    def _list_offers(self, request: httpx.Request, body, *args) -> httpx.Response:
+        params = request.url.params
+        offers = list(self.offers.values())
+        ids_at_provider = params.get("idsAtProvider")
+        if ids_at_provider:
+            wanted = set(ids_at_provider.split(","))
+            offers = [offer for offer in offers if offer["idAtProvider"] in wanted]
+        limit = int(params.get("limit") or 50)
+        start = int(params.get("firstIndex", 1)) - 1
+        pages = -(-len(offers) // limit)
+        return httpx.Response(
+            200,
+            json={
+                "events": offers[start : start + limit],
+                "pagination": {"total": len(offers), "page": start // limit + 1, "limit": limit, "pages": pages},
+            },
+        )
+
+    def _get_offer(self, request: httpx.Request, body, offer_id: str) -> httpx.Response:
+        offer = self.offers.get(int(offer_id))
+        if offer is None:
+            return httpx.Response(404, json={"global": ["Offer not found"]})
+        return httpx.Response(200, json=offer)
+
+    def _create_offer(self, request: httpx.Request, body, *args) -> httpx.Response:
+        offer_id = max(self.offers, default=0) + 1
+        offer = self._make_offer(offer_id, body.get("idAtProvider"))
+        self._apply_offer_body(offer, {key: value for key, value in body.items() if value is not None})
+        self.offers[offer_id] = offer
+        self.price_categories[offer_id] = {}
+        return self._message("Offer created")
+
+    def _update_offer(self, request: httpx.Request, body, *args) -> httpx.Response:
+        for offer in self.offers.values():
+            if offer["idAtProvider"] == body.get("idAtProvider"):
+                return self._patch_offer(request, body, offer["id"])
+        return httpx.Response(404, json={"global": ["Offer not found"]})
+
+    def _patch_offer(self, request: httpx.Request, body, offer_id) -> httpx.Response:
+        offer = self.offers.get(int(offer_id))
+        if offer is None:
+            return httpx.Response(404, json={"global": ["Offer not found"]})
+        self._apply_offer_body(offer, body)
+        return self._message("Offer updated")
+
+    # Price categories
+
+    def _list_price_categories(self, request: httpx.Request, body, offer_id: str) -> httpx.Response:
+        categories = self.price_categories.get(int(offer_id))
+        if categories is None:
+            return httpx.Response(404, json={"global": ["Offer not found"]})
+        categories = list(categories.values())
+        ids_at_provider = request.url.params.get("idsAtProvider")
+        if ids_at_provider:
+            wanted = set(ids_at_provider.split(","))
+            categories = [category for category in categories if category["idAtProvider"] in wanted]
+        return httpx.Response(200, json={"data": categories})
+
+    def _create_price_categories(self, request: httpx.Request, body, offer_id: str) -> httpx.Response:
+        categories = self.price_categories.get(int(offer_id))
+        if categories is None:
+            return httpx.Response(404, json={"global": ["Offer not found"]})
+        for category in body.get("priceCategories", []):
+            category_id = max(categories, default=int(offer_id) * 10) + 1
+            categories[category_id] = dict({"idAtProvider": None}, **category, id=category_id)
+        return self._message("Price categories created")
+
+    def _update_price_category(
+        self, request: httpx.Request, body, offer_id: str, category_id: str
+    ) -> httpx.Response:
+        category = self.price_categories.get(int(offer_id), {}).get(int(category_id))
+        if category is None:
+            return httpx.Response(404, json={"global": ["Price category not found"]})
+        category.update({key: value for key, value in body.items() if key != "id"})
+        return self._message("Price category updated")
@@ -0,0 +1,43 @@
+import os
+
+import httpx
+
+from pass_culture.blocking import BackgroundLoop, SyncPassCultureClient
+
+
+def test_sync_client_mirrors_the_async_client(server):
+    loop = BackgroundLoop()
+    http_client = httpx.AsyncClient(base_url="http://mock.passculture", transport=server.transport())
+    with SyncPassCultureClient(
+        api_key="test", api_endpoint="http://mock.passculture", http_client=http_client, loop=loop
+    ) as client:
+        assert len(list(client.bookings.iter_bookings(offerId=1))) == 20
+        booking = client.bookings.list_bookings(offerId=1).bookings[0]
+        tokens = [booking.token] * 3
+        assert [b.id for b in client.map(client.bookings.get_booking, tokens)] == [booking.id] * 3
+    loop.stop()
+
+
+def test_sync_client_is_rebuilt_after_a_fork(server, monkeypatch):
+    loop = BackgroundLoop()
+    http_client = httpx.AsyncClient(base_url="http://mock.passculture", transport=server.transport())
+    client = SyncPassCultureClient(
+        api_key="test", api_endpoint="http://mock.passculture", http_client=http_client, loop=loop
+    )
+    bookings = client.bookings
+    parent_client, parent_loop = client.async_client, loop.loop
+    assert bookings.list_bookings(offerId=1).bookings
+
+    # The child of a fork sees a new process ID.
+    pid = os.getpid()
+    monkeypatch.setattr(os, "getpid", lambda: pid + 1)
+
+    assert bookings.list_bookings(offerId=1).bookings
+    assert client.async_client is not parent_client
+    assert client.async_client.settings.api_key == "test"
+    assert loop.loop is not parent_loop
+    assert client.map(bookings.list_bookings, [1])[0].bookings
+
+    monkeypatch.undo()
+    client.close()
+    loop.stop()
@@ -0,0 +1,86 @@
+from pass_culture.booking_sync import BookingChangeType, BookingSyncEngine, SQLiteBookingStore
+from pass_culture.models.bookings import BookingStatus
+from tests.mock_server import MockPassCultureServer, booking_token
+
+
+async def sync(engine, offer_id=1):
+    return [change async for change in engine.sync(offer_id)]
+
+
+async def test_first_sync_inserts_every_booking(tmp_path, client):
+    with SQLiteBookingStore(str(tmp_path / "bookings.sqlite3")) as store:
+        changes = await sync(BookingSyncEngine(client, store))
+
+        assert len(changes) == 20
+        assert {change.type for change in changes} == {BookingChangeType.INSERTED}
+        assert await sync(BookingSyncEngine(client, store)) == []
+
+
+async def test_resumes_after_new_bookings(tmp_path, server, client):
+    with SQLiteBookingStore(str(tmp_path / "bookings.sqlite3")) as store:
+        engine = BookingSyncEngine(client, store)
+        await sync(engine)
+        server.bookings_per_offer = 22
+        requests = server.requests["list_bookings"]
+
+        changes = await sync(engine)
+
+        assert [change.booking.id for change in changes] == [21, 22]
+        # The full list resumed after the last seen booking instead of starting over.
+        assert server.requests["list_bookings"] - requests < 8
+
+
+async def test_status_change_of_an_older_booking(tmp_path, client):
+    with SQLiteBookingStore(str(tmp_path / "bookings.sqlite3")) as store:
+        engine = BookingSyncEngine(client, store)
+        await sync(engine)
+        await client.bookings.delete_booking(booking_token(10))
+        assert [change.booking.id for change in await sync(engine)] == [10]
+
+        # Booking 3 now comes before booking 10 in the list of cancelled bookings.
+        await client.bookings.delete_booking(booking_token(3))
+        changes = await sync(engine)
+
+        assert [(change.type, change.booking.id) for change in changes] == [(BookingChangeType.CANCELLED, 3)]
+        assert changes[0].previous_status == BookingStatus.CONFIRMED
+        statuses = {booking.id: booking.status for booking in store.bookings(1)}
+        assert statuses[3] == statuses[10] == BookingStatus.CANCELLED
+
+
+async def test_validated_bookings_are_detected(tmp_path, client):
+    with SQLiteBookingStore(str(tmp_path / "bookings.sqlite3")) as store:
+        engine = BookingSyncEngine(client, store)
+        await sync(engine)
+        await client.bookings.validate_booking(booking_token(5))
+
+        changes = await sync(engine)
+
+        assert [(change.type, change.booking.id) for change in changes] == [(BookingChangeType.CHANGED, 5)]
+        assert [booking.id for booking in store.bookings(1, BookingStatus.USED)] == [5]
+
+
+async def test_incremental_sync_cost_follows_the_changes(tmp_path, make_client):
+    server = MockPassCultureServer(offers=1, bookings_per_offer=500, page_size=10)
+    server.statuses.update({booking_id: "USED" for booking_id in range(1, 301)})
+    client = make_client(server.transport())
+    with SQLiteBookingStore(str(tmp_path / "bookings.sqlite3")) as store:
+        engine = BookingSyncEngine(client, store)
+        await sync(engine)
+        requests = sum(server.requests.values())
+        assert await sync(engine) == []
+        assert sum(server.requests.values()) - requests <= 5
+
+        await client.bookings.delete_booking(booking_token(420))
+        await client.bookings.validate_booking(booking_token(450))
+        await client.bookings.revert_validation(booking_token(120))
+        requests = sum(server.requests.values())
+        changes = await sync(engine)
+
+        assert sorted((change.booking.id, change.booking.status) for change in changes) == [
+            (120, BookingStatus.CONFIRMED),
+            (420, BookingStatus.CANCELLED),
+            (450, BookingStatus.USED),
+        ]
+        # A full rescan of the three lists takes more than 80 requests.
+        assert sum(server.requests.values()) - requests <= 20
+        assert await sync(engine) == []
@@ -0,0 +1,100 @@
+from pass_culture.models.bookings import BookingStatus
+from pass_culture.parsing import ResponseMode
+from tests.mock_server import booking_token
+
+
+async def test_iter_bookings_follows_pages(server, client):
+    ids = [booking.id async for booking in client.bookings.iter_bookings(2)]
+
+    assert ids == list(range(21, 41))
+    # Four full pages of five bookings, then the empty page ending the iteration.
+    assert server.requests["list_bookings"] == 5
+
+
+async def test_iter_bookings_filters_by_status(server, client):
+    for booking_id in (3, 7):
+        server.statuses[booking_id] = "USED"
+
+    bookings = [b async for b in client.bookings.iter_bookings(1, status=BookingStatus.USED)]
+
+    assert [booking.id for booking in bookings] == [3, 7]
+    assert all(booking.status == BookingStatus.USED for booking in bookings)
+
+
+async def test_iter_booking_pages_raw(client):
+    pages = [page async for page in client.bookings.iter_booking_pages(1, response_mode=ResponseMode.RAW)]
+
+    assert [len(page["data"]) for page in pages] == [5, 5, 5, 5]
+    assert pages[0]["data"][0]["token"] == booking_token(1)
+
+
+async def test_iter_bookings_stops_early(server, client):
+    async for booking in client.bookings.iter_bookings(1):
+        if booking.id == 2:
+            break
+
+    # The first page and at most its prefetched successor were requested.
+    assert server.requests["list_bookings"] <= 2
+
+
+async def test_validate_bookings_reports_per_token(server, client):
+    server.statuses[2] = "CANCELLED"
+    tokens = [booking_token(1), booking_token(2), booking_token(1), "UNKNOWN"]
+
+    results = await client.bookings.validate_bookings(tokens)
+
+    assert set(results) == {booking_token(1), booking_token(2), "UNKNOWN"}
+    assert results[booking_token(1)].success
+    assert not results[booking_token(2)].success
+    assert not results["UNKNOWN"].success
+    assert server.statuses[1] == "USED"
+    assert server.requests["change_booking"] == 3
+
+
+async def test_validate_bookings_reuses_recent_success(server, client):
+    token = booking_token(1)
+    await client.bookings.validate_bookings([token])
+
+    results = await client.bookings.validate_bookings([token])
+
+    assert results[token].success
+    assert results[token].deduplicated
+    assert server.requests["change_booking"] == 1
+
+
+async def test_validate_bookings_reports_api_errors(server, client):
+    server.statuses[1] = "USED"
+
+    result = (await client.bookings.validate_bookings([booking_token(1)]))[booking_token(1)]
+
+    assert not result.success
+    assert result.status_code == 410
+    assert result.errors == {"booking": ["This booking is used"]}
+
+
+async def test_validate_bookings_expired_entry_not_reused(server, client):
+    first, second = booking_token(1), booking_token(2)
+    await client.bookings.validate_bookings([first], dedup_window=60)
+    await client.bookings.validate_bookings([second], dedup_window=0)
+    await client.bookings.revert_validation(second)
+
+    # The entry of the second token expired, although it sits behind a live one.
+    results = await client.bookings.validate_bookings([second])
+
+    assert results[second].success
+    assert not results[second].deduplicated
+    assert server.statuses[2] == "USED"
+    assert server.requests["change_booking"] == 4
+
+
+async def test_validate_bookings_after_revert_calls_the_api(server, client):
+    token = booking_token(1)
+    await client.bookings.validate_bookings([token])
+    await client.bookings.revert_validation(token)
+
+    results = await client.bookings.validate_bookings([token])
+
+    assert results[token].success
+    assert not results[token].deduplicated
+    assert server.statuses[1] == "USED"
+    assert server.requests["change_booking"] == 3
@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pass_culture.cache import ResponseCache
+from pass_culture.exceptions import PassCultureAPIError, RateLimitError
+from pass_culture.parsing import ResponseMode
+from pass_culture.ratelimit import TokenBucketLimiter
+from pass_culture.retry import RetryPolicy
+from tests.conftest import failing_first
+from tests.mock_server import booking_token
+
+
+def unavailable() -> httpx.Response:
+    return httpx.Response(503, json={"global": ["Service unavailable"]})
+
+
+def throttled() -> httpx.Response:
+    return httpx.Response(429, headers={"Retry-After": "0.01"})
+
+
+async def test_get_retried_on_transient_errors(server, make_client):
+    client = make_client(failing_first(server, unavailable(), unavailable()))
+
+    booking = await client.bookings.get_booking(booking_token(1))
+
+    assert booking.id == 1
+    assert server.requests["get_booking"] == 1
+
+
+async def test_get_gives_up_after_max_attempts(server, make_client):
+    client = make_client(
+        failing_first(server, *[unavailable() for _ in range(3)]),
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001),
+    )
+
+    with pytest.raises(PassCultureAPIError) as excinfo:
+        await client.bookings.get_booking(booking_token(1))
+    assert excinfo.value.status_code == 503
+    assert server.requests["get_booking"] == 0
+
+
+async def test_non_idempotent_request_not_retried_on_5xx(server, make_client):
+    client = make_client(failing_first(server, unavailable()))
+
+    with pytest.raises(PassCultureAPIError) as excinfo:
+        await client.request("POST", "offers/v1/events", json_data={"name": "Concert"})
+    assert excinfo.value.status_code == 503
+    assert server.requests["create_offer"] == 0
+
+
+async def test_throttled_without_limiter_raises(server, make_client):
+    client = make_client(failing_first(server, throttled()))
+
+    with pytest.raises(RateLimitError) as excinfo:
+        await client.bookings.get_booking(booking_token(1))
+    assert excinfo.value.retry_after == pytest.approx(0.01)
+
+
+async def test_throttled_with_limiter_waits_and_retries(server, make_client):
+    limiter = TokenBucketLimiter(rate=100, max_wait=5)
+    client = make_client(failing_first(server, throttled(), throttled()), rate_limiter=limiter)
+
+    booking = await client.bookings.get_booking(booking_token(1))
+
+    assert booking.id == 1
+    assert limiter.throttled == 2
+    assert limiter.rate < limiter.max_rate
+
+
+async def test_cache_serves_repeated_reads(server, make_client):
+    client = make_client(cache=ResponseCache())
+
+    await client.bookings.get_booking(booking_token(1))
+    await client.bookings.get_booking(booking_token(1))
+
+    assert server.requests["get_booking"] == 1
+    assert client.cache.hits == 1
+
+
+async def test_coalesced_raw_reads_are_not_shared(server, make_client):
+    client = make_client(response_mode=ResponseMode.RAW)
+
+    first, second = await asyncio.gather(
+        client.bookings.get_booking(booking_token(1)),
+        client.bookings.get_booking(booking_token(1)),
+    )
+    first["id"] = 0
+
+    assert server.requests["get_booking"] == 1
+    assert client.singleflight.shared == 1
+    assert second["id"] == 1
+
+
+async def test_cache_invalidated_by_booking_change(server, make_client):
+    client = make_client(cache=ResponseCache())
+    token = booking_token(1)
+
+    assert (await client.bookings.get_booking(token)).status == "CONFIRMED"
+    await client.bookings.validate_booking(token)
+
+    assert (await client.bookings.get_booking(token)).status == "USED"
+    assert server.requests["get_booking"] == 2
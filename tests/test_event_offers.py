@@ -0,0 +1,52 @@
+from pass_culture.cache import ResponseCache
+from pass_culture.parsing import ResponseMode
+from tests.conftest import offer_fields
+
+
+async def test_update_invalidates_cached_offer(server, make_client):
+    client = make_client(cache=ResponseCache())
+    assert (await client.event_offers.get_event_offer(1)).name == "Offer 1"
+
+    await client.event_offers.update_event_offer(**offer_fields("RENAMED", idAtProvider="provider-1"))
+
+    assert (await client.event_offers.get_event_offer(1)).name == "RENAMED"
+    assert server.requests["get_offer"] == 2
+
+
+async def test_patch_invalidates_cached_offer(server, make_client):
+    client = make_client(cache=ResponseCache())
+    await client.event_offers.get_event_offer(2)
+
+    await client.event_offers.patch_event_offer(2, {"name": "Patched"})
+
+    assert (await client.event_offers.get_event_offer(2)).name == "Patched"
+
+
+async def test_raw_responses_do_not_share_cached_data(make_client):
+    client = make_client(cache=ResponseCache())
+    offer = await client.event_offers.get_event_offer(1, response_mode=ResponseMode.RAW)
+    offer["name"] = "Altered"
+
+    again = await client.event_offers.get_event_offer(1, response_mode=ResponseMode.RAW)
+
+    assert again["name"] == "Offer 1"
+    assert client.cache.hits == 1
+
+
+async def test_iter_event_offers_follows_pages(server, client):
+    for offer_id in range(4, 8):
+        server.offers[offer_id] = server._make_offer(offer_id)
+
+    offers = [offer async for offer in client.event_offers.iter_event_offers(1, limit=3)]
+
+    assert [offer.id for offer in offers] == list(range(1, 8))
+
+
+async def test_iter_event_offers_without_limit_uses_the_api_page_size(server, client):
+    for offer_id in range(4, 61):
+        server.offers[offer_id] = server._make_offer(offer_id)
+
+    offers = [offer async for offer in client.event_offers.iter_event_offers(1, limit=None)]
+
+    assert [offer.id for offer in offers] == list(range(1, 61))
+    assert server.requests["list_offers"] == 2
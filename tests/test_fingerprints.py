@@ -0,0 +1,49 @@
+import pytest
+
+from pass_culture.fingerprints import FingerprintStore, MemoryFingerprintStore, fingerprint
+from pass_culture.models.PriceCategory import PriceCategory
+from tests.conftest import offer_fields
+
+
+def test_fingerprint_is_canonical():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_store_interface_is_abstract():
+    class Incomplete(FingerprintStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_unchanged_update_is_skipped(server, make_client):
+    events = []
+    client = make_client(
+        fingerprint_store=MemoryFingerprintStore(), hooks=[lambda event, fields: events.append((event, fields))]
+    )
+    category = PriceCategory(label="Tarif plein", price=1800)
+
+    await client.price_categories.update_price_category(1, 10, category)
+    assert await client.price_categories.update_price_category(1, 10, category) is None
+    await client.price_categories.update_price_category(1, 10, category, force=True)
+
+    assert server.requests["update_price_category"] == 2
+    assert client.skipped_updates == 1
+    assert [fields for event, fields in events if event == "skip"] == [{"operation": "update_price_category"}]
+
+
+async def test_store_is_scoped_by_api_key(server, make_client):
+    store = MemoryFingerprintStore()
+    first = make_client(fingerprint_store=store, api_key="first")
+    second = make_client(fingerprint_store=store, api_key="second")
+    fields = offer_fields("RENAMED", idAtProvider="provider-1")
+
+    await first.event_offers.update_event_offer(**fields)
+    await second.event_offers.update_event_offer(**fields)
+
+    assert server.requests["update_offer"] == 2
+    assert first.skipped_updates == second.skipped_updates == 0
+    assert len(store) == 2
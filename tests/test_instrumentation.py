@@ -0,0 +1,45 @@
+import logging
+
+from pass_culture.instrumentation import MetricsCollector, route_of
+from tests.mock_server import booking_token
+
+
+def test_route_of():
+    assert route_of("offers/v1/events/12/price_categories/34") == "offers/v1/events/{id}/price_categories/{id}"
+    assert route_of("bookings/v1/use/token/ABC123") == "bookings/v1/use/token/{token}"
+
+
+async def test_events_name_the_operation(make_client):
+    events = []
+    client = make_client(hooks=[lambda event, fields: events.append((event, fields))])
+
+    async for _ in client.bookings.iter_bookings(1):
+        break
+    await client.bookings.get_booking(booking_token(1))
+
+    operations = [fields["operation"] for event, fields in events if event == "validate"]
+    assert set(operations) == {"list_bookings", "get_booking"}
+    requests = {fields["route"]: fields["status_code"] for event, fields in events if event == "request"}
+    assert requests == {"bookings/v1/bookings": 200, "bookings/v1/token/{token}": 200}
+
+
+async def test_failing_hook_does_not_fail_the_call(make_client, caplog):
+    def broken(event, fields):
+        raise RuntimeError("broken hook")
+
+    collector = MetricsCollector()
+    client = make_client(hooks=[broken, collector])
+
+    with caplog.at_level(logging.ERROR, logger="pass_culture.instrumentation"):
+        booking = await client.bookings.get_booking(booking_token(1))
+
+    assert booking.id == 1
+    assert "broken hook" in caplog.text
+    assert collector.counters[("requests_total", (("method", "GET"), ("route", "bookings/v1/token/{token}"), ("status", 200)))] == 1
+
+
+def test_prometheus_label_values_are_escaped():
+    collector = MetricsCollector()
+    collector.inc("requests_total", route='a"b\\c\nd')
+
+    assert 'pass_culture_requests_total{route="a\\"b\\\\c\\nd"} 1' in collector.to_prometheus()
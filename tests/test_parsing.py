@@ -0,0 +1,49 @@
+from pass_culture.models.bookings import Booking, BookingList, BookingStatus
+from pass_culture.parsing import LazyModelList, ResponseMode, parse
+from tests.mock_server import MockPassCultureServer
+
+SERVER = MockPassCultureServer(offers=1, bookings_per_offer=3)
+PAGE = {"data": [SERVER._make_booking(i) for i in (1, 2, 3)]}
+
+
+def test_validate():
+    page = parse(BookingList, PAGE, ResponseMode.VALIDATE)
+
+    assert [booking.id for booking in page.bookings] == [1, 2, 3]
+    assert page.bookings[0].status is BookingStatus.CONFIRMED
+
+
+def test_lazy_defers_list_items():
+    page = parse(BookingList, PAGE, ResponseMode.LAZY)
+
+    assert isinstance(page.bookings, LazyModelList)
+    assert len(page.bookings) == 3
+    assert page.bookings[1] == Booking.model_validate(PAGE["data"][1])
+    assert page.bookings[1] is page.bookings[1]
+
+
+def test_lazy_converts_top_level_values():
+    booking = parse(Booking, PAGE["data"][0], ResponseMode.LAZY)
+
+    assert booking.status is BookingStatus.CONFIRMED
+    assert booking.offer_id == 1
+
+
+def test_construct_builds_nested_models_without_validation():
+    page = parse(BookingList, PAGE, ResponseMode.CONSTRUCT)
+
+    booking = page.bookings[0]
+    assert isinstance(booking, Booking)
+    assert booking.status == "CONFIRMED"
+    assert booking.model_dump(by_alias=True, exclude_unset=True) == PAGE["data"][0]
+
+
+def test_construct_accepts_unexpected_data():
+    booking = parse(Booking, {"id": "not a number"}, ResponseMode.CONSTRUCT)
+
+    assert booking.id == "not a number"
+    assert booking.token is None
+
+
+def test_raw():
+    assert parse(BookingList, PAGE, ResponseMode.RAW) is PAGE
@@ -0,0 +1,78 @@
+import asyncio
+
+from pass_culture.pool import PassCultureClientPool
+
+
+def make_pool(server, **options) -> PassCultureClientPool:
+    return PassCultureClientPool("http://mock.passculture", http_transport=server.transport(), **options)
+
+
+async def test_rate_limiters_outlive_evicted_clients(server):
+    async with make_pool(server, rate=5.0, idle_timeout=0.01) as pool:
+        pool.add_tenant("venue-1", api_key="key-1")
+        first = pool.client("venue-1")
+        await first.bookings.list_bookings(offerId=1)
+
+        await asyncio.sleep(0.02)
+        assert pool.evict_idle() == 1
+        second = pool.client("venue-1")
+
+        assert second is not first
+        assert second.rate_limiter is first.rate_limiter
+        pool.add_tenant("venue-1", api_key="key-1", rate=2.0)
+        assert pool.client("venue-1").rate_limiter is not first.rate_limiter
+
+
+async def test_dropped_clients_are_closed_once_idle(server):
+    async with make_pool(server, idle_timeout=0.01) as pool:
+        pool.add_tenant("venue-1", api_key="key-1")
+        client = pool.client("venue-1")
+        http_client = client._client
+
+        # Removed while a request is in flight: closed only after it.
+        request = asyncio.ensure_future(client.bookings.list_bookings(offerId=1))
+        await asyncio.sleep(0)
+        pool.remove_tenant("venue-1")
+        pool.evict_idle()
+        assert (await request).bookings
+        assert not http_client.is_closed
+
+        await asyncio.sleep(0.02)
+        pool.evict_idle()
+        await asyncio.sleep(0)
+        assert http_client.is_closed
+        assert pool.stats()["retired_clients"] == 0
+
+
+async def test_evicted_clients_are_closed(server):
+    async with make_pool(server, idle_timeout=0.01) as pool:
+        pool.add_tenant("venue-1", api_key="key-1")
+        client = pool.client("venue-1")
+        closed = []
+        close = client.close
+
+        async def spy():
+            closed.append(client)
+            await close()
+
+        client.close = spy
+        await client.bookings.list_bookings(offerId=1)
+
+        await asyncio.sleep(0.02)
+        assert pool.evict_idle() == 1
+        await asyncio.sleep(0)
+
+        assert closed == [client]
+        assert client._client.is_closed
+
+
+async def test_close_closes_every_client(server):
+    pool = make_pool(server)
+    pool.add_tenant("venue-1", api_key="key-1")
+    pool.add_tenant("venue-2", api_key="key-2")
+    clients = [pool.client("venue-1")._client, pool.client("venue-2")._client]
+    pool.add_tenant("venue-2", api_key="key-3")
+
+    await pool.close()
+
+    assert all(http_client.is_closed for http_client in clients)
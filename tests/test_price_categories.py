@@ -0,0 +1,98 @@
+import json
+
+import httpx
+
+from pass_culture.models.PriceCategory import PriceCategoriesList, PriceCategory, PricingAction, PricingChange
+
+
+def category(label: str, price: int, idAtProvider=None) -> PriceCategory:
+    return PriceCategory(label=label, price=price, idAtProvider=idAtProvider)
+
+
+async def test_pricing_plan_reads_created_ids_back(server, client):
+    plan = [
+        PricingChange(eventId=1, priceCategory=category("Réduit", 1000, "reduced")),
+        PricingChange(eventId=1, priceCategoryId=10, priceCategory=category("Plein", 1800)),
+        PricingChange(eventId=2, priceCategory=category("Groupe", 800, "group")),
+    ]
+
+    results = await client.price_categories.apply_pricing_plan(plan)
+
+    assert [result.action for result in results] == [
+        PricingAction.CREATED,
+        PricingAction.UPDATED,
+        PricingAction.CREATED,
+    ]
+    assert all(result.success for result in results)
+    assert server.price_categories[1][results[0].priceCategoryId]["idAtProvider"] == "reduced"
+    assert server.price_categories[2][results[2].priceCategoryId]["idAtProvider"] == "group"
+    assert server.price_categories[1][10]["price"] == 1800
+
+
+async def test_pricing_plan_rerun_updates_instead_of_duplicating(server, client):
+    plan = [PricingChange(eventId=1, priceCategory=category("Réduit", 1000, "reduced"))]
+    first = await client.price_categories.apply_pricing_plan(plan)
+
+    plan = [PricingChange(eventId=1, priceCategory=category("Réduit", 900, "reduced"))]
+    second = await client.price_categories.apply_pricing_plan(plan)
+
+    assert second[0].action is PricingAction.UPDATED
+    assert second[0].priceCategoryId == first[0].priceCategoryId
+    assert len(server.price_categories[1]) == 2
+    assert server.price_categories[1][first[0].priceCategoryId]["price"] == 900
+
+
+async def test_pricing_plan_reports_superseded_changes(server, client):
+    plan = [
+        PricingChange(eventId=1, priceCategoryId=10, priceCategory=category("Plein", 1600)),
+        PricingChange(eventId=1, priceCategory=category("Réduit", 1000, "reduced")),
+        PricingChange(eventId=1, priceCategoryId=10, priceCategory=category("Plein", 1700)),
+        PricingChange(eventId=1, priceCategory=category("Réduit", 1100, "reduced")),
+    ]
+
+    results = await client.price_categories.apply_pricing_plan(plan)
+
+    assert [result.action for result in results] == [
+        PricingAction.SUPERSEDED,
+        PricingAction.SUPERSEDED,
+        PricingAction.UPDATED,
+        PricingAction.CREATED,
+    ]
+    assert results[1].priceCategoryId == results[3].priceCategoryId is not None
+    assert server.requests["update_price_category"] == 1
+    assert server.price_categories[1][10]["price"] == 1700
+    assert server.price_categories[1][results[3].priceCategoryId]["price"] == 1100
+
+
+async def test_created_category_without_provider_id_has_no_id(server, client):
+    plan = [PricingChange(eventId=1, priceCategory=category("Solidaire", 500))]
+
+    results = await client.price_categories.apply_pricing_plan(plan)
+
+    assert results[0].action is PricingAction.CREATED and results[0].success
+    assert results[0].priceCategoryId is None
+    assert len(server.price_categories[1]) == 2
+
+
+async def test_price_category_writes_send_the_api_bodies(server, make_client):
+    sent = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            sent.append((request.method, request.url.path, json.loads(request.content)))
+        return await server.handle(request)
+
+    client = make_client(httpx.MockTransport(handle))
+    await client.price_categories.create_price_category(
+        1, PriceCategoriesList(priceCategories=[category("Réduit", 1000, "reduced")])
+    )
+    await client.price_categories.update_price_category(1, 10, category("Plein", 1800))
+
+    assert sent == [
+        (
+            "POST",
+            "/offers/v1/events/1/price_categories",
+            {"priceCategories": [{"idAtProvider": "reduced", "label": "Réduit", "price": 1000}]},
+        ),
+        ("PUT", "/offers/v1/events/1/price_categories/10", {"label": "Plein", "price": 1800}),
+    ]
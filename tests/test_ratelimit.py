@@ -0,0 +1,26 @@
+import asyncio
+
+from pass_culture.ratelimit import TokenBucketLimiter, parse_rate_limit_reset
+
+
+def test_invalid_headers_fall_back_to_the_next_prefix():
+    headers = {
+        "RateLimit-Remaining": "none",
+        "RateLimit-Reset": "soon",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": "2",
+    }
+    assert parse_rate_limit_reset(headers) == 2.0
+    assert parse_rate_limit_reset({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "soon"}) is None
+
+
+def test_limiter_built_outside_an_event_loop():
+    limiter = TokenBucketLimiter(rate=100.0, burst=1)
+
+    async def acquire_twice() -> float:
+        await limiter.acquire()
+        return await limiter.acquire()
+
+    # Each run has its own loop: the limiter must not be bound to another one.
+    assert asyncio.run(acquire_twice()) > 0
+    assert asyncio.run(acquire_twice()) >= 0
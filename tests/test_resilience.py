@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pass_culture.exceptions import CircuitOpenError, PassCultureAPIError, RateLimitError
+from pass_culture.ratelimit import TokenBucketLimiter
+from pass_culture.resilience import CircuitBreaker, CircuitState, HedgePolicy
+from pass_culture.retry import RetryPolicy
+from tests.conftest import failing_first
+
+
+def test_requests_admitted_closed_are_not_probes():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    route = "bookings/v1/token/{token}"
+    slow, _ = breaker.before(route)
+    failing, _ = breaker.before(route)
+    assert breaker.record(route, False, failing) is CircuitState.OPEN
+
+    probe, changed = breaker.before(route)
+    assert (probe, changed) == (CircuitState.HALF_OPEN, CircuitState.HALF_OPEN)
+    # The request sent before the circuit opened neither closes it nor frees the probe slot.
+    assert breaker.record(route, True, slow) is None
+    assert breaker.state(route) is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before(route)
+
+    assert breaker.record(route, True, probe) is CircuitState.CLOSED
+
+
+async def test_hedging_observes_the_original_request_latency(server, make_client):
+    requests = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 3:
+            await asyncio.sleep(0.2)
+        return await server.handle(request)
+
+    hedging = HedgePolicy(min_samples=1, min_delay=0.01, max_ratio=1.0)
+    client = make_client(httpx.MockTransport(handle), hedging=hedging)
+    booking = (await client.bookings.list_bookings(offerId=1)).bookings[0]
+    route = "bookings/v1/token/{token}"
+
+    await client.bookings.get_booking(booking.token)  # Fast, sets the delay.
+    await client.bookings.get_booking(booking.token)  # Slow, the hedge wins.
+
+    assert hedging.wins[route] == 1
+    assert len(hedging._samples[route]) == 1
+    await asyncio.sleep(0.3)
+    assert len(hedging._samples[route]) == 2
+    assert hedging._samples[route][-1] >= 0.2
+
+
+async def test_probe_is_given_back_when_the_limiter_gives_up(server, make_client):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    limiter = TokenBucketLimiter(rate=20.0, burst=1, max_wait=0.01)
+    client = make_client(
+        failing_first(server, httpx.Response(500)),
+        circuit_breaker=breaker,
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    route = "bookings/v1/bookings"
+    with pytest.raises(PassCultureAPIError):
+        await client.bookings.list_bookings(offerId=1)
+    assert breaker.state(route) is CircuitState.OPEN
+
+    await asyncio.sleep(0.06)
+    await limiter.acquire()  # The probe finds the bucket empty.
+    with pytest.raises(RateLimitError):
+        await client.bookings.list_bookings(offerId=1)
+
+    await asyncio.sleep(0.06)
+    assert (await client.bookings.list_bookings(offerId=1)).bookings
+    assert breaker.state(route) is CircuitState.CLOSED
@@ -0,0 +1,32 @@
+import json
+
+from pass_culture.endpoints.EventOffers import build_event_offer_body
+from pass_culture.serialization import encode_body
+from tests.conftest import offer_fields
+
+
+def test_encoded_body_uses_aliases_and_omits_none():
+    body = json.loads(encode_body(build_event_offer_body(**offer_fields(idAtProvider="p1"))))
+
+    assert body == {
+        "accessibility": {
+            "audioDisabilityCompliant": True,
+            "mentalDisabilityCompliant": True,
+            "motorDisabilityCompliant": True,
+            "visualDisabilityCompliant": True,
+        },
+        "categoryRelatedField": {"category": "CONCERT", "speaker": "Camille"},
+        "enableDoubleBooking": True,
+        "hasTicket": False,
+        "idAtProvider": "p1",
+        "location": {"type": "physical", "venueId": 1},
+        "name": "Concert",
+    }
+
+
+async def test_patch_sends_explicit_none(server, client):
+    server.offers[1]["description"] = "Old description"
+
+    await client.event_offers.patch_event_offer(1, {"description": None})
+
+    assert server.offers[1]["description"] is None
@@ -0,0 +1,80 @@
+import httpx
+
+from pass_culture.upsert import EventOfferUpserter, UpsertAction, diff_event_offer
+from tests.conftest import offer_fields
+
+
+def test_diff_event_offer_maps_response_names():
+    current = {"name": "Concert", "enableDoubleBookings": True, "publicationDatetime": "2024-01-01T00:00:00Z"}
+    body = {"name": "Concert", "enableDoubleBooking": True, "publicationDate": "2024-01-01T00:00:00+00:00"}
+
+    assert diff_event_offer(body, current) == {}
+    assert diff_event_offer({**body, "enableDoubleBooking": False}, current) == {"enableDoubleBooking": False}
+
+
+async def test_upsert_creates_updates_and_skips(server, client):
+    upserter = EventOfferUpserter(client, venueId=1, batch_size=2)
+    current = server.offers[1]
+    offers = [
+        # Same as offer 1, except for its name.
+        offer_fields(
+            "Renamed",
+            idAtProvider="provider-1",
+            eventDuration=current["eventDuration"],
+            bookingAllowedDateTime=current["bookingAllowedDatetime"],
+            publicationDate=current["publicationDatetime"],
+        ),
+        offer_fields("New concert", idAtProvider="new-1"),
+        offer_fields("Another concert", idAtProvider="new-2"),
+    ]
+
+    results = {result.idAtProvider: result async for result in upserter.upsert(offers)}
+
+    assert results["provider-1"].action is UpsertAction.UPDATED
+    assert "name" in results["provider-1"].changes
+    assert server.offers[1]["name"] == "Renamed"
+    for idAtProvider in ("new-1", "new-2"):
+        result = results[idAtProvider]
+        assert result.action is UpsertAction.CREATED and result.success
+        assert server.offers[result.event_offer_id]["idAtProvider"] == idAtProvider
+
+    again = await upserter.upsert_all(offers[1:])
+    assert [result.action for result in again] == [UpsertAction.UNCHANGED] * 2
+    assert server.requests["create_offer"] == 2
+
+
+async def test_invalid_offers_are_reported_without_stopping(server, client):
+    upserter = EventOfferUpserter(client, venueId=1, batch_size=1)
+    offers = [
+        offer_fields("First", idAtProvider="new-1"),
+        offer_fields("No provider ID"),
+        {"idAtProvider": "new-2", "unexpected": True},
+        offer_fields("Last", idAtProvider="new-3"),
+    ]
+
+    results = await upserter.upsert_all(offers)
+
+    assert [(result.idAtProvider, result.action) for result in results] == [
+        ("new-1", UpsertAction.CREATED),
+        (None, UpsertAction.FAILED),
+        ("new-2", UpsertAction.FAILED),
+        ("new-3", UpsertAction.CREATED),
+    ]
+    assert isinstance(results[1].error, ValueError)
+    assert isinstance(results[2].error, TypeError)
+    assert server.requests["create_offer"] == 2
+
+
+async def test_created_offer_not_found_is_reported(server, make_client):
+    async def handle(request):
+        if request.method == "POST":
+            # Acknowledged, but never listed afterwards.
+            return httpx.Response(200, json={"ctx": {}, "loc": [], "msg": "Offer created", "type": "success"})
+        return await server.handle(request)
+
+    client = make_client(httpx.MockTransport(handle))
+    [result] = await EventOfferUpserter(client, venueId=1).upsert_all([offer_fields(idAtProvider="lost")])
+
+    assert result.action is UpsertAction.CREATED
+    assert not result.success
+    assert result.event_offer_id is None
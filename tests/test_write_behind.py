@@ -0,0 +1,76 @@
+import httpx
+
+from pass_culture.retry import RetryPolicy
+from pass_culture.write_behind import OperationKind, OperationState, SQLiteJournal, WriteBehindQueue
+from tests.conftest import failing_first
+from tests.mock_server import booking_token
+
+
+def unavailable() -> httpx.Response:
+    return httpx.Response(503, json={"global": ["Service unavailable"]})
+
+
+async def test_operations_are_sent(server, client):
+    with SQLiteJournal(":memory:") as journal:
+        async with WriteBehindQueue(client, journal, base_delay=0.001) as queue:
+            queue.validate_booking(booking_token(1))
+            queue.delete_booking(booking_token(2))
+            await queue.flush()
+
+        assert server.statuses == {1: "USED", 2: "CANCELLED"}
+        assert journal.counts() == {"pending": 0, "done": 2, "failed": 0}
+
+
+async def test_operations_of_a_token_are_sent_in_order(server, client):
+    with SQLiteJournal(":memory:") as journal:
+        async with WriteBehindQueue(client, journal, base_delay=0.001) as queue:
+            queue.validate_booking(booking_token(1))
+            queue.revert_validation(booking_token(1))
+            queue.delete_booking(booking_token(1))
+            await queue.flush()
+
+        assert server.statuses[1] == "CANCELLED"
+        assert queue.stats()["done"] == 3
+
+
+async def test_transient_errors_are_retried(server, make_client):
+    # The client doesn't retry, so that the queue's own backoff is exercised.
+    client = make_client(
+        failing_first(server, unavailable(), unavailable()), retry_policy=RetryPolicy(max_attempts=1)
+    )
+    with SQLiteJournal(":memory:") as journal:
+        async with WriteBehindQueue(client, journal, base_delay=0.001) as queue:
+            queue.validate_booking(booking_token(1))
+            await queue.flush()
+
+        [operation] = journal.operations(OperationState.DONE)
+        assert operation.attempts == 3
+        assert server.statuses[1] == "USED"
+
+
+async def test_booking_used_elsewhere_fails(server, client):
+    # Scanned at another gate first: the rejection must not be taken for our own success.
+    server.statuses[1] = "USED"
+    with SQLiteJournal(":memory:") as journal:
+        async with WriteBehindQueue(client, journal) as queue:
+            queue.validate_booking(booking_token(1))
+            await queue.flush()
+
+        [operation] = queue.failed()
+        assert operation.attempts == 1
+        assert "410" in operation.last_error
+
+
+async def test_replay_after_crash_reconciles_applied_operation(tmp_path, server, client):
+    path = str(tmp_path / "journal.sqlite3")
+    with SQLiteJournal(path) as journal:
+        operation = journal.append(OperationKind.VALIDATE, booking_token(1))
+        # The attempt reached the API, then the process died before recording the outcome.
+        journal.update(operation.seq, OperationState.PENDING, 1)
+        server.statuses[1] = "USED"
+
+    with SQLiteJournal(path) as journal:
+        async with WriteBehindQueue(client, journal) as queue:
+            await queue.flush()
+
+        assert journal.counts() == {"pending": 0, "done": 1, "failed": 0}